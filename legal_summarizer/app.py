@@ -1,19 +1,36 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
+import atexit
 import json
+import threading
 from werkzeug.utils import secure_filename
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 from datetime import datetime
-import PyPDF2
-import docx
-import re
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-from collections import defaultdict
+import time
+import shutil
+import tempfile
+from utils.batching import iter_summaries_batched, sentence_fallback
+from utils.chunking import TextChunker
+from utils.generation import GenerationPolicy, chunk_policy
+from utils.extractive import ExtractiveFilter
+from utils.hierarchical import reduce_summaries
+from utils.extraction import iter_pages, join_pages
+from utils.cache import SummaryCache, ChunkSummaryCache, ExtractedTextCache, DEFAULT_TEXT_CACHE_DIR, make_cache_key
+from utils.jobs import JobQueue, QueueFullError
+from utils.dates import extract_dates as extract_document_dates
+from utils.idf import IdfModel, DEFAULT_IDF_PATH
+from utils.importance import classify_importance as classify_document_importance, importance_scores
+from utils.segmentation import Document, as_document
+from utils.law_index import LawArticleIndex
+from utils.law_retrieval import ArticleRetriever, DEFAULT_LAW_INDEX_DIR
+from utils.model_registry import registry
+from utils.inference_service import InferenceService
+from utils.scheduler import MicroBatchScheduler
+
+# Heavy dependencies (transformers, ReportLab, PyPDF2, python-docx, SQLAlchemy) are
+# imported inside the functions that use them, and the model is loaded by
+# load_summarizer() on first use or by warmup() at startup, so importing this
+# module stays fast for workers, tests and health checks.
 
 app = Flask(__name__, 
             static_folder='static',
@@ -29,29 +46,227 @@ CORS(app, resources={
     }
 })
 
-# Initialize the summarization model
-try:
-    summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
-except:
-    # Fallback to a simpler model if the first one fails
-    try:
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    except:
-        print("Warning: Could not load preferred summarization models. Using text extraction only.")
-        summarizer = None
+# Summarization models to try, in order of preference
+SUMMARIZATION_MODELS = ["sshleifer/distilbart-cnn-12-6", "facebook/bart-large-cnn"]
+
+# Bump whenever a change to the pipeline alters its output, so stale cached
+# results are not served
+PIPELINE_VERSION = '9'
+GENERATION_PARAMS = {'do_sample': False}
+# Summary length and beam count per chunk, from its token length and importance
+GENERATION_POLICY = {'max_length': 130, 'min_length': 30}
+
+# Set by load_summarizer()
+summarizer = None
+scheduler = None
+MODEL_NAME = None
+# Sentence-aligned chunker sized to the model's real token budget
+chunker = TextChunker()
+generation_policy = GenerationPolicy(chunker.count_tokens, **GENERATION_POLICY)
+# Top-ranked sentences of a document: the model's input for long documents,
+# and the whole summary when no model is available
+extractive_filter = None
+# Chunk summaries shared across documents, so repeated boilerplate clauses
+# are summarized once
+chunk_cache = None
+_model_lock = threading.Lock()
+_model_loaded = False
+
+def load_summarizer():
+    """Load the summarization model on first use. Returns None if no model could be loaded."""
+    global summarizer, scheduler, MODEL_NAME, chunker, generation_policy, extractive_filter, chunk_cache, _model_loaded
+    with _model_lock:
+        if _model_loaded:
+            return summarizer
+        
+        loaded_name = None
+        for model_name in SUMMARIZATION_MODELS:
+            try:
+                summarizer = registry.summarization_pipeline(
+                    model_name, app.config['INFERENCE_PRECISION'], app.config['INFERENCE_BACKEND'])
+                loaded_name = model_name
+                break
+            except Exception as e:
+                # Fall back to the next model if this one fails
+                print(f"Warning: Could not load summarization model {model_name}: {str(e)}")
+        else:
+            print("Warning: Could not load preferred summarization models. Using text extraction only.")
+        
+        if summarizer and app.config['INFERENCE_WORKERS'] > 0:
+            # Fork the workers after loading so they share one copy of the weights
+            summarizer = InferenceService(
+                summarizer,
+                num_workers=app.config['INFERENCE_WORKERS'],
+                threads_per_worker=app.config['INFERENCE_THREADS']
+            ).start()
+            atexit.register(summarizer.stop)
+        
+        if summarizer and app.config['MICRO_BATCH_WAIT_MS'] > 0:
+            # Share model batches between requests that are in flight together
+            summarizer = scheduler = MicroBatchScheduler(
+                summarizer,
+                max_batch_size=app.config['MICRO_BATCH_SIZE'],
+                max_wait_ms=app.config['MICRO_BATCH_WAIT_MS']
+            )
+            atexit.register(scheduler.stop)
+        
+        MODEL_NAME = model_cache_name(loaded_name) if summarizer else 'extractive'
+        chunker = TextChunker(summarizer.tokenizer if summarizer else None)
+        generation_policy = GenerationPolicy(chunker.count_tokens, **GENERATION_POLICY)
+        extractive_filter = make_extractive_filter()
+        chunk_cache = ChunkSummaryCache(MODEL_NAME, max_entries=4096)
+        _model_loaded = True
+        return summarizer
+
+def model_cache_name(model_name):
+    """Name of a model in cache keys, including the precision and backend it runs with."""
+    if app.config['INFERENCE_PRECISION'] != 'fp32':
+        # Quantized models summarize slightly differently; keep their cache entries apart
+        model_name = f"{model_name}@{app.config['INFERENCE_PRECISION']}"
+    if app.config['INFERENCE_BACKEND'] != 'pytorch':
+        model_name = f"{model_name}@{app.config['INFERENCE_BACKEND']}"
+    return model_name
+
+def make_extractive_filter():
+    """Sentence filter for the loaded model, or the extractive summarizer when there is none."""
+    max_tokens = app.config['EXTRACTIVE_MAX_TOKENS'] if summarizer else app.config['EXTRACTIVE_SUMMARY_TOKENS']
+    if max_tokens <= 0:
+        return None
+    return ExtractiveFilter(max_tokens, app.config['EXTRACTIVE_METHOD'], chunker.token_counts)
+
+def warmup():
+    """Load the models, bring the IDF model up to date and run one short generation. Call once per worker at startup."""
+    update_idf_model()
+    model = load_summarizer()
+    if model:
+        model("The court heard the appeal and reserved its judgment on the matter.",
+              max_length=16, min_length=1, do_sample=False)
 
 # Configure upload folder
-UPLOAD_FOLDER = 'uploads'
 REPORTS_FOLDER = 'reports'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 
-for folder in [UPLOAD_FOLDER, REPORTS_FOLDER]:
+for folder in [REPORTS_FOLDER]:
     if not os.path.exists(folder):
         os.makedirs(folder)
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['REPORTS_FOLDER'] = REPORTS_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Uploads are parsed straight from the request. Background jobs keep a copy
+# in memory up to this size and spill larger files to an anonymous temp file.
+app.config['UPLOAD_MEMORY_LIMIT'] = 4 * 1024 * 1024
+# Processes extracting pages of large PDFs; 0 uses every core
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get('LEXBRIEF_EXTRACTION_WORKERS', '0'))
+# Extracted text store; DocumentProcessor uses the same default directory
+app.config['EXTRACTION_CACHE_DIR'] = os.environ.get('LEXBRIEF_EXTRACTION_CACHE_DIR', DEFAULT_TEXT_CACHE_DIR)
+app.config['EXTRACTION_CACHE_MB'] = int(os.environ.get('LEXBRIEF_EXTRACTION_CACHE_MB', '512'))
+app.config['SUMMARY_BATCH_SIZE'] = 8  # Chunks per summarization forward pass
+app.config['SUMMARY_CACHE_SIZE'] = 256  # Results kept in the in-memory cache tier
+# Longest final summary in tokens; chunk summaries are re-summarized until
+# they fit. 0 joins the chunk summaries instead.
+app.config['SUMMARY_TARGET_LENGTH'] = int(os.environ.get('LEXBRIEF_SUMMARY_TARGET_LENGTH', '256'))
+app.config['DATABASE_URL'] = 'sqlite:///legal_summarizer.db'
+app.config['JOB_WORKERS'] = 2  # Documents processed concurrently in the background
+app.config['JOB_QUEUE_SIZE'] = 16  # Queued plus running jobs before new ones are rejected
+# Skip the model warm-up in `python app.py`; the model then loads on the first request
+app.config['FAST_START'] = os.environ.get('LEXBRIEF_FAST_START', '') == '1'
+# Worker processes for model inference; 0 runs the model in the request thread
+app.config['INFERENCE_WORKERS'] = int(os.environ.get('LEXBRIEF_INFERENCE_WORKERS', '0'))
+# torch intra-op threads per inference worker
+app.config['INFERENCE_THREADS'] = int(os.environ.get('LEXBRIEF_INFERENCE_THREADS', '1'))
+# Model precision for CPU inference: 'fp32', 'int8' (dynamic quantization) or 'bf16'
+app.config['INFERENCE_PRECISION'] = os.environ.get('LEXBRIEF_PRECISION', 'fp32')
+# Inference engine: 'pytorch' or 'onnx' (ONNX Runtime, using the export from model/export_onnx.py)
+app.config['INFERENCE_BACKEND'] = os.environ.get('LEXBRIEF_BACKEND', 'pytorch')
+# Chunks from concurrent requests are merged into batches of up to this size,
+# waiting at most MICRO_BATCH_WAIT_MS for a batch to fill; 0 disables merging
+app.config['MICRO_BATCH_SIZE'] = int(os.environ.get('LEXBRIEF_MICRO_BATCH_SIZE', '16'))
+app.config['MICRO_BATCH_WAIT_MS'] = float(os.environ.get('LEXBRIEF_MICRO_BATCH_WAIT_MS', '5'))
+# Sentence ranking for the extractive stage: 'tfidf' or 'textrank'
+app.config['EXTRACTIVE_METHOD'] = os.environ.get('LEXBRIEF_EXTRACTIVE_METHOD', 'tfidf')
+# Token budget of top-ranked sentences passed to the model. Off (0) by default:
+# pre-filtering drops sentences, so enabling it changes summaries
+app.config['EXTRACTIVE_MAX_TOKENS'] = int(os.environ.get('LEXBRIEF_EXTRACTIVE_MAX_TOKENS', '0'))
+# Length of the summary when no model could be loaded; 0 uses the first five sentences
+app.config['EXTRACTIVE_SUMMARY_TOKENS'] = int(os.environ.get('LEXBRIEF_EXTRACTIVE_SUMMARY_TOKENS', '150'))
+# Law article suggestions: 'keyword' matches catalogue keywords, 'semantic' ranks
+# articles by similarity to the document using precomputed article vectors
+app.config['LAW_RETRIEVAL'] = os.environ.get('LEXBRIEF_LAW_RETRIEVAL', 'keyword')
+app.config['LAW_INDEX_DIR'] = os.environ.get('LEXBRIEF_LAW_INDEX_DIR', DEFAULT_LAW_INDEX_DIR)
+# Semantic retrieval only ranks articles with a keyword match, when there are any
+app.config['LAW_KEYWORD_PREFILTER'] = os.environ.get('LEXBRIEF_LAW_KEYWORD_PREFILTER', '') == '1'
+# IDF weights for importance scoring, learned from the TrainingData and Document tables
+app.config['IDF_MODEL_PATH'] = os.environ.get('LEXBRIEF_IDF_MODEL_PATH', DEFAULT_IDF_PATH)
+app.config['IDF_SAVE_EVERY'] = 16  # New documents counted before the IDF model is saved again
+
+# Background workers for the job-based /jobs API
+job_queue = JobQueue(max_workers=app.config['JOB_WORKERS'], max_pending=app.config['JOB_QUEUE_SIZE'])
+
+_session_factory = None
+_db_lock = threading.Lock()
+
+def db_session():
+    """Open a database session, creating the engine and tables on first use."""
+    global _session_factory
+    with _db_lock:
+        if _session_factory is None:
+            from database.models import init_session_factory
+            _session_factory = init_session_factory(app.config['DATABASE_URL'])
+    return _session_factory()
+
+# Cache of analysis results keyed by file content and model configuration
+summary_cache = SummaryCache(max_entries=app.config['SUMMARY_CACHE_SIZE'], session_factory=db_session)
+# Law article keywords, compiled on first use and reloaded when the JSON changes
+law_index = LawArticleIndex('data/indian_law_articles.json')
+# Article vectors, built or memory-mapped on first use
+law_retriever = ArticleRetriever(law_index, app.config['LAW_INDEX_DIR'])
+# Cross-document IDF model, loaded from disk on first use. Documents stored
+# by this process are added as they are analysed; rows added elsewhere are
+# counted by the catch-up at warm-up or by scripts/build_idf_model.py.
+idf_model = None
+_idf_lock = threading.Lock()
+_idf_unsaved = 0
+
+def load_idf_model():
+    global idf_model
+    if idf_model is None:
+        with _idf_lock:
+            if idf_model is None:
+                idf_model = IdfModel.load(app.config['IDF_MODEL_PATH'])
+    return idf_model
+
+def update_idf_model():
+    """Count documents added to the database since the model was saved, then save it."""
+    model = load_idf_model()
+    try:
+        if model.update_from_database(db_session):
+            model.save()
+    except Exception as e:
+        print(f"Warning: Could not update IDF model: {str(e)}")
+
+def record_idf_document(text, document_id):
+    """Add a just-stored document to the IDF model, saving every IDF_SAVE_EVERY documents."""
+    global _idf_unsaved
+    model = load_idf_model()
+    model.add_document(text, document_id)
+    with _idf_lock:
+        _idf_unsaved += 1
+        due = _idf_unsaved >= app.config['IDF_SAVE_EVERY']
+        if due:
+            _idf_unsaved = 0
+    if due:
+        try:
+            model.save()
+        except Exception as e:
+            print(f"Warning: Could not save IDF model: {str(e)}")
+
+def save_idf_model():
+    if idf_model is not None and _idf_unsaved:
+        idf_model.save()
+
+atexit.register(save_idf_model)
+# Extracted text on disk, shared with DocumentProcessor
+text_cache = ExtractedTextCache(app.config['EXTRACTION_CACHE_DIR'], app.config['EXTRACTION_CACHE_MB'] * 1024 * 1024)
 
 INDIAN_LAW_ARTICLES = {
     'Article 17': {
@@ -79,168 +294,146 @@ INDIAN_LAW_ARTICLES = {
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file_path):
-    text = ""
-    with open(file_path, 'rb') as file:
-        pdf_reader = PyPDF2.PdfReader(file)
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-    return text
-
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+def extract_text_from_pdf(source):
+    # Pages are extracted in parallel for large files and joined in one pass;
+    # files and pages seen before come from the text cache
+    return join_pages(iter_pages(source, app.config['EXTRACTION_WORKERS'], text_cache, filename='document.pdf'))
+
+def extract_text_from_docx(source):
+    return join_pages(iter_pages(source, cache=text_cache, filename='document.docx'))
+
+# The analysis functions below take a document's text or its Document, which
+# carries the sentence boundaries every stage shares
 
 def extract_dates(text):
-    # Regular expressions for different date formats
-    date_patterns = [
-        r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',  # DD/MM/YYYY or DD-MM-YYYY
-        r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',  # YYYY/MM/DD or YYYY-MM-DD
-        r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}'  # Month DD, YYYY
-    ]
-    
-    dates_with_context = []
-    for pattern in date_patterns:
-        for match in re.finditer(pattern, text):
-            date = match.group()
-            # Get context (2 sentences before and after the date)
-            start = max(0, text.rfind('.', 0, match.start()) + 1)
-            end = text.find('.', match.end())
-            if end == -1:
-                end = len(text)
-            context = text[start:end].strip()
-            dates_with_context.append({
-                'date': date,
-                'context': context
-            })
-    
-    # Remove duplicates based on date
-    unique_dates = {}
-    for item in dates_with_context:
-        if item['date'] not in unique_dates:
-            unique_dates[item['date']] = item['context']
-    
-    return [{'date': date, 'context': context} for date, context in unique_dates.items()]
+    # Single pass for every date format; each date is reported once in ISO
+    # form, with the sentence it appears in as context
+    return extract_document_dates(text)
 
-def classify_importance(text):
-    # Keywords for different importance levels
-    high_importance = ['urgent', 'critical', 'immediate', 'deadline', 'must', 'required', 'mandatory']
-    medium_importance = ['important', 'significant', 'consider', 'should', 'recommended']
-    
-    sentences = text.split('.')
-    importance = {
-        'high': [],
-        'medium': [],
-        'low': []
-    }
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-            
-        # Check for high importance keywords
-        if any(keyword in sentence.lower() for keyword in high_importance):
-            importance['high'].append(sentence)
-        # Check for medium importance keywords
-        elif any(keyword in sentence.lower() for keyword in medium_importance):
-            importance['medium'].append(sentence)
-        # Everything else is low importance
-        else:
-            importance['low'].append(sentence)
-    
-    # Limit the number of items in each category
-    for key in importance:
-        importance[key] = importance[key][:5]  # Keep only top 5 items
-    
-    return importance
+def score_sentences(text):
+    # Keyword counts and TF-IDF of every sentence, in one vectorized pass.
+    # IDF comes from the whole corpus once there is one, else from the
+    # document itself.
+    model = load_idf_model()
+    return importance_scores(text, idf=model.weights() if len(model) else None)
+
+def classify_importance(text, scores=None):
+    # Each bucket keeps its five best sentences by keyword count and TF-IDF
+    # weight; scores already computed for the document are reused
+    document = as_document(text)
+    if scores is None:
+        scores = score_sentences(document)
+    return classify_document_importance(document, top=5, scores=scores)
 
 def suggest_law_articles(text):
     try:
-        # Load law articles from JSON file
-        with open('data/indian_law_articles.json', 'r') as f:
-            law_articles = json.load(f)['articles']
-        
-        # Convert text to lowercase for case-insensitive matching
-        text_lower = text.lower()
-        
-        # Score each article based on keyword matches
-        scored_articles = []
-        for article in law_articles:
-            score = 0
-            for keyword in article['keywords']:
-                if keyword.lower() in text_lower:
-                    score += 1
-            
-            if score > 0:
-                scored_articles.append({
-                    'article': article['article'],
-                    'title': article['title'],
-                    'description': article['description'],
-                    'score': score
-                })
-        
-        # Sort articles by score and return top 3
-        scored_articles.sort(key=lambda x: x['score'], reverse=True)
-        return [article for article in scored_articles[:3]]
+        if app.config['LAW_RETRIEVAL'] == 'semantic':
+            return law_retriever.suggest(text, top_k=3, prefilter=app.config['LAW_KEYWORD_PREFILTER'])
+        # Single pass over the text with the precompiled keyword index
+        return law_index.suggest(as_document(text).text, top_k=3)
     except Exception as e:
         print(f"Error suggesting law articles: {str(e)}")
         return []
 
-def process_document(file_path):
-    # Extract text based on file type
-    file_extension = file_path.split('.')[-1].lower()
+def extract_text(source, filename=None):
+    # source is a path or a binary file object such as an upload's stream;
+    # filename gives the type when source has no path
+    file_extension = (filename or source).split('.')[-1].lower()
     
     if file_extension == 'pdf':
-        text = extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source)
     elif file_extension == 'docx':
-        text = extract_text_from_docx(file_path)
-    else:  # txt file
-        with open(file_path, 'r', encoding='utf-8') as file:
-            text = file.read()
+        return extract_text_from_docx(source)
+    elif isinstance(source, str):  # txt file
+        with open(source, 'r', encoding='utf-8') as file:
+            return file.read()
+    else:
+        source.seek(0)
+        return source.read().decode('utf-8')
+
+def process_document(file_path):
+    return analyze_text(extract_text(file_path))
+
+def iter_analysis(text):
+    """Yield (stage, data) pairs as each part of the analysis becomes ready."""
+    summarizer = load_summarizer()
+    # Segmented once; every stage below reads the same sentences
+    document = Document(text)
+    sentences = document.sentences()
+    # Scored once; chunk generation settings and the importance buckets both use these
+    scores = score_sentences(document)
     
     # Generate summary
     if summarizer:
-        # Split text into chunks if it's too long
-        max_chunk_length = 1024
-        chunks = [text[i:i+max_chunk_length] for i in range(0, len(text), max_chunk_length)]
-        
-        summaries = []
-        for chunk in chunks:
-            if len(chunk.strip()) > 100:  # Only summarize chunks with substantial content
-                try:
-                    summary = summarizer(chunk, max_length=130, min_length=30, do_sample=False)
-                    summaries.append(summary[0]['summary_text'])
-                except Exception as e:
-                    print(f"Warning: Summarization failed for chunk: {str(e)}")
-                    # Use the first few sentences as a fallback
-                    sentences = chunk.split('.')[:3]
-                    summaries.append('. '.join(sentences) + '.')
-        
-        final_summary = ' '.join(summaries)
+        # Keep only the highest-ranked sentences of long documents, so the
+        # model runs over a few chunks instead of every one
+        kept = extractive_filter.select(sentences) if extractive_filter else range(len(sentences))
+        
+        # Pack the kept sentences into chunks that fit the model, noting
+        # which of the document's sentences each chunk holds
+        groups = chunker.chunk_sentence_groups([sentences[i] for i in kept])
+        
+        # Only summarize chunks with substantial content
+        groups = [(chunk, [kept[i] for i in indices]) for chunk, indices in groups if len(chunk.strip()) > 100]
+        chunks = [chunk for chunk, _ in groups]
+        summaries = [None] * len(chunks)
+        for index, summary in iter_summaries_batched(
+            summarizer,
+            chunks,
+            batch_size=app.config['SUMMARY_BATCH_SIZE'],
+            fallback=sentence_fallback(sentences, groups),
+            cache=chunk_cache,
+            policy=chunk_policy(generation_policy, groups, scores.high, scores.medium),
+            truncation=True,
+            **GENERATION_PARAMS
+        ):
+            summaries[index] = summary
+            yield 'chunk', {'index': index, 'total': len(chunks), 'summary': summary}
+        
+        if app.config['SUMMARY_TARGET_LENGTH'] > 0:
+            # Re-summarize the chunk summaries until they fit the target length
+            final_summary = reduce_summaries(
+                summarizer,
+                summaries,
+                chunker,
+                target_length=app.config['SUMMARY_TARGET_LENGTH'],
+                batch_size=app.config['SUMMARY_BATCH_SIZE'],
+                cache=chunk_cache,
+                policy=generation_policy,
+                truncation=True,
+                **GENERATION_PARAMS
+            )
+        else:
+            final_summary = ' '.join(summaries)
+    elif extractive_filter:
+        # If no summarizer is available, the top-ranked sentences are the summary
+        final_summary = extractive_filter.condense(document)
     else:
-        # If no summarizer is available, use the first few sentences as a summary
-        sentences = text.split('.')[:5]  # First 5 sentences
-        final_summary = '. '.join(sentences) + '.'
+        final_summary = ' '.join(sentences[:5])  # First 5 sentences
+    yield 'summary', final_summary
     
     # Extract dates with context
-    dates = extract_dates(text)
+    yield 'dates', extract_dates(document)
     
     # Suggest relevant law articles
-    suggested_articles = suggest_law_articles(text)
+    yield 'suggested_articles', suggest_law_articles(document)
     
     # Classify importance of content
-    importance = classify_importance(text)
-    
-    return {
-        'summary': final_summary,
-        'dates': dates,
-        'importance': importance,
-        'suggested_articles': suggested_articles
-    }
+    yield 'importance', classify_importance(document, scores)
+
+def analyze_text(text, progress=None):
+    result = {}
+    chunks_done = 0
+    for stage, data in iter_analysis(text):
+        if stage == 'chunk':
+            chunks_done += 1
+            if progress:
+                progress(0.1 + 0.7 * chunks_done / data['total'], 'summarizing')
+            continue
+        if stage == 'summary' and progress:
+            progress(0.8, 'analyzing')
+        result[stage] = data
+    return result
 
 def create_response(data=None, error=None, status=200):
     response = {
@@ -251,6 +444,11 @@ def create_response(data=None, error=None, status=200):
     return jsonify(response), status
 
 def generate_pdf_report(data, original_filename):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    
     try:
         # Create a unique filename for the report
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -432,42 +630,134 @@ def serve_static(filename):
 def serve_report(filename):
     return send_from_directory(app.config['REPORTS_FOLDER'], filename)
 
+@app.route('/health')
+def health():
+    return create_response(data={
+        'status': 'healthy',
+        'model_loaded': _model_loaded,
+        'model': MODEL_NAME
+    })
+
+@app.route('/scheduler/stats')
+def scheduler_stats():
+    return create_response(data=scheduler.stats() if scheduler else None)
+
+@app.route('/cache/stats')
+def cache_stats():
+    return create_response(data={
+        'documents': summary_cache.stats(),
+        'chunks': chunk_cache.stats() if chunk_cache else None,
+        'extracted_text': text_cache.stats()
+    })
+
+def report_exists(result):
+    report_url = result.get('report_url')
+    if not report_url:
+        return False
+    report_filename = report_url.rsplit('/', 1)[-1]
+    return os.path.exists(os.path.join(app.config['REPORTS_FOLDER'], report_filename))
+
+def get_uploaded_file():
+    """Return the uploaded document, or an error response if it is missing or invalid."""
+    if 'document' not in request.files:
+        return None, create_response(error='No file provided', status=400)
+    
+    file = request.files['document']
+    if file.filename == '':
+        return None, create_response(error='No file selected', status=400)
+    
+    if not allowed_file(file.filename):
+        return None, create_response(error='File type not allowed. Please upload PDF, DOCX, or TXT files.', status=400)
+    
+    return file, None
+
+def get_cache_key(file):
+    # Built from configuration alone, so a cache hit never loads the model.
+    # Keys name the preferred model; results of a fallback model are not
+    # persisted under them (see finish_result).
+    max_tokens = app.config['EXTRACTIVE_MAX_TOKENS']
+    params = dict(GENERATION_PARAMS, policy=generation_policy.config(),
+                  extractive={'max_tokens': max_tokens, 'method': app.config['EXTRACTIVE_METHOD']} if max_tokens > 0 else None,
+                  target_length=app.config['SUMMARY_TARGET_LENGTH'],
+                  articles=[app.config['LAW_RETRIEVAL'], app.config['LAW_KEYWORD_PREFILTER']])
+    # Hashed in blocks straight from the upload stream
+    return make_cache_key(file.stream, model_cache_name(SUMMARIZATION_MODELS[0]), params, PIPELINE_VERSION)
+
+def spool_upload(file):
+    """Copy an upload so it outlives its request: in memory if small, else an anonymous temp file."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_MEMORY_LIMIT'])
+    file.stream.seek(0)
+    shutil.copyfileobj(file.stream, spooled)
+    spooled.seek(0)
+    return spooled
+
+def summarize_file(source, filename, cache_key, cached=None, progress=None):
+    """Analyze an upload, render its report and store the result in the cache."""
+    start_time = time.time()
+    if cached is not None:
+        return finish_result(dict(cached), filename, cache_key)
+    
+    # Process the document
+    if progress:
+        progress(0.05, 'extracting')
+    text = extract_text(source, filename)
+    result = analyze_text(text, progress)
+    
+    if progress:
+        progress(0.95, 'report')
+    return finish_result(result, filename, cache_key, text, time.time() - start_time)
+
+def finish_result(result, filename, cache_key, text=None, processing_time=None):
+    """Render the PDF report for a result and store it in the cache."""
+    # Generate PDF report
+    report_filename = generate_pdf_report(result, filename)
+    if report_filename:
+        result['report_url'] = f'/reports/{report_filename}'
+    else:
+        print("Warning: PDF report generation failed")
+    
+    if text is not None and MODEL_NAME == model_cache_name(SUMMARIZATION_MODELS[0]):
+        document_id = summary_cache.put(cache_key, result, filename, text, processing_time)
+        # Count the new Document row in the IDF model
+        record_idf_document(text, document_id)
+    else:
+        # Cached results and results of a fallback model are only kept in
+        # this process, whose model does not change
+        summary_cache.memory.put(cache_key, result)
+        if text is not None:
+            record_idf_document(text, None)
+    
+    return result
+
+def run_summarize_job(progress, upload, filename, cache_key):
+    try:
+        cached = summary_cache.get(cache_key)
+        if cached is not None and report_exists(cached):
+            return cached
+        return summarize_file(upload, filename, cache_key, cached, progress)
+    finally:
+        upload.close()
+
 @app.route('/summarize', methods=['POST', 'OPTIONS'])
 def summarize():
     if request.method == 'OPTIONS':
         return create_response()
         
     try:
-        if 'document' not in request.files:
-            return create_response(error='No file provided', status=400)
-        
-        file = request.files['document']
-        if file.filename == '':
-            return create_response(error='No file selected', status=400)
-        
-        if not allowed_file(file.filename):
-            return create_response(error='File type not allowed. Please upload PDF, DOCX, or TXT files.', status=400)
+        file, error_response = get_uploaded_file()
+        if error_response:
+            return error_response
         
-        # Save the file temporarily
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
         
-        # Process the document
-        result = process_document(file_path)
+        # Serve repeated uploads of the same document from the cache
+        cache_key = get_cache_key(file)
+        cached = summary_cache.get(cache_key)
+        if cached is not None and report_exists(cached):
+            return create_response(data=cached)
         
-        # Generate PDF report
-        report_filename = generate_pdf_report(result, filename)
-        if report_filename:
-            result['report_url'] = f'/reports/{report_filename}'
-        else:
-            print("Warning: PDF report generation failed")
-        
-        # Clean up the uploaded file
-        try:
-            os.remove(file_path)
-        except:
-            pass
+        # Parse the upload in place, without saving it to disk
+        result = summarize_file(file.stream, filename, cache_key, cached)
         
         return create_response(data=result)
         
@@ -475,5 +765,94 @@ def summarize():
         print(f"Error processing document: {str(e)}")
         return create_response(error=str(e), status=500)
 
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/summarize/stream', methods=['POST'])
+def summarize_stream():
+    file, error_response = get_uploaded_file()
+    if error_response:
+        return error_response
+    
+    filename = secure_filename(file.filename)
+    cache_key = get_cache_key(file)
+    cached = summary_cache.get(cache_key)
+    
+    def generate():
+        try:
+            if cached is not None:
+                result = dict(cached)
+                for stage in ('summary', 'dates', 'suggested_articles', 'importance'):
+                    yield sse_event(stage, result.get(stage))
+                if not report_exists(result):
+                    result = finish_result(result, filename, cache_key)
+            else:
+                start_time = time.time()
+                yield sse_event('status', {'stage': 'extracting'})
+                # stream_with_context keeps the request, and so the upload, open
+                text = extract_text(file.stream, filename)
+                
+                # Send every stage to the client as soon as it is ready
+                result = {}
+                for stage, data in iter_analysis(text):
+                    yield sse_event(stage, data)
+                    if stage != 'chunk':
+                        result[stage] = data
+                
+                yield sse_event('status', {'stage': 'report'})
+                result = finish_result(result, filename, cache_key, text, time.time() - start_time)
+            
+            yield sse_event('done', {'report_url': result.get('report_url')})
+        except Exception as e:
+            print(f"Error streaming document: {str(e)}")
+            yield sse_event('error', {'error': str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/jobs', methods=['POST', 'OPTIONS'])
+def submit_job():
+    if request.method == 'OPTIONS':
+        return create_response()
+    
+    try:
+        file, error_response = get_uploaded_file()
+        if error_response:
+            return error_response
+        
+        filename = secure_filename(file.filename)
+        cache_key = get_cache_key(file)
+        upload = spool_upload(file)
+        
+        try:
+            job_id = job_queue.submit(run_summarize_job, upload, filename, cache_key)
+        except QueueFullError as e:
+            upload.close()
+            response = create_response(error=str(e), status=503)
+            response[0].headers['Retry-After'] = '5'
+            return response
+        
+        return create_response(data={
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/jobs/{job_id}'
+        }, status=202)
+        
+    except Exception as e:
+        print(f"Error submitting document: {str(e)}")
+        return create_response(error=str(e), status=500)
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return create_response(error='Job not found', status=404)
+    return create_response(data=job)
+
 if __name__ == '__main__':
+    if not app.config['FAST_START']:
+        warmup()
     app.run(host='127.0.0.1', port=5001, debug=True) 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float
+from sqlalchemy import create_engine, inspect, Column, Integer, String, Text, DateTime, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -10,12 +10,14 @@ class Document(Base):
 
     id = Column(Integer, primary_key=True)
     filename = Column(String(255), nullable=False)
+    cache_key = Column(String(64), index=True)  # Hash of file bytes and model config
     original_text = Column(Text, nullable=False)
     summary = Column(Text)
     dates = Column(Text)  # Stored as JSON string
     importance_high = Column(Text)  # Stored as JSON string
     importance_medium = Column(Text)  # Stored as JSON string
     importance_low = Column(Text)  # Stored as JSON string
+    suggested_articles = Column(Text)  # Stored as JSON string
     processing_time = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -30,9 +32,39 @@ class TrainingData(Base):
     quality_score = Column(Float)  # Score for data quality
     created_at = Column(DateTime, default=datetime.utcnow)
 
+def _add_missing_columns(engine):
+    """
+    Add columns, with their indexes, that tables of an older database lack.
+
+    create_all only creates missing tables, so a database created before a
+    column was added (such as documents.cache_key) would otherwise keep its
+    old table and every query naming the new column would fail.
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        if not missing:
+            continue
+        with engine.begin() as connection:
+            for column in missing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}")
+            for index in table.indexes:
+                if any(column in missing for column in index.columns):
+                    index.create(connection)
+
 # Database initialization
-def init_db(db_url='sqlite:///legal_summarizer.db'):
+def init_session_factory(db_url='sqlite:///legal_summarizer.db'):
     engine = create_engine(db_url)
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
+    _add_missing_columns(engine)
+    return sessionmaker(bind=engine)
+
+def init_db(db_url='sqlite:///legal_summarizer.db'):
+    Session = init_session_factory(db_url)
     return Session() 
\ No newline at end of file
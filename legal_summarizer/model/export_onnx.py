@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+
+from utils.onnx_backend import export_onnx, onnx_dir
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the fine-tuned model to ONNX for the onnx inference backend")
+    parser.add_argument('--model-dir', default="trained_model")
+    parser.add_argument('--output-dir', default=None, help="Defaults to <model-dir>-onnx")
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or onnx_dir(args.model_dir)
+    logger.info(f"Exporting {args.model_dir} to {output_dir}...")
+    try:
+        export_onnx(args.model_dir, output_dir)
+    except Exception as e:
+        logger.error(f"Export failed: {str(e)}")
+        raise
+    logger.info(f"Saved encoder and decoder graphs to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+# Force CPU usage
+os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+from utils.quantization import PRECISIONS, quantize_model, quantized_dir, save_quantized
+from model.test_model import LegalSummarizerTester
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def save_checkpoints(model_dir: str, precisions: List[str]):
+    """Quantize the fp32 model in model_dir and save each precision next to it."""
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    for precision in precisions:
+        if precision == 'fp32':
+            continue
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_dir)
+        model.eval()
+        output_dir = quantized_dir(model_dir, precision)
+        save_quantized(quantize_model(model, precision), tokenizer, output_dir, precision, base_model=model_dir)
+        logger.info(f"Saved {precision} checkpoint to {output_dir}")
+
+
+def _ngrams(tokens: List[str], n: int) -> Counter:
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _lcs_length(a: List[str], b: List[str]) -> int:
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def _f1(overlap: int, candidate_total: int, reference_total: int) -> float:
+    if not overlap:
+        return 0.0
+    precision = overlap / candidate_total
+    recall = overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_scores(reference: str, candidate: str) -> Dict[str, float]:
+    """ROUGE-1, ROUGE-2 and ROUGE-L F1 on lowercased whitespace tokens."""
+    ref = reference.lower().split()
+    cand = candidate.lower().split()
+    scores = {}
+    for n in (1, 2):
+        ref_ngrams, cand_ngrams = _ngrams(ref, n), _ngrams(cand, n)
+        overlap = sum((ref_ngrams & cand_ngrams).values())
+        scores[f'rouge{n}'] = _f1(overlap, sum(cand_ngrams.values()), sum(ref_ngrams.values()))
+    scores['rougeL'] = _f1(_lcs_length(ref, cand), len(cand), len(ref))
+    return scores
+
+
+def evaluate_precision(model_dir: str, precision: str, test_cases: List[Dict]) -> Dict:
+    """Summarize every test case at one precision, recording ROUGE and latency."""
+    tester = LegalSummarizerTester(model_dir, precision=precision)
+    tester.generate_summary(test_cases[0]['text'])  # Warm-up, not timed
+
+    latencies, scores = [], []
+    for case in test_cases:
+        start = time.perf_counter()
+        summary = tester.generate_summary(case['text'])
+        latencies.append(time.perf_counter() - start)
+        scores.append(rouge_scores(case['reference_summary'], summary))
+
+    return {
+        'precision': precision,
+        'cases': len(test_cases),
+        'median_latency_per_chunk': statistics.median(latencies),
+        'mean_latency_per_chunk': statistics.mean(latencies),
+        **{metric: statistics.mean(score[metric] for score in scores) for metric in ('rouge1', 'rouge2', 'rougeL')}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save quantized checkpoints and compare accuracy against speed")
+    parser.add_argument('--model-dir', default="trained_model")
+    parser.add_argument('--precisions', nargs='+', default=list(PRECISIONS), choices=PRECISIONS)
+    parser.add_argument('--save', action='store_true', help="Save quantized checkpoints next to --model-dir first")
+    parser.add_argument('--cases', type=int, default=20, help="TrainingData rows to evaluate on")
+    args = parser.parse_args()
+
+    if args.save:
+        save_checkpoints(args.model_dir, args.precisions)
+
+    # Each TrainingData row is one model-sized chunk (generate_summary truncates to 512 tokens)
+    test_cases = LegalSummarizerTester.load_test_cases(args.cases)
+    if not test_cases:
+        logger.error("No TrainingData rows found; run the training data pipeline first")
+        return
+
+    report = [evaluate_precision(args.model_dir, precision, test_cases) for precision in args.precisions]
+    baseline = next((row for row in report if row['precision'] == 'fp32'), None)
+    for row in report:
+        speedup = baseline['median_latency_per_chunk'] / row['median_latency_per_chunk'] if baseline else 1.0
+        logger.info(f"{row['precision']:>5} | ROUGE-1 {row['rouge1']:.4f} | ROUGE-2 {row['rouge2']:.4f} | "
+                    f"ROUGE-L {row['rougeL']:.4f} | {row['median_latency_per_chunk'] * 1000:8.1f} ms/chunk | "
+                    f"{speedup:.2f}x")
+
+    output_dir = "test_results"
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, "quantization_report.json")
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Report saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,60 +2,67 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+from transformers import AutoTokenizer
 import torch
 import logging
 from typing import List, Dict
 import json
 from database.models import TrainingData, init_db
+from utils.generation import GenerationPolicy
+from utils.quantization import load_model
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class LegalSummarizerTester:
-    def __init__(self, model_dir: str = "trained_model"):
+    def __init__(self, model_dir: str = "trained_model", precision: str = "fp32"):
         self.model_dir = model_dir
+        self.precision = precision
         
-        # Load model and tokenizer
-        logger.info(f"Loading model from {model_dir}...")
+        # Load model and tokenizer; int8/bf16 use the quantized checkpoint
+        # next to model_dir when one has been saved
+        logger.info(f"Loading model from {model_dir} ({precision})...")
         self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_dir)
-        self.model.eval()  # Set to evaluation mode
+        self.model = load_model(model_dir, precision)  # In evaluation mode
         
         # Force CPU usage
         os.environ["CUDA_VISIBLE_DEVICES"] = ""
         torch.set_default_device('cpu')
 
-    def generate_summary(self, text: str, max_length: int = 150, min_length: int = 50) -> str:
+    def generate_summary(self, text: str, max_length: int = 150, min_length: int = 50, adaptive: bool = True) -> str:
         """Generate a summary for the given legal text"""
-        # Tokenize input text
+        # Tokenize input text; padding is only needed (and only added) for batches
         inputs = self.tokenizer(
             text,
             max_length=512,
-            padding='max_length',
+            padding=True,
             truncation=True,
             return_tensors='pt'
         )
         
+        # Pick summary length and beams from the input's length and importance
+        if adaptive:
+            params = GenerationPolicy(lambda _: inputs['input_ids'].shape[1], max_length, min_length)(text)
+        else:
+            params = {'max_length': max_length, 'min_length': min_length, 'num_beams': 4, 'early_stopping': True}
+        
         # Generate summary
         summary_ids = self.model.generate(
             inputs['input_ids'],
             attention_mask=inputs['attention_mask'],
-            max_length=max_length,
-            min_length=min_length,
-            num_beams=4,
             length_penalty=2.0,
-            early_stopping=True
+            **params
         )
         
         # Decode summary
         summary = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
         return summary
 
-    def load_test_cases(self) -> List[Dict]:
+    @staticmethod
+    def load_test_cases(limit: int = 5) -> List[Dict]:
         """Load some test cases from the database"""
         session = init_db()
-        test_cases = session.query(TrainingData).limit(5).all()
+        test_cases = session.query(TrainingData).limit(limit).all()
         return [{"text": case.document_text, "reference_summary": case.summary} for case in test_cases]
 
     def evaluate_model(self):
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+import time
+
+from utils.dates import extract_dates
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PARAGRAPH = (
+    "The agreement was executed on the 15th day of March, 2024 at New Delhi. The lessee shall pay the rent "
+    "by 05/04/2024 and every month thereafter. Notice under Section 80 was served on {month} {day}, {year}. "
+    "The hearing is listed for {year}-{month_number:02d}-{day:02d}, and no adjournment shall be granted. "
+)
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+
+
+def make_text(size_mb: float) -> str:
+    """Contract-like text of about size_mb megabytes with many distinct dates."""
+    paragraphs = []
+    length = 0
+    i = 0
+    while length < size_mb * 1024 * 1024:
+        paragraph = PARAGRAPH.format(month=MONTHS[i % 12], month_number=i % 12 + 1,
+                                     day=i % 28 + 1, year=1990 + i % 35)
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+        i += 1
+    return ''.join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how date extraction scales with document size")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 2, 4, 8], help="Document sizes in MB")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        text = make_text(size)
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            dates = extract_dates(text)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        logger.info(f"{size:6.1f} MB | {best:7.3f} s | {best / size:6.3f} s/MB | {len(dates)} distinct dates")
+
+
+if __name__ == "__main__":
+    main()
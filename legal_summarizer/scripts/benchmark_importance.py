@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+import random
+import time
+
+from utils.importance import classify_importance
+from utils.segmentation import Document
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+KEYWORDS = ["must", "should", "deadline", "consider", "the", "court"]
+
+
+def make_document(sentences: int, vocabulary: int = 5000, words: int = 12) -> Document:
+    """Document of random twelve-word sentences, some with importance keywords."""
+    terms = [f"term{i}" for i in range(vocabulary)] + KEYWORDS
+    return Document(" ".join(" ".join(random.choice(terms) for _ in range(words)).capitalize() + "."
+                             for _ in range(sentences)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how importance classification scales with sentence count")
+    parser.add_argument('--sentences', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    for count in args.sentences:
+        document = make_document(count)
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            classify_importance(document)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        logger.info(f"{count:8d} sentences | {best:7.3f} s | {best / count * 1e6:6.2f} us/sentence")
+
+
+if __name__ == "__main__":
+    main()
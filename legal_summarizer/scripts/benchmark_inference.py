@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.batching import summarize_batched
+from utils.inference_service import InferenceService
+from utils.model_registry import registry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CLAUSE = (
+    "The Employee shall serve as {position} and shall perform such duties as are regularly and "
+    "customarily performed by a person holding such position. The Employer shall pay the Employee a "
+    "base salary of {salary} per annum, payable in accordance with the Employer's standard payroll "
+    "practices. Either party may terminate this Agreement upon providing {notice} days written notice "
+    "to the other party, and the Employee shall return all confidential information on termination."
+)
+
+
+def make_chunks(count: int, offset: int = 0):
+    """Distinct chunks of contract text so no two requests are identical."""
+    return [
+        CLAUSE.format(position=f"Engineer grade {i}", salary=f"${50000 + i * 10}", notice=30 + i % 60)
+        for i in range(offset, offset + count)
+    ]
+
+
+def run_clients(summarizer, clients: int, chunks_per_client: int, batch_size: int, max_length: int) -> dict:
+    """Have several clients summarize their own documents concurrently."""
+    def client(index):
+        chunks = make_chunks(chunks_per_client, offset=index * chunks_per_client)
+        start = time.perf_counter()
+        summarize_batched(summarizer, chunks, batch_size=batch_size,
+                          max_length=max_length, min_length=10, do_sample=False, truncation=True)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = list(executor.map(client, range(clients)))
+    elapsed = time.perf_counter() - start
+    return {
+        'chunks_per_second': clients * chunks_per_client / elapsed,
+        'median_latency': statistics.median(latencies)
+    }
+
+
+def report(label: str, clients: int, result: dict):
+    logger.info(f"{label:>24} | {clients:>3} clients | {result['chunks_per_second']:7.2f} chunks/s | "
+                f"median document latency {result['median_latency']:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure summarization throughput under concurrent clients")
+    parser.add_argument('--model', default="sshleifer/distilbart-cnn-12-6")
+    parser.add_argument('--threads', type=int, default=1, help="torch threads per inference worker")
+    parser.add_argument('--workers', type=int, default=None, help="Inference workers (default: cores / threads)")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--chunks', type=int, default=8, help="Chunks per client document")
+    parser.add_argument('--batch-size', type=int, default=4)
+    parser.add_argument('--max-length', type=int, default=60)
+    parser.add_argument('--skip-in-process', action='store_true', help="Only benchmark the worker pool")
+    args = parser.parse_args()
+
+    workers = args.workers or max(1, (os.cpu_count() or 1) // args.threads)
+    pipeline = registry.summarization_pipeline(args.model)
+
+    # The worker pool is benchmarked first: the parent must not run inference
+    # before forking
+    service = InferenceService(pipeline, num_workers=workers, threads_per_worker=args.threads).start()
+    try:
+        summarize_batched(service, make_chunks(workers), batch_size=1, max_length=args.max_length)
+        for clients in args.clients:
+            result = run_clients(service, clients, args.chunks, args.batch_size, args.max_length)
+            report(f"{workers} workers x {args.threads} threads", clients, result)
+    finally:
+        service.stop()
+
+    if not args.skip_in_process:
+        summarize_batched(pipeline, make_chunks(1), max_length=args.max_length)
+        for clients in args.clients:
+            result = run_clients(pipeline, clients, args.chunks, args.batch_size, args.max_length)
+            report("in-process pipeline", clients, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sys
+import os
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import tempfile
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so every measurement is a true cold start
+PROBE = r'''
+import io, json, sys, time
+sys.path.insert(0, {app_dir!r})
+start = time.perf_counter()
+import app
+import_time = time.perf_counter() - start
+
+warmup_time = None
+if {warmup!r}:
+    start = time.perf_counter()
+    app.warmup()
+    warmup_time = time.perf_counter() - start
+
+client = app.app.test_client()
+start = time.perf_counter()
+client.get('/health')
+health_time = time.perf_counter() - start
+
+text = "This Agreement is made on January 15, 2024. Payment is mandatory within 30 days. " * 40
+start = time.perf_counter()
+response = client.post('/summarize', data={{'document': (io.BytesIO(text.encode()), 'probe.txt')}},
+                       content_type='multipart/form-data')
+first_request_time = time.perf_counter() - start
+
+print(json.dumps({{
+    'import': import_time,
+    'warmup': warmup_time,
+    'health': health_time,
+    'first_request': first_request_time,
+    'status': response.status_code
+}}))
+'''
+
+
+def run_probe(warmup: bool) -> dict:
+    """Start a fresh interpreter, import the app and time its first requests."""
+    with tempfile.TemporaryDirectory() as workdir:
+        os.symlink(os.path.join(APP_DIR, 'data'), os.path.join(workdir, 'data'))
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(app_dir=APP_DIR, warmup=warmup)],
+            cwd=workdir,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the Flask app")
+    parser.add_argument('--runs', type=int, default=5, help="Number of cold starts to time")
+    parser.add_argument('--warmup', action='store_true', help="Call app.warmup() before the first request")
+    args = parser.parse_args()
+
+    results = [run_probe(args.warmup) for _ in range(args.runs)]
+    for metric in ('import', 'warmup', 'health', 'first_request'):
+        values = [result[metric] for result in results if result[metric] is not None]
+        if values:
+            logger.info(f"{metric:>14}: median {statistics.median(values) * 1000:8.1f} ms  "
+                        f"(min {min(values) * 1000:.1f}, max {max(values) * 1000:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+
+from database.models import init_session_factory
+from utils.idf import DEFAULT_IDF_PATH, IdfModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or update the IDF model used for importance scoring")
+    parser.add_argument('--db-url', default='sqlite:///legal_summarizer.db')
+    parser.add_argument('--output', default=DEFAULT_IDF_PATH)
+    parser.add_argument('--rebuild', action='store_true', help="Count every row again instead of only new ones")
+    args = parser.parse_args()
+
+    model = IdfModel(args.output) if args.rebuild else IdfModel.load(args.output)
+    added = model.update_from_database(init_session_factory(args.db_url))
+    model.save()
+    logger.info(f"Counted {added} new documents; the model covers {len(model)} documents. Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+
+from utils.law_retrieval import ANN_THRESHOLD, DEFAULT_LAW_INDEX_DIR, build_index
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the article vectors used by semantic law article retrieval")
+    parser.add_argument('--catalogue', default=os.path.join(APP_DIR, 'data', 'indian_law_articles.json'))
+    parser.add_argument('--index-dir', default=DEFAULT_LAW_INDEX_DIR)
+    parser.add_argument('--dimensions', type=int, default=256)
+    parser.add_argument('--ann-threshold', type=int, default=ANN_THRESHOLD,
+                        help="Also build an inverted-file index for catalogues larger than this")
+    args = parser.parse_args()
+
+    logger.info(f"Indexing {args.catalogue}...")
+    directory = build_index(args.catalogue, args.index_dir, args.dimensions, args.ann_threshold)
+    logger.info(f"Saved article index to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,33 +6,41 @@ from preprocessing.document_processor import DocumentProcessor
 from model.summarizer import LegalSummarizer
 
 class LegalDocumentSummarizer:
-    def __init__(self):
+    def __init__(self, precision: str = "fp32", backend: str = "pytorch"):
         self.document_processor = DocumentProcessor()
-        self.summarizer = LegalSummarizer()
+        self.summarizer = LegalSummarizer(precision=precision, backend=backend)
         
-    def process_document(self, file_path: str) -> Dict[str, Any]:
+    def warmup(self):
+        """Load every model up front and run one short generation."""
+        self.summarizer.warmup()
+        
+    def process_document(self, file_path, filename: str = None) -> Dict[str, Any]:
         """
         Process a legal document and generate a comprehensive summary.
         
         Args:
-            file_path (str): Path to the legal document
+            file_path: Path to the legal document, or a binary file object
+            filename (str): Document name, required when file_path is a file object
             
         Returns:
             Dict containing the processed results
         """
         # Process the document
-        processed_data = self.document_processor.process_document(file_path)
+        processed_data = self.document_processor.process_document(file_path, filename)
+        
+        # Both stages reuse the sentence boundaries found during processing
+        document = processed_data['document']
         
         # Generate summary
-        summary = self.summarizer.summarize(processed_data['text'])
+        summary = self.summarizer.summarize(document)
         
         # Categorize information
-        categorized_info = self.summarizer.categorize_importance(processed_data['text'])
+        categorized_info = self.summarizer.categorize_importance(document)
         
         # Prepare the final report
         report = {
             'document_info': {
-                'filename': os.path.basename(file_path),
+                'filename': filename or os.path.basename(file_path),
                 'processing_date': datetime.now().isoformat(),
                 'total_pages': len(processed_data['text'].split('\n')) // 50  # Approximate page count
             },
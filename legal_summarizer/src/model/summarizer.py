@@ -1,64 +1,148 @@
-from transformers import pipeline, AutoModelForSeq2SeqLM, AutoTokenizer
-from typing import Dict, List, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from typing import Dict, List, Tuple, Union
 import torch
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from nltk.tokenize import sent_tokenize
+from utils.chunking import TextChunker
+from utils.generation import GenerationPolicy, chunk_policy
+from utils.extractive import ExtractiveFilter
+from utils.hierarchical import reduce_summaries
+from utils.inference_service import InferenceService
+from utils.batching import sentence_fallback, summarize_batched
+from utils.cache import ChunkSummaryCache
+from utils.idf import IdfModel, DEFAULT_IDF_PATH
+from utils.importance import importance_scores, keyword_counts, scale_scores
+from utils.model_registry import registry
+from utils.segmentation import Document, as_document
 
 class LegalSummarizer:
-    def __init__(self, model_name: str = "facebook/bart-large-cnn"):
+    def __init__(self, model_name: str = "facebook/bart-large-cnn", batch_size: int = 8, chunk_cache_size: int = 4096,
+                 precision: str = "fp32", backend: str = "pytorch", extractive_max_tokens: int = 0,
+                 extractive_method: str = "tfidf", inference_workers: int = 0, idf_path: str = DEFAULT_IDF_PATH):
         """
         Initialize the legal document summarizer.
         
         Args:
             model_name (str): Name of the pre-trained model to use
+            batch_size (int): Number of chunks summarized per forward pass
+            chunk_cache_size (int): Number of chunk summaries memoized across documents
+            precision (str): CPU inference precision: 'fp32', 'int8' or 'bf16'
+            backend (str): Inference engine: 'pytorch' or 'onnx' (ONNX Runtime)
+            extractive_max_tokens (int): Token budget of top-ranked sentences
+                passed to the model for long documents; 0 (the default)
+                summarizes every sentence
+            extractive_method (str): Sentence ranking, 'tfidf' or 'textrank'
+            inference_workers (int): Worker processes that summarize chunks in
+                parallel; 0 runs the model in the calling thread
+            idf_path (str): Saved IdfModel used to weight sentences in
+                categorize_importance (see scripts/build_idf_model.py)
         """
         self.model_name = model_name
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-        self.summarizer = pipeline("summarization", model=model_name, tokenizer=self.tokenizer)
+        self.batch_size = batch_size
+        # Loaded once per process; the pipeline shares self.model's weights
+        self.tokenizer = registry.tokenizer(model_name)
+        self.precision = precision
+        self.backend = backend
+        self.model = registry.model(model_name, precision, backend)
+        self.summarizer = registry.summarization_pipeline(model_name, precision, backend)
+        if inference_workers > 0:
+            # Forked now, before this process runs any inference itself
+            self.summarizer = InferenceService(self.summarizer, num_workers=inference_workers).start()
+        cache_name = model_name if precision == "fp32" else f"{model_name}@{precision}"
+        if backend != "pytorch":
+            cache_name = f"{cache_name}@{backend}"
+        self.chunk_cache = ChunkSummaryCache(cache_name, max_entries=chunk_cache_size)
+        self.chunker = TextChunker(self.tokenizer)
+        # Corpus IDF weights, so categorizing a document is only a transform
+        self.idf_model = IdfModel.load(idf_path)
+        self.extractive_filter = None
+        if extractive_max_tokens > 0:
+            self.extractive_filter = ExtractiveFilter(extractive_max_tokens, extractive_method,
+                                                      self.chunker.token_counts)
+        
+    def warmup(self):
+        """Run one short generation so the first request doesn't pay for lazy initialization."""
+        self.summarizer(
+            "The court heard the appeal and reserved its judgment on the matter.",
+            max_length=16,
+            min_length=1,
+            do_sample=False
+        )
         
-    def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
+    def summarize(self, text: Union[str, Document], max_length: int = 150, min_length: int = 30, adaptive: bool = True,
+                  target_length: int = 256) -> str:
         """
         Generate a summary of the input text.
         
         Args:
-            text (str): Input text to summarize
-            max_length (int): Maximum length of the summary
-            min_length (int): Minimum length of the summary
+            text: Input text to summarize, or its Document
+            max_length (int): Maximum length of each chunk's summary
+            min_length (int): Minimum length of each chunk's summary
+            adaptive (bool): Scale each chunk's summary length and beam count
+                to its token length and importance (see GenerationPolicy)
+            target_length (int): Maximum length of the whole summary in tokens;
+                chunk summaries are re-summarized until they fit. 0 joins
+                the chunk summaries instead.
             
         Returns:
             str: Generated summary
         """
-        # Split text into chunks if it's too long
-        chunks = self._chunk_text(text)
+        # Keep only the highest-ranked sentences of long documents
+        document = as_document(text)
+        sentences = document.sentences()
+        kept = self.extractive_filter.select(sentences) if self.extractive_filter else range(len(sentences))
         
-        summaries = []
-        for chunk in chunks:
-            summary = self.summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-            summaries.append(summary[0]['summary_text'])
-            
-        return " ".join(summaries)
+        # Pack the sentences into chunks that fit the model, noting which of
+        # the document's sentences each chunk holds
+        groups = self.chunker.chunk_sentence_groups([sentences[i] for i in kept])
+        groups = [(chunk, [kept[i] for i in indices]) for chunk, indices in groups]
+        
+        policy = GenerationPolicy(self.chunker.count_tokens, max_length, min_length) if adaptive else None
+        generate_kwargs = dict(max_length=max_length, min_length=min_length, do_sample=False, truncation=True)
+        summaries = summarize_batched(
+            self.summarizer,
+            [chunk for chunk, _ in groups],
+            batch_size=self.batch_size,
+            fallback=sentence_fallback(sentences, groups),
+            cache=self.chunk_cache,
+            policy=chunk_policy(policy, groups, *keyword_counts(document)) if adaptive else None,
+            **generate_kwargs
+        )
+        
+        if target_length <= 0:
+            return " ".join(summaries)
+        return reduce_summaries(
+            self.summarizer,
+            summaries,
+            self.chunker,
+            target_length=target_length,
+            batch_size=self.batch_size,
+            cache=self.chunk_cache,
+            policy=policy,
+            **generate_kwargs
+        )
     
-    def categorize_importance(self, text: str) -> Dict[str, List[str]]:
+    def categorize_importance(self, text: Union[str, Document]) -> Dict[str, List[str]]:
         """
         Categorize sentences based on their importance.
         
         Args:
-            text (str): Input text to categorize
+            text: Input text to categorize, or its Document
             
         Returns:
             Dict containing lists of sentences categorized by importance
         """
-        sentences = sent_tokenize(text)
+        document = as_document(text)
+        sentences = document.sentences()
         
-        # Calculate sentence importance using TF-IDF
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(sentences)
-        sentence_scores = np.array(tfidf_matrix.sum(axis=1)).flatten()
+        # Calculate sentence importance using TF-IDF, with the corpus IDF
+        # weights when a model has been built
+        idf = self.idf_model.weights() if len(self.idf_model) else None
+        sentence_scores = importance_scores(document, idf=idf).tfidf
         
-        # Normalize scores
-        normalized_scores = (sentence_scores - sentence_scores.min()) / (sentence_scores.max() - sentence_scores.min())
+        # Normalize scores (all zero when every sentence scores the same)
+        normalized_scores = scale_scores(sentence_scores)
         
         # Categorize sentences
         very_important = []
@@ -79,32 +163,18 @@ class LegalSummarizer:
             'not_so_important': not_so_important
         }
     
-    def _chunk_text(self, text: str, chunk_size: int = 1024) -> List[str]:
+    def _chunk_text(self, text: str, chunk_size: int = None, overlap: int = 0) -> List[str]:
         """
-        Split text into chunks of appropriate size for the model.
+        Split text into sentence-aligned chunks that fit the model.
         
         Args:
             text (str): Input text
-            chunk_size (int): Maximum size of each chunk
+            chunk_size (int): Maximum number of tokens per chunk. Defaults to
+                the model's maximum input length.
+            overlap (int): Number of tokens repeated between consecutive chunks
             
         Returns:
             List of text chunks
         """
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for word in words:
-            current_chunk.append(word)
-            current_size += 1
-            
-            if current_size >= chunk_size:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = []
-                current_size = 0
-                
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-            
-        return chunks 
\ No newline at end of file
+        chunker = TextChunker(self.tokenizer, max_tokens=chunk_size, overlap_tokens=overlap)
+        return chunker.chunk(text)
@@ -1,87 +1,72 @@
+import sys
 import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
 from typing import List, Dict, Union
-import PyPDF2
-from docx import Document
-import spacy
 from datetime import datetime
 import re
+from utils.cache import ExtractedTextCache, DEFAULT_TEXT_CACHE_DIR
+from utils.extraction import iter_pages, join_pages, page_spans
+from utils.ner import EntityExtractor, load_ner
+from utils.segmentation import Document
 
 class DocumentProcessor:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, text_cache: ExtractedTextCache = None, ner_processes: int = None,
+                 ner_batch_size: int = 32):
+        """
+        Args:
+            text_cache (ExtractedTextCache): Store of extracted text. Defaults
+                to the store app.py uses, so both skip files either has seen.
+            ner_processes (int): Processes for entity recognition on long
+                documents. Defaults to LEXBRIEF_NER_PROCESSES, else 1.
+            ner_batch_size (int): Pages or paragraphs per spaCy batch
+        """
+        if ner_processes is None:
+            ner_processes = int(os.environ.get('LEXBRIEF_NER_PROCESSES', '1'))
+        # Loaded once per process and shared between processors; only the
+        # components entity recognition needs are loaded
+        self.nlp = load_ner("en_core_web_sm")
+        self.entity_extractor = EntityExtractor(self.nlp, batch_size=ner_batch_size, n_process=ner_processes)
+        self.text_cache = text_cache if text_cache is not None else ExtractedTextCache(
+            os.environ.get('LEXBRIEF_EXTRACTION_CACHE_DIR', DEFAULT_TEXT_CACHE_DIR)
+        )
         
-    def process_document(self, file_path: str) -> Dict[str, Union[str, List[str]]]:
+    def process_document(self, file_path, filename: str = None) -> Dict[str, Union[str, List[str]]]:
         """
         Process a document based on its file extension and return extracted text.
         
         Args:
-            file_path (str): Path to the document file
+            file_path: Path to the document file, or a binary file object
+                (such as an upload stream) that is parsed in memory
+            filename (str): Name giving the file type when file_path is a file object
             
         Returns:
             Dict containing:
                 - text: Extracted text
+                - document: The text's Document, with its sentence boundaries
+                - pages: Page number and character span of every page
                 - dates: List of dates found
                 - entities: List of named entities
         """
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        if file_ext == '.pdf':
-            text = self._process_pdf(file_path)
-        elif file_ext == '.docx':
-            text = self._process_docx(file_path)
-        elif file_ext == '.txt':
-            text = self._process_txt(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_ext}")
+        # Raises ValueError for unsupported formats
+        pages = list(iter_pages(file_path, cache=self.text_cache, filename=filename))
+        text = join_pages(pages)
             
-        # Process the extracted text
-        doc = self.nlp(text)
-        
-        # Extract dates and entities
-        dates = self._extract_dates(doc)
-        entities = self._extract_entities(doc)
+        # Sentences come from the shared splitter; spaCy only finds entities,
+        # page by page, so documents beyond its max_length are handled too
+        document = Document(text)
+        spans = page_spans(pages)
+        entities = self.entity_extractor.extract(text, spans)
+        dates = self._extract_dates(entities)
         
         return {
             'text': text,
+            'document': document,
+            'pages': spans,
             'dates': dates,
             'entities': entities
         }
     
-    def _process_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file."""
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
-    
-    def _process_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file."""
-        doc = Document(file_path)
-        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
-    
-    def _process_txt(self, file_path: str) -> str:
-        """Extract text from TXT file."""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    
-    def _extract_dates(self, doc) -> List[str]:
-        """Extract dates from the document."""
-        dates = []
-        for ent in doc.ents:
-            if ent.label_ == 'DATE':
-                dates.append(ent.text)
-        return dates
-    
-    def _extract_entities(self, doc) -> List[Dict[str, str]]:
-        """Extract named entities from the document."""
-        entities = []
-        for ent in doc.ents:
-            entities.append({
-                'text': ent.text,
-                'label': ent.label_,
-                'start': ent.start_char,
-                'end': ent.end_char
-            })
-        return entities 
\ No newline at end of file
+    def _extract_dates(self, entities: List[Dict[str, str]]) -> List[str]:
+        """Dates among the document's entities."""
+        return [entity['text'] for entity in entities if entity['label'] == 'DATE'] 
\ No newline at end of file
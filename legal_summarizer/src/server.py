@@ -7,16 +7,21 @@ from main import LegalDocumentSummarizer
 app = Flask(__name__)
 CORS(app)
 
-# Configure upload folder
-UPLOAD_FOLDER = 'uploads'
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 
+# Model precision ('fp32', 'int8', 'bf16') and inference engine ('pytorch', 'onnx')
+app.config['INFERENCE_PRECISION'] = os.environ.get('LEXBRIEF_PRECISION', 'fp32')
+app.config['INFERENCE_BACKEND'] = os.environ.get('LEXBRIEF_BACKEND', 'pytorch')
+
+# Load and warm up the models once at startup; every request reuses them
+document_summarizer = LegalDocumentSummarizer(
+    precision=app.config['INFERENCE_PRECISION'],
+    backend=app.config['INFERENCE_BACKEND']
+)
+document_summarizer.warmup()
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -31,15 +36,10 @@ def summarize_document():
     
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
         
         try:
-            summarizer = LegalDocumentSummarizer()
-            report = summarizer.process_document(filepath)
-            
-            # Clean up the uploaded file
-            os.remove(filepath)
+            # Parsed straight from the upload stream; nothing is written to disk
+            report = document_summarizer.process_document(file.stream, filename)
             
             return jsonify(report)
         except Exception as e:
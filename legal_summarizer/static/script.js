@@ -106,24 +106,49 @@ document.addEventListener('DOMContentLoaded', () => {
             const formData = new FormData();
             formData.append('document', file);
 
-            const response = await fetch('/summarize', {
-                method: 'POST',
-                body: formData
-            });
-
-            const data = await response.json();
+            // Render each part of the analysis as soon as the server sends it
+            currentData = {};
+            const chunkSummaries = [];
+            let failed = null;
+
+            await streamDocument(formData, (event, data) => {
+                if (event === 'status') {
+                    loadingOverlay.querySelector('p').textContent = data.stage === 'report' ?
+                        'Generating report...' : 'Extracting text...';
+                    return;
+                }
+                if (event === 'error') {
+                    failed = data.error;
+                    return;
+                }
 
-            if (!response.ok) {
-                throw new Error(data.error || 'Failed to process document');
-            }
+                loadingOverlay.style.display = 'none';
+                showResultsSection();
+
+                if (event === 'chunk') {
+                    chunkSummaries[data.index] = data.summary;
+                    summaryContent.textContent = chunkSummaries.filter(Boolean).join(' ');
+                } else if (event === 'summary') {
+                    currentData.summary = data;
+                    renderSummary(currentData);
+                } else if (event === 'dates') {
+                    currentData.dates = data;
+                    renderDates(currentData);
+                } else if (event === 'suggested_articles') {
+                    currentData.suggested_articles = data;
+                    renderLawArticles(currentData);
+                } else if (event === 'importance') {
+                    currentData.importance = data;
+                    renderImportance(currentData);
+                } else if (event === 'done') {
+                    currentData.report_url = data.report_url;
+                    renderDownloadButton(currentData);
+                }
+            });
 
-            if (!data.success) {
-                throw new Error(data.error || 'Failed to process document');
+            if (failed) {
+                throw new Error(failed);
             }
-
-            // Store the data and display results
-            currentData = data.data;
-            displayResults(currentData);
             showSuccess('Document processed successfully!');
         } catch (error) {
             console.error('Error:', error);
@@ -133,17 +158,58 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function displayResults(data) {
-        if (!data) {
-            console.error('No data received from server');
-            return;
+    async function streamDocument(formData, onEvent) {
+        const response = await fetch('/summarize/stream', {
+            method: 'POST',
+            body: formData
+        });
+
+        if (!response.ok) {
+            const data = await response.json();
+            throw new Error(data.error || 'Failed to process document');
+        }
+
+        // Parse the server-sent event stream as it arrives
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const event = parseEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                if (event) {
+                    onEvent(event.type, event.data);
+                }
+            }
         }
+    }
+
+    function parseEvent(raw) {
+        let type = 'message';
+        const dataLines = [];
+        raw.split('\n').forEach(line => {
+            if (line.startsWith('event: ')) {
+                type = line.slice(7);
+            } else if (line.startsWith('data: ')) {
+                dataLines.push(line.slice(6));
+            }
+        });
+        if (dataLines.length === 0) return null;
+        return { type, data: JSON.parse(dataLines.join('\n')) };
+    }
 
-        // Update summary
+    function renderSummary(data) {
         const summaryContent = document.getElementById('summaryContent');
         summaryContent.textContent = data.summary || 'No summary available';
+    }
 
-        // Update dates
+    function renderDates(data) {
         const datesList = document.getElementById('datesList');
         datesList.innerHTML = '';
         if (data.dates && data.dates.length > 0) {
@@ -165,8 +231,9 @@ document.addEventListener('DOMContentLoaded', () => {
             li.innerHTML = '<i class="fas fa-info-circle"></i> No important dates found';
             datesList.appendChild(li);
         }
+    }
 
-        // Update importance
+    function renderImportance(data) {
         const importanceContent = document.getElementById('importanceContent');
         importanceContent.innerHTML = '';
         if (data.importance) {
@@ -183,8 +250,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
             });
         }
+    }
 
-        // Update law articles
+    function renderLawArticles(data) {
         const lawArticlesList = document.getElementById('lawArticlesList');
         lawArticlesList.innerHTML = '';
         if (data.suggested_articles && data.suggested_articles.length > 0) {
@@ -206,8 +274,9 @@ document.addEventListener('DOMContentLoaded', () => {
             articleDiv.innerHTML = '<i class="fas fa-info-circle"></i> No relevant law articles found';
             lawArticlesList.appendChild(articleDiv);
         }
+    }
 
-        // Update download button
+    function renderDownloadButton(data) {
         const downloadBtn = document.getElementById('downloadBtn');
         if (data.report_url) {
             downloadBtn.style.display = 'inline-flex';
@@ -216,6 +285,10 @@ document.addEventListener('DOMContentLoaded', () => {
             downloadBtn.style.display = 'none';
             downloadBtn.style.visibility = 'hidden';
         }
+    }
+
+    function showResultsSection() {
+        if (resultsSection.style.display === 'block') return;
 
         // Show results section with animation
         resultsSection.style.display = 'block';
@@ -0,0 +1,208 @@
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .chunking import split_sentences
+from .inference_service import WorkerDiedError
+
+logger = logging.getLogger(__name__)
+
+
+def fallback_summary(chunk: str, num_sentences: int = 3) -> str:
+    """Use the first few sentences of a chunk as its summary."""
+    return ' '.join(split_sentences(chunk)[:num_sentences])
+
+
+def sentence_fallback(sentences: List[str], groups: List[Tuple[str, List[int]]],
+                      num_sentences: int = 3) -> Callable[[str], str]:
+    """
+    fallback_summary for the chunks of an already segmented document.
+
+    Args:
+        sentences (List[str]): The document's sentences
+        groups: (chunk, sentence indices) pairs, e.g. from
+            TextChunker.chunk_sentence_groups; other chunks are split as
+            fallback_summary splits them
+        num_sentences (int): Sentences per fallback summary
+    """
+    leads = {chunk: ' '.join(sentences[i] for i in indices[:num_sentences]) for chunk, indices in groups}
+    return lambda chunk: leads[chunk] if chunk in leads else fallback_summary(chunk, num_sentences)
+
+
+def _summary_text(output) -> str:
+    """Unwrap a single pipeline result into its summary text."""
+    if isinstance(output, list):
+        output = output[0]
+    return output['summary_text']
+
+
+def summarize_batched(
+    summarizer,
+    chunks: List[str],
+    batch_size: int = 8,
+    fallback: Callable[[str], str] = fallback_summary,
+    cache=None,
+    policy: Optional[Callable[[str], Dict]] = None,
+    **generate_kwargs
+) -> List[str]:
+    """
+    Summarize chunks in length-sorted batches through a summarization pipeline.
+
+    Chunks are grouped by length so that each batch is padded as little as
+    possible. If a batch fails, its chunks are retried one at a time and any
+    chunk that still fails falls back to its leading sentences, so one bad
+    chunk never fails the whole document. A batch whose worker died falls
+    back without retries.
+
+    Args:
+        summarizer: A transformers summarization pipeline (or compatible callable)
+        chunks (List[str]): Text chunks to summarize
+        batch_size (int): Number of chunks per forward pass
+        fallback (Callable): Produces a summary for a chunk that failed
+        cache (ChunkSummaryCache): Optional chunk summary cache. Cached chunks
+            skip the model and only model output is stored back.
+        policy (Callable): Optional per-chunk generation parameters (such as
+            a GenerationPolicy) applied over generate_kwargs. Only chunks with
+            the same parameters share a batch.
+        **generate_kwargs: Generation parameters passed to the pipeline
+
+    Returns:
+        List of summaries in the same order as the input chunks
+    """
+    summaries = [None] * len(chunks)
+    for i, summary in iter_summaries_batched(summarizer, chunks, batch_size, fallback, cache, policy, **generate_kwargs):
+        summaries[i] = summary
+    return summaries
+
+
+def iter_summaries_batched(
+    summarizer,
+    chunks: List[str],
+    batch_size: int = 8,
+    fallback: Callable[[str], str] = fallback_summary,
+    cache=None,
+    policy: Optional[Callable[[str], Dict]] = None,
+    **generate_kwargs
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (index, summary) pairs as soon as each chunk's summary is ready.
+
+    Cached chunks are yielded first, then every batch as it finishes, so
+    results arrive out of input order. Takes the same arguments as
+    summarize_batched.
+    """
+    batch_size = max(1, batch_size)
+
+    # Resolve cache hits and collapse repeated chunks to a single model input
+    pending = {}
+    params = {}
+    for i, chunk in enumerate(chunks):
+        if chunk in pending:
+            pending[chunk].append(i)
+            continue
+        kwargs = {**generate_kwargs, **policy(chunk)} if policy else generate_kwargs
+        cached = cache.get(chunk, kwargs) if cache is not None else None
+        if cached is not None:
+            yield i, cached
+        else:
+            pending[chunk] = [i]
+            params[chunk] = kwargs
+
+    # Group chunks by generation parameters, then batch each group by length
+    groups = {}
+    for chunk in sorted(pending, key=len):
+        groups.setdefault(json.dumps(params[chunk], sort_keys=True, default=str), []).append(chunk)
+    batches = [
+        (group[start:start + batch_size], params[group[0]])
+        for group in groups.values()
+        for start in range(0, len(group), batch_size)
+    ]
+    for chunk, summary, from_model in _run_batches(summarizer, batches, fallback):
+        if from_model and cache is not None:
+            cache.put(chunk, params[chunk], summary)
+        for i in pending[chunk]:
+            yield i, summary
+
+
+def _run_batches(summarizer, batches: List[Tuple[List[str], dict]], fallback: Callable[[str], str]):
+    """Yield (chunk, summary, from_model) for every chunk, batch by batch as each finishes."""
+    if not hasattr(summarizer, 'submit'):
+        for batch, generate_kwargs in batches:
+            yield from _summarize_batch(summarizer, batch, fallback, generate_kwargs)
+        return
+
+    # Backends that accept asynchronous submissions (such as InferenceService)
+    # get one batch per worker at a time, so every batch is timed from its own
+    # submission rather than waiting behind the rest of the document
+    timeout = getattr(summarizer, 'timeout', None)
+    window = max(1, getattr(summarizer, 'num_workers', 1))
+    waiting = deque(batches)
+    running = {}  # future -> (batch, generate_kwargs, deadline)
+    try:
+        while waiting or running:
+            while waiting and len(running) < window:
+                batch, generate_kwargs = waiting.popleft()
+                future = summarizer.submit(batch, batch_size=len(batch), **generate_kwargs)
+                deadline = None if timeout is None else time.monotonic() + timeout
+                running[future] = (batch, generate_kwargs, deadline)
+
+            deadlines = [deadline for *_, deadline in running.values() if deadline is not None]
+            remaining = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, generate_kwargs, _ = running.pop(future)
+                yield from _summarize_batch(summarizer, batch, fallback, generate_kwargs, future.result)
+
+            expired = [future for future, (*_, deadline) in running.items()
+                       if deadline is not None and time.monotonic() >= deadline]
+            if expired:
+                # A stuck backend must not hang the request: the late batches
+                # are abandoned, and so are those not yet sent, as the backend
+                # is not keeping up
+                timed_out = [running.pop(future)[0] for future in expired] + [batch for batch, _ in waiting]
+                waiting.clear()
+                for future in expired:
+                    future.cancel()
+                logger.warning("Summarization timed out, using fallback summaries for %d batches", len(timed_out))
+                for batch in timed_out:
+                    for chunk in batch:
+                        yield chunk, fallback(chunk), False
+    finally:
+        # Nothing reads the summaries of batches still running when the
+        # caller stops early, so the backend can drop them
+        for future in running:
+            future.cancel()
+
+
+def _summarize_batch(
+    summarizer,
+    batch: List[str],
+    fallback: Callable[[str], str],
+    generate_kwargs: dict,
+    run: Optional[Callable[[], list]] = None
+) -> list:
+    """Return (chunk, summary, from_model) for every chunk in one batch."""
+    try:
+        if run is None:
+            outputs = summarizer(batch, batch_size=len(batch), **generate_kwargs)
+        else:
+            outputs = run()
+        return [(chunk, _summary_text(output), True) for chunk, output in zip(batch, outputs)]
+    except WorkerDiedError as e:
+        # Retrying would only hand whatever killed the worker to another one
+        logger.warning("Summarization worker died, using fallback summaries for the batch: %s", e)
+        return [(chunk, fallback(chunk), False) for chunk in batch]
+    except Exception as e:
+        logger.warning("Batched summarization failed, retrying chunks individually: %s", e)
+
+    results = []
+    for chunk in batch:
+        try:
+            results.append((chunk, _summary_text(summarizer(chunk, **generate_kwargs)), True))
+        except Exception as e:
+            logger.warning("Summarization failed for chunk: %s", e)
+            results.append((chunk, fallback(chunk), False))
+    return results
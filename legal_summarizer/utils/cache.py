@@ -0,0 +1,333 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def hash_stream(file):
+    """SHA-256 of a binary file object's bytes, read in blocks from the start. Leaves the file at the start."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(1024 * 1024), b''):
+        digest.update(block)
+    file.seek(0)
+    return digest
+
+
+def make_cache_key(content, model_name: str, generation_params: Dict[str, Any], code_version: str) -> str:
+    """
+    Build a content-addressed key for a document's analysis result.
+
+    Args:
+        content: Raw bytes of the uploaded file, or a binary file object
+            that is hashed in blocks without being read into memory
+        model_name (str): Name of the summarization model
+        generation_params (Dict): Generation parameters used for summarization
+        code_version (str): Version of the processing pipeline
+
+    Returns:
+        Hex SHA-256 digest identifying the result
+    """
+    digest = hashlib.sha256(content) if isinstance(content, bytes) else hash_stream(content)
+    config = json.dumps({
+        'model': model_name,
+        'generation': generation_params,
+        'version': code_version
+    }, sort_keys=True)
+    digest.update(config.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 256):
+        """
+        Thread-safe in-memory LRU cache with hit/miss counters.
+
+        Args:
+            max_entries (int): Maximum number of entries kept before the least
+                recently used one is evicted
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+class SummaryCache:
+    def __init__(self, max_entries: int = 256, session_factory: Optional[Callable] = None):
+        """
+        Two-tier cache of document analysis results.
+
+        Results are looked up in an in-memory LRU first and then in the
+        Document table, which keeps them across restarts.
+
+        Args:
+            max_entries (int): Size of the in-memory tier
+            session_factory (Callable): SQLAlchemy session factory for the
+                persistent tier. When None, only the memory tier is used.
+        """
+        self.memory = LRUCache(max_entries)
+        self.session_factory = session_factory
+        self.persistent_hits = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result for the key, or None."""
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+
+        result = self._load(key)
+        if result is not None:
+            self.persistent_hits += 1
+            self.memory.put(key, result)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any], filename: str, text: str, processing_time: float) -> Optional[int]:
+        """Store a result in both tiers, returning the id of its Document row (None if not stored)."""
+        self.memory.put(key, result)
+        return self._store(key, result, filename, text, processing_time)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats['persistent_hits'] = self.persistent_hits
+        stats['misses'] -= self.persistent_hits
+        total = stats['hits'] + self.persistent_hits + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + self.persistent_hits) / total if total else 0.0
+        return stats
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.session_factory is None:
+            return None
+        from database.models import Document
+
+        session = self.session_factory()
+        try:
+            document = session.query(Document).filter_by(cache_key=key).first()
+            if document is None:
+                return None
+            return {
+                'summary': document.summary,
+                'dates': json.loads(document.dates or '[]'),
+                'importance': {
+                    'high': json.loads(document.importance_high or '[]'),
+                    'medium': json.loads(document.importance_medium or '[]'),
+                    'low': json.loads(document.importance_low or '[]')
+                },
+                'suggested_articles': json.loads(document.suggested_articles or '[]')
+            }
+        except Exception as e:
+            print(f"Warning: Could not read summary cache: {str(e)}")
+            return None
+        finally:
+            session.close()
+
+    def _store(self, key: str, result: Dict[str, Any], filename: str, text: str, processing_time: float) -> Optional[int]:
+        if self.session_factory is None:
+            return None
+        from database.models import Document
+
+        session = self.session_factory()
+        try:
+            importance = result.get('importance', {})
+            document = Document(
+                filename=filename,
+                cache_key=key,
+                original_text=text,
+                summary=result.get('summary'),
+                dates=json.dumps(result.get('dates', [])),
+                importance_high=json.dumps(importance.get('high', [])),
+                importance_medium=json.dumps(importance.get('medium', [])),
+                importance_low=json.dumps(importance.get('low', [])),
+                suggested_articles=json.dumps(result.get('suggested_articles', [])),
+                processing_time=processing_time
+            )
+            session.add(document)
+            session.commit()
+            return document.id
+        except Exception as e:
+            print(f"Warning: Could not write summary cache: {str(e)}")
+            session.rollback()
+            return None
+        finally:
+            session.close()
+
+
+class ChunkSummaryCache:
+    def __init__(self, model_name: str, max_entries: int = 4096):
+        """
+        Memoize chunk summaries so repeated boilerplate skips the model.
+
+        Keys are built from the whitespace-normalized chunk text, the model
+        name and the generation parameters, so identical clauses from
+        different documents share one entry.
+
+        Args:
+            model_name (str): Name of the model producing the summaries
+            max_entries (int): Maximum number of chunk summaries kept
+        """
+        self.model_name = model_name
+        self.memory = LRUCache(max_entries)
+
+    def key(self, chunk: str, generation_params: Dict[str, Any]) -> str:
+        normalized = re.sub(r'\s+', ' ', chunk).strip()
+        config = json.dumps(generation_params, sort_keys=True, default=str)
+        digest = hashlib.sha256(self.model_name.encode('utf-8'))
+        digest.update(config.encode('utf-8'))
+        digest.update(normalized.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, chunk: str, generation_params: Dict[str, Any]) -> Optional[str]:
+        return self.memory.get(self.key(chunk, generation_params))
+
+    def put(self, chunk: str, generation_params: Dict[str, Any], summary: str):
+        self.memory.put(self.key(chunk, generation_params), summary)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.memory.stats()
+
+
+# Shared by app.py and DocumentProcessor unless configured otherwise
+DEFAULT_TEXT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'extracted')
+
+
+class ExtractedTextCache:
+    def __init__(self, directory: str = DEFAULT_TEXT_CACHE_DIR, max_bytes: int = 512 * 1024 * 1024):
+        """
+        On-disk store of extracted document text, safe to share between processes.
+
+        Whole documents are stored under the hash of the file's bytes, and
+        PDF pages under the hash of their content, so a re-uploaded file
+        skips extraction entirely and an amended filing only re-parses the
+        pages that changed. Once the store exceeds max_bytes, the least
+        recently used entries are deleted.
+
+        Args:
+            directory (str): Where entries are stored
+            max_bytes (int): Size the store is trimmed back to
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    @staticmethod
+    def file_key(source) -> str:
+        """Hash of a file's bytes, given its path or a binary file object."""
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                return hash_stream(file).hexdigest()
+        return hash_stream(source).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                value = file.read()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        path = self._path(key)
+        data = value.encode('utf-8')
+        # Write to a unique temp file and rename, so readers never see a partial entry
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(temp_path, path)
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_pages(self, key: str) -> Optional[list]:
+        """A whole document's pages as [page_number, text] pairs."""
+        value = self.get(f"doc-{key}")
+        return json.loads(value) if value is not None else None
+
+    def put_pages(self, key: str, pages: list):
+        self.put(f"doc-{key}", json.dumps([[number, text] for number, text in pages]))
+
+    def get_page(self, page_key: str) -> Optional[str]:
+        return self.get(f"page-{page_key}")
+
+    def put_page(self, page_key: str, text: str):
+        self.put(f"page-{page_key}", text)
+
+    def _evict(self):
+        """Delete least recently used entries until the store is back under max_bytes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        # Recount, since other processes share the directory
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
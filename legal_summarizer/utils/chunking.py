@@ -0,0 +1,136 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .segmentation import Document
+
+# Fallback model budget when no tokenizer is available (BART's context size)
+DEFAULT_MAX_TOKENS = 1024
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences with the abbreviation-aware splitter (see segmentation.segment)."""
+    return Document(text).sentences()
+
+
+class TextChunker:
+    def __init__(self, tokenizer=None, max_tokens: Optional[int] = None, overlap_tokens: int = 0):
+        """
+        Pack whole sentences into chunks that fit the model's token budget.
+
+        Args:
+            tokenizer: Hugging Face tokenizer used for real token counts. When
+                None, whitespace words are counted instead.
+            max_tokens (int): Token budget per chunk, excluding special tokens.
+                Defaults to the tokenizer's model_max_length.
+            overlap_tokens (int): Approximate number of tokens from the end of
+                each chunk that are repeated at the start of the next one
+        """
+        self.tokenizer = tokenizer
+        if max_tokens is None:
+            max_tokens = DEFAULT_MAX_TOKENS
+            if tokenizer is not None:
+                max_tokens = min(getattr(tokenizer, 'model_max_length', max_tokens), max_tokens)
+                max_tokens -= tokenizer.num_special_tokens_to_add()
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def _encode(self, sentences: List[str]) -> List[list]:
+        """Encode sentences to token ids (or words without a tokenizer)."""
+        if not sentences:
+            return []
+        if self.tokenizer is None:
+            return [sentence.split() for sentence in sentences]
+        return self.tokenizer(sentences, add_special_tokens=False)['input_ids']
+
+    def _decode(self, ids: list) -> str:
+        if self.tokenizer is None:
+            return " ".join(ids)
+        return self.tokenizer.decode(ids, skip_special_tokens=True).strip()
+
+    def _pieces(self, text: str) -> List[tuple]:
+        """Return (sentence, token_count, sentence_index) triples, splitting over-long sentences."""
+        return self._sentence_pieces(split_sentences(text))
+
+    def _sentence_pieces(self, sentences: List[str]) -> List[tuple]:
+        pieces = []
+        for index, (sentence, ids) in enumerate(zip(sentences, self._encode(sentences))):
+            if len(ids) <= self.max_tokens:
+                pieces.append((sentence, len(ids), index))
+                continue
+            for start in range(0, len(ids), self.max_tokens):
+                window = ids[start:start + self.max_tokens]
+                pieces.append((self._decode(window), len(window), index))
+        return pieces
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens the model will see for a piece of text."""
+        return sum(len(ids) for ids in self._encode([text]))
+
+    def token_counts(self, sentences: List[str]) -> List[int]:
+        """Count the tokens of several sentences in one tokenizer call."""
+        return [len(ids) for ids in self._encode(sentences)]
+
+    def chunk(self, text: str) -> List[str]:
+        """
+        Split text into sentence-aligned chunks within the token budget.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            List of text chunks
+        """
+        return self.chunk_sentences(split_sentences(text))
+
+    def chunk_sentences(self, sentences: List[str]) -> List[str]:
+        """Chunk already segmented sentences, e.g. a Document's, without splitting the text again."""
+        return [chunk for chunk, _ in self.chunk_sentence_groups(sentences)]
+
+    def chunk_sentence_groups(self, sentences: List[str]) -> List[Tuple[str, List[int]]]:
+        """
+        Chunk sentences as chunk_sentences does, keeping track of where each chunk came from.
+
+        Returns:
+            (chunk, indices) pairs, where indices are the positions in
+            sentences of the sentences the chunk holds, in order
+        """
+        return [
+            (" ".join(piece[0] for piece in chunk), list(dict.fromkeys(piece[2] for piece in chunk)))
+            for chunk in self._pack(self._sentence_pieces(sentences))
+        ]
+
+    def _pack(self, pieces: Iterable[tuple]) -> Iterator[List[tuple]]:
+        """Pack (sentence, token_count, sentence_index) triples into chunks within the budget."""
+        current = []  # Pieces of the chunk being filled
+        current_tokens = 0
+        has_new_content = False
+
+        for piece in pieces:
+            n_tokens = piece[1]
+            if current_tokens + n_tokens > self.max_tokens and has_new_content:
+                yield current
+                current, current_tokens = self._overlap_tail(current)
+                has_new_content = False
+            # Drop carried-over sentences until the new one fits
+            while current and current_tokens + n_tokens > self.max_tokens:
+                current_tokens -= current.pop(0)[1]
+            current.append(piece)
+            current_tokens += n_tokens
+            has_new_content = True
+
+        if has_new_content:
+            yield current
+
+    def _overlap_tail(self, pieces: List[tuple]) -> tuple:
+        """Return the trailing sentences that fit within the overlap budget."""
+        tail = []
+        tokens = 0
+        for piece in reversed(pieces):
+            if tokens + piece[1] > self.overlap_tokens:
+                break
+            tail.insert(0, piece)
+            tokens += piece[1]
+        return tail, tokens
@@ -0,0 +1,119 @@
+import re
+from datetime import date
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+from .segmentation import Document, as_document
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+_MONTH = (r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?'
+          r'|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)')
+_ORDINAL = r'(?:st|nd|rd|th)?'
+
+# Every supported format in one alternation, so the text is scanned once. The
+# lookahead skips positions that cannot start a date before trying the formats.
+DATE_PATTERN = re.compile(
+    r'(?<![\w/-])(?=[\dadfjmnos])(?:'
+    # 2024-03-15, 2024/03/15
+    r'(?P<iso_year>\d{4})[-/](?P<iso_month>\d{1,2})[-/](?P<iso_day>\d{1,2})'
+    # 15/03/2024, 15-03-24 (day first, as written in India)
+    r'|(?P<num_day>\d{1,2})[-/](?P<num_month>\d{1,2})[-/](?P<num_year>\d{4}|\d{2})'
+    # March 15, 2024
+    rf'|(?P<mdy_month>{_MONTH})\.?\s+(?P<mdy_day>\d{{1,2}}){_ORDINAL},?\s+(?P<mdy_year>\d{{4}})'
+    # 15 March 2024, 15th March, 2024, 15th day of March, 2024
+    rf'|(?P<dmy_day>\d{{1,2}}){_ORDINAL}\s+(?:day\s+of\s+)?(?P<dmy_month>{_MONTH})\.?,?\s+(?P<dmy_year>\d{{4}})'
+    r')(?![\w/-])',
+    re.IGNORECASE
+)
+
+
+class DateMatch(NamedTuple):
+    text: str  # As written in the document
+    iso: str   # YYYY-MM-DD
+    start: int
+    end: int
+
+
+def _to_iso(year: str, month, day: str) -> Optional[str]:
+    """ISO form of a date, or None if it is not a real calendar date."""
+    year_number = int(year)
+    if len(year) == 2:
+        # Same pivot as strptime's %y
+        year_number += 2000 if year_number < 69 else 1900
+    month_number = month if isinstance(month, int) else int(month)
+    try:
+        return date(year_number, month_number, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def _match_iso(match) -> Optional[str]:
+    groups = match.groupdict()
+    if groups['iso_year']:
+        return _to_iso(groups['iso_year'], groups['iso_month'], groups['iso_day'])
+    if groups['num_day']:
+        day, month = groups['num_day'], groups['num_month']
+        if int(month) > 12 >= int(day):
+            # Written month first, e.g. 03/15/2024
+            day, month = month, day
+        return _to_iso(groups['num_year'], month, day)
+    if groups['mdy_month']:
+        return _to_iso(groups['mdy_year'], MONTHS[groups['mdy_month'][:3].lower()], groups['mdy_day'])
+    return _to_iso(groups['dmy_year'], MONTHS[groups['dmy_month'][:3].lower()], groups['dmy_day'])
+
+
+def normalize_date(text: str) -> Optional[str]:
+    """
+    Normalize one date in any supported format to YYYY-MM-DD.
+
+    "January 1, 2023", "01/01/2023", "1st day of January, 2023" and
+    "2023-01-01" all give "2023-01-01". Returns None for anything that is
+    not a single valid date.
+    """
+    match = DATE_PATTERN.fullmatch(text.strip())
+    return _match_iso(match) if match else None
+
+
+def iter_dates(text: str) -> Iterator[DateMatch]:
+    """Yield every valid date in text, in order, in a single pass of DATE_PATTERN."""
+    # Documents repeat the same few dates; each spelling is parsed once
+    parsed = {}
+    for match in DATE_PATTERN.finditer(text):
+        written = match.group()
+        iso = parsed.get(written)
+        if iso is None:
+            iso = parsed[written] = _match_iso(match) or ''
+        if iso:
+            yield DateMatch(written, iso, match.start(), match.end())
+
+
+def extract_dates(text: Union[str, Document]) -> List[dict]:
+    """
+    Find the dates in a document with the sentence each appears in.
+
+    Each date is reported once, at its first occurrence, however it is
+    written. The surrounding sentence is located by binary search over the
+    document's sentence offsets, so the text is only scanned once for dates.
+
+    Args:
+        text: The document, or its Document to reuse its sentence boundaries
+
+    Returns:
+        List of {date, normalized, context, start, end}, in document order;
+        start and end are character offsets of the date in text
+    """
+    document = as_document(text)
+    found = {}
+    for match in iter_dates(document.text):
+        if match.iso in found:
+            continue
+        found[match.iso] = {
+            'date': match.text,
+            'normalized': match.iso,
+            'context': document.sentence(document.sentence_index(match.start)),
+            'start': match.start,
+            'end': match.end
+        }
+    return list(found.values())
@@ -0,0 +1,252 @@
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Union
+
+# A path, or a binary file object such as BytesIO or an upload's spooled stream
+Source = Union[str, BinaryIO]
+
+# PDFs with at least this many pages to extract are extracted in parallel
+PARALLEL_MIN_PAGES = 64
+# Pages extracted per task in the process pool
+PAGES_PER_TASK = 16
+# Workers are started from a clean server process rather than forked from
+# the caller, which may be running threads and torch's OpenMP pool
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class Page(NamedTuple):
+    number: int  # 1-based, as printed in citations
+    text: str
+
+
+def _extract_pages(file_path: str, indices: List[int]) -> List[str]:
+    """Extract the given pages (0-based) of a PDF. Runs in a worker process."""
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [reader.pages[i].extract_text() or "" for i in indices]
+
+
+@contextmanager
+def _open_source(source: Source):
+    """Yield a binary file positioned at the start; only paths are opened (and closed) here."""
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            yield file
+    else:
+        source.seek(0)
+        yield source
+
+
+@contextmanager
+def _local_path(source: Source, suffix: str = ''):
+    """Path to the source's bytes, copying file objects to a unique temp file that is removed afterwards."""
+    if isinstance(source, str):
+        yield source
+        return
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix) as temp:
+        shutil.copyfileobj(source, temp)
+        temp.flush()
+        yield temp.name
+
+
+def _hash_object(digest, obj, hashed: dict):
+    """
+    Feed a PDF object and everything it references into digest.
+
+    Dictionaries, arrays and stream data are hashed recursively, so form
+    XObjects, their own resources and every font entry (encodings, widths,
+    ToUnicode maps, descendant fonts) are covered. Image data is skipped as
+    it holds no text.
+
+    Each indirect object is hashed once into hashed, keyed by its reference,
+    and stands for that digest wherever it is referenced again, so fonts
+    and XObjects shared by many pages of a file are only read once. A
+    reference back to an object still being hashed, i.e. a cycle, stands
+    for a fixed marker. Digests do not depend on object numbers.
+    """
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+    if isinstance(obj, IndirectObject):
+        reference = (obj.idnum, obj.generation)
+        if reference not in hashed:
+            hashed[reference] = None
+            inner = hashlib.sha256()
+            _hash_object(inner, obj.get_object(), hashed)
+            hashed[reference] = b"@" + inner.digest()
+        digest.update(hashed[reference] or b"@cycle;")
+        return
+    if isinstance(obj, DictionaryObject):
+        digest.update(b"<<")
+        for key in sorted(obj):
+            digest.update(key.encode('utf-8'))
+            _hash_object(digest, obj.raw_get(key), hashed)
+        digest.update(b">>")
+        if isinstance(obj, StreamObject) and obj.get('/Subtype') != '/Image':
+            data = obj.get_data()
+            digest.update(b"stream%d;" % len(data))
+            digest.update(data)
+    elif isinstance(obj, ArrayObject):
+        digest.update(b"[")
+        for item in obj:
+            _hash_object(digest, item, hashed)
+        digest.update(b"]")
+    else:
+        digest.update(repr(obj).encode('utf-8') + b";")
+
+
+def _page_key(page, hashed: Optional[dict] = None) -> str:
+    """
+    Hash of everything a page's text is extracted from: its content stream
+    and all its resources. Pass the same hashed dict for every page of a
+    file to hash shared resources once (see _hash_object).
+    """
+    import PyPDF2
+
+    digest = hashlib.sha256(PyPDF2.__version__.encode('utf-8'))
+    contents = page.get_contents()
+    digest.update(b"contents;")
+    if contents is not None:
+        digest.update(contents.get_data())
+    # Resources may be inherited from an ancestor in the page tree
+    node = page
+    while node is not None and '/Resources' not in node:
+        parent = node.get('/Parent')
+        node = parent.get_object() if parent is not None else None
+    digest.update(b"resources;")
+    if node is not None:
+        _hash_object(digest, node.raw_get('/Resources'), {} if hashed is None else hashed)
+    return digest.hexdigest()
+
+
+def iter_pdf_pages(source: Source, workers: Optional[int] = None, cache=None) -> Iterator[Page]:
+    """
+    Yield the pages of a PDF in order as their text is extracted.
+
+    When many pages need extracting, they are split into groups that a
+    process pool extracts in parallel; pages are still yielded in order,
+    each as soon as it and every page before it is ready.
+
+    File objects are read in place; only when pages go to the process
+    pool is an in-memory file copied to a temp file the workers can open.
+
+    Args:
+        source: Path to the PDF, or a binary file object
+        workers (int): Worker processes for large PDFs. Defaults to the
+            number of cores; 1 always extracts in this process.
+        cache (ExtractedTextCache): Optional store of page texts keyed by
+            page content. Cached pages are not parsed again.
+
+    Yields:
+        Page tuples of (page number, text)
+    """
+    import PyPDF2
+
+    workers = workers or os.cpu_count() or 1
+    with _open_source(source) as file:
+        reader = PyPDF2.PdfReader(file)
+        page_count = len(reader.pages)
+        hashed = {}
+        keys = [_page_key(page, hashed) for page in reader.pages] if cache is not None else None
+        cached = [cache.get_page(key) for key in keys] if cache is not None else [None] * page_count
+        missing = [i for i, text in enumerate(cached) if text is None]
+
+        if workers == 1 or len(missing) < PARALLEL_MIN_PAGES:
+            for i in range(page_count):
+                text = cached[i]
+                if text is None:
+                    text = reader.pages[i].extract_text() or ""
+                    if cache is not None:
+                        cache.put_page(keys[i], text)
+                yield Page(i + 1, text)
+            return
+
+    groups = [missing[start:start + PAGES_PER_TASK] for start in range(0, len(missing), PAGES_PER_TASK)]
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    with _local_path(source, '.pdf') as file_path, \
+            ProcessPoolExecutor(max_workers=min(workers, len(groups)), mp_context=context) as executor:
+        # Groups come back in page order, each as soon as it's done
+        results = executor.map(_extract_pages, [file_path] * len(groups), groups)
+        extracted = (text for texts in results for text in texts)
+        for i in range(page_count):
+            text = cached[i]
+            if text is None:
+                text = next(extracted)
+                if cache is not None:
+                    cache.put_page(keys[i], text)
+            yield Page(i + 1, text)
+
+
+def iter_docx_pages(source: Source) -> Iterator[Page]:
+    """DOCX files have no stored page breaks, so the whole document is page 1."""
+    import docx
+
+    if not isinstance(source, str):
+        source.seek(0)
+    document = docx.Document(source)
+    yield Page(1, "\n".join(paragraph.text for paragraph in document.paragraphs))
+
+
+def iter_pages(source: Source, workers: Optional[int] = None, cache=None,
+               filename: Optional[str] = None) -> Iterator[Page]:
+    """
+    Yield the pages of a PDF, DOCX or TXT file, dispatching on its extension.
+
+    Args:
+        source: Path to the document, or a binary file object (such as an
+            upload's stream) read without being saved to disk
+        workers (int): Worker processes for large PDFs (see iter_pdf_pages)
+        cache (ExtractedTextCache): Optional store of extracted text. A file
+            seen before is served from it without being parsed.
+        filename (str): Name used for the extension when source is a file object
+    """
+    name = filename or (source if isinstance(source, str) else getattr(source, 'name', ''))
+    extension = os.path.splitext(str(name))[1].lower()
+    if extension == '.txt':
+        with _open_source(source) as file:
+            return iter([Page(1, file.read().decode('utf-8'))])
+    if extension not in ('.pdf', '.docx'):
+        raise ValueError(f"Unsupported file format: {extension}")
+
+    if cache is not None:
+        key = cache.file_key(source)
+        cached = cache.get_pages(key)
+        if cached is not None:
+            return iter([Page(number, text) for number, text in cached])
+    if extension == '.pdf':
+        pages = iter_pdf_pages(source, workers, cache)
+    else:
+        pages = iter_docx_pages(source)
+    return _store_pages(pages, cache, key) if cache is not None else pages
+
+
+def _store_pages(pages: Iterator[Page], cache, key: str) -> Iterator[Page]:
+    """Pass pages through, storing the whole document once the last one is out."""
+    collected = []
+    for page in pages:
+        collected.append(page)
+        yield page
+    cache.put_pages(key, collected)
+
+
+def join_pages(pages) -> str:
+    """Join page texts with newlines in one pass."""
+    return "\n".join(page.text for page in pages)
+
+
+def page_spans(pages: List[Page]) -> List[dict]:
+    """Character span of every page in join_pages(pages), for citing page numbers."""
+    spans = []
+    start = 0
+    for page in pages:
+        end = start + len(page.text)
+        spans.append({'page': page.number, 'start': start, 'end': end})
+        start = end + 1
+    return spans
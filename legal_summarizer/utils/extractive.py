@@ -0,0 +1,116 @@
+from typing import Callable, List, Optional, Union
+
+from .segmentation import Document, as_document
+
+METHODS = ('tfidf', 'textrank')
+
+
+def _tfidf_matrix(sentences: List[str]):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    try:
+        return TfidfVectorizer(stop_words='english').fit_transform(sentences)
+    except ValueError:
+        # Every sentence is empty after stop-word removal
+        return None
+
+
+def score_sentences(sentences: List[str], method: str = 'tfidf'):
+    """
+    Score sentences by how much of the document's content they carry.
+
+    Args:
+        sentences (List[str]): Sentences of one document
+        method (str): 'tfidf' sums each sentence's TF-IDF weights; 'textrank'
+            runs PageRank over the sentences' TF-IDF cosine similarities
+
+    Returns:
+        numpy array with one score per sentence
+    """
+    import numpy as np
+
+    if method not in METHODS:
+        raise ValueError(f"Unsupported method: {method}. Choose from {', '.join(METHODS)}")
+    matrix = _tfidf_matrix(sentences) if sentences else None
+    if matrix is None:
+        return np.zeros(len(sentences))
+    if method == 'tfidf':
+        return np.asarray(matrix.sum(axis=1)).ravel()
+    return _textrank(matrix)
+
+
+def _textrank(matrix, damping: float = 0.85, iterations: int = 30):
+    """
+    PageRank over the sentence similarity graph S = X X^T without its diagonal.
+
+    S is never materialized: every product with it is computed as
+    X (X^T v) minus the diagonal, so memory and time stay linear in the
+    number of non-zero TF-IDF weights even for tens of thousands of sentences.
+    """
+    import numpy as np
+
+    n = matrix.shape[0]
+    self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+    def similarity_dot(vector):
+        return matrix @ (matrix.T @ vector) - self_similarity * vector
+
+    degree = similarity_dot(np.ones(n))
+    inverse_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 0)
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        ranks = (1 - damping) / n + damping * similarity_dot(ranks * inverse_degree)
+    return ranks
+
+
+class ExtractiveFilter:
+    def __init__(
+        self,
+        max_tokens: int = 4096,
+        method: str = 'tfidf',
+        token_counts: Optional[Callable[[List[str]], List[int]]] = None
+    ):
+        """
+        Keep a document's highest-ranked sentences within a token budget.
+
+        Used in front of the abstractive model, it shrinks a long document to
+        a few model contexts of its most informative sentences. On its own it
+        is a fully extractive summarizer.
+
+        Args:
+            max_tokens (int): Token budget for the kept sentences
+            method (str): Sentence ranking, 'tfidf' or 'textrank'
+            token_counts (Callable): Counts the tokens of a list of sentences,
+                e.g. TextChunker.token_counts. Defaults to word counts.
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if method not in METHODS:
+            raise ValueError(f"Unsupported method: {method}. Choose from {', '.join(METHODS)}")
+        self.max_tokens = max_tokens
+        self.method = method
+        self.token_counts = token_counts or (lambda sentences: [len(s.split()) for s in sentences])
+
+    def select(self, sentences: List[str]) -> List[int]:
+        """Indices of the sentences to keep, in document order."""
+        counts = self.token_counts(sentences)
+        if sum(counts) <= self.max_tokens:
+            return list(range(len(sentences)))
+
+        scores = score_sentences(sentences, self.method)
+        kept = []
+        seen = set()
+        budget = self.max_tokens
+        for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+            # Repeated boilerplate is kept once
+            key = ' '.join(sentences[index].lower().split())
+            if counts[index] <= budget and key not in seen:
+                kept.append(index)
+                seen.add(key)
+                budget -= counts[index]
+        return sorted(kept)
+
+    def condense(self, text: Union[str, Document]) -> str:
+        """Return the document's top-ranked sentences, in their original order."""
+        sentences = as_document(text).sentences()
+        return ' '.join(sentences[i] for i in self.select(sentences))
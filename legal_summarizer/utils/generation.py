@@ -0,0 +1,135 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .importance import keyword_counts
+
+
+def sentence_importance(high, medium) -> float:
+    """
+    Score sentences from 0 to 1 by how many of them carry obligations.
+
+    Sentences with a high-importance keyword count fully and sentences with
+    only a medium-importance keyword count half.
+
+    Args:
+        high, medium: Keyword counts of the sentences, as keyword_counts or
+            importance_scores give them for a whole document
+    """
+    if not len(high):
+        return 0.0
+    high = high > 0
+    medium = ~high & (medium > 0)
+    return float(high.sum() + 0.5 * medium.sum()) / len(high)
+
+
+def chunk_importance(chunk: str) -> float:
+    """sentence_importance of a chunk's own sentences, for text not already scored (such as summaries)."""
+    return sentence_importance(*keyword_counts(chunk))
+
+
+def chunk_policy(policy: 'GenerationPolicy', groups: List[Tuple[str, List[int]]], high, medium) -> Callable[[str], Dict]:
+    """
+    Generation parameters for the chunks of an already scored document.
+
+    Each chunk's importance comes from the keyword counts of its sentences,
+    so chunks are not segmented and scored again.
+
+    Args:
+        policy (GenerationPolicy): The policy to apply
+        groups: (chunk, sentence indices) pairs, e.g. from
+            TextChunker.chunk_sentence_groups
+        high, medium: Keyword counts of every sentence of the document
+    """
+    importance = {chunk: sentence_importance(high[indices], medium[indices]) for chunk, indices in groups}
+    return lambda chunk: policy(chunk, importance=importance.get(chunk))
+
+
+class GenerationPolicy:
+    def __init__(
+        self,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        max_length: int = 130,
+        min_length: int = 30,
+        compression: float = 0.3,
+        min_output: int = 16,
+        length_step: int = 16,
+        low_importance: float = 0.2,
+        high_importance: float = 0.5,
+        max_beams: int = 4
+    ):
+        """
+        Choose generation parameters for each chunk from its length and importance.
+
+        Output length scales with the input: a chunk gets about compression x
+        its token count (up to twice that for important chunks), capped at
+        max_length. Low-value chunks are decoded greedily, high-value chunks
+        with max_beams beams and everything in between with two beams.
+        Lengths are rounded up to multiples of length_step so that similar
+        chunks get identical parameters and can share a batch.
+
+        Args:
+            count_tokens (Callable): Counts a chunk's input tokens, e.g.
+                TextChunker.count_tokens. Defaults to a word count.
+            max_length (int): Longest summary allowed for any chunk
+            min_length (int): Shortest summary for chunks that allow it
+            compression (float): Summary tokens per input token
+            min_output (int): Smallest max_length given to any chunk
+            length_step (int): Granularity of max_length
+            low_importance (float): Chunks scoring below this are decoded greedily
+            high_importance (float): Chunks scoring at or above this get max_beams
+            max_beams (int): Beams for high-value chunks
+        """
+        self.count_tokens = count_tokens or (lambda text: len(text.split()))
+        self.max_length = max_length
+        self.min_length = min_length
+        self.compression = compression
+        self.min_output = min_output
+        self.length_step = length_step
+        self.low_importance = low_importance
+        self.high_importance = high_importance
+        self.max_beams = max_beams
+
+    def __call__(self, chunk: str, importance: Optional[float] = None) -> Dict:
+        """
+        Generation parameters for one chunk.
+
+        Args:
+            chunk (str): The chunk's text
+            importance (float): The chunk's score from sentence_importance,
+                when its sentences are already scored. Defaults to scoring
+                the chunk itself with chunk_importance.
+        """
+        if importance is None:
+            importance = chunk_importance(chunk)
+        budget = self.count_tokens(chunk) * self.compression * (1 + importance)
+        max_length = math.ceil(budget / self.length_step) * self.length_step
+        max_length = max(self.min_output, min(self.max_length, max_length))
+
+        if importance >= self.high_importance:
+            num_beams = self.max_beams
+        elif importance < self.low_importance:
+            num_beams = 1
+        else:
+            num_beams = min(2, self.max_beams)
+
+        params = {
+            'max_length': max_length,
+            'min_length': min(self.min_length, max_length // 2),
+            'num_beams': num_beams
+        }
+        if num_beams > 1:
+            params['early_stopping'] = True
+        return params
+
+    def config(self) -> Dict:
+        """Settings that determine the policy's output, for cache keys."""
+        return {
+            'max_length': self.max_length,
+            'min_length': self.min_length,
+            'compression': self.compression,
+            'min_output': self.min_output,
+            'length_step': self.length_step,
+            'low_importance': self.low_importance,
+            'high_importance': self.high_importance,
+            'max_beams': self.max_beams
+        }
@@ -0,0 +1,62 @@
+from typing import Callable, Dict, List, Optional
+
+from .batching import fallback_summary, summarize_batched
+from .chunking import TextChunker
+from .extractive import ExtractiveFilter
+
+
+def reduce_summaries(
+    summarizer,
+    summaries: List[str],
+    chunker: TextChunker,
+    target_length: int = 256,
+    batch_size: int = 8,
+    fallback: Callable[[str], str] = fallback_summary,
+    cache=None,
+    policy: Optional[Callable[[str], Dict]] = None,
+    **generate_kwargs
+) -> str:
+    """
+    Combine chunk summaries into one summary of bounded length.
+
+    The chunk summaries are packed into groups that each fit one model
+    context and every group is summarized again, level by level, until the
+    result fits a single context. That text is then summarized once more to
+    at most target_length tokens. Each level is a batched call, so it runs in
+    parallel on backends such as InferenceService.
+
+    Args:
+        summarizer: Summarization pipeline or compatible backend
+        summaries (List[str]): Chunk summaries in document order (the map step's output)
+        chunker (TextChunker): Chunker sized to the model's context
+        target_length (int): Maximum length of the final summary, in tokens
+        batch_size (int): Groups per forward pass
+        fallback (Callable): Produces a summary for a group that failed
+        cache (ChunkSummaryCache): Optional cache for group summaries
+        policy (Callable): Optional per-group generation parameters
+        **generate_kwargs: Generation parameters passed to the pipeline
+
+    Returns:
+        str: The final summary
+    """
+    text = ' '.join(summaries)
+    total = chunker.count_tokens(text)
+    while total > chunker.max_tokens:
+        groups = chunker.chunk(text)
+        reduced = ' '.join(summarize_batched(summarizer, groups, batch_size, fallback, cache, policy, **generate_kwargs))
+        reduced_total = chunker.count_tokens(reduced)
+        if reduced_total >= total:
+            # Summaries stopped getting shorter (e.g. every group fell back);
+            # keep the top-ranked sentences that fit one context instead
+            text = ExtractiveFilter(chunker.max_tokens, token_counts=chunker.token_counts).condense(reduced)
+            break
+        text, total = reduced, reduced_total
+
+    if chunker.count_tokens(text) <= target_length:
+        return text
+    final_kwargs = dict(
+        generate_kwargs,
+        max_length=target_length,
+        min_length=min(generate_kwargs.get('min_length', 30), target_length // 2)
+    )
+    return summarize_batched(summarizer, [text], 1, fallback, cache, **final_kwargs)[0]
@@ -0,0 +1,152 @@
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from .importance import N_FEATURES, term_columns
+
+# Bumped whenever terms map to different columns; older models are rebuilt from the database
+MODEL_VERSION = 3
+DEFAULT_IDF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'idf_model.npz')
+
+
+class IdfModel:
+    def __init__(self, path: Optional[str] = DEFAULT_IDF_PATH):
+        """
+        Inverse document frequencies learned across the document corpus.
+
+        Terms are the hashed columns used by importance_scores, so the model
+        needs no fitted vocabulary and new documents are added by counting
+        their distinct terms. Scoring a document is then only a transform
+        with fixed weights, and scores of different documents are weighted
+        alike.
+
+        The model remembers the last TrainingData and Document rows it has
+        counted, so update_from_database only reads rows added since.
+
+        Args:
+            path (str): File the model is loaded from and saved to; None
+                keeps it in memory only
+        """
+        import numpy as np
+
+        self.path = path
+        self.document_frequency = np.zeros(N_FEATURES, dtype=np.int64)
+        self.n_documents = 0
+        # Highest row id counted from each table
+        self.last_training_id = 0
+        self.last_document_id = 0
+        self._weights = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_IDF_PATH) -> 'IdfModel':
+        """Load a saved model; a missing file, or one of an older version, gives an empty model."""
+        import numpy as np
+
+        model = cls(path)
+        if path and os.path.exists(path):
+            with np.load(path) as saved:
+                if 'version' not in saved or int(saved['version']) != MODEL_VERSION:
+                    return model
+                model.document_frequency[saved['columns']] = saved['counts']
+                model.n_documents = int(saved['n_documents'])
+                model.last_training_id = int(saved['last_training_id'])
+                model.last_document_id = int(saved['last_document_id'])
+        return model
+
+    def save(self):
+        """Write the model atomically, storing only the columns that occur."""
+        import numpy as np
+
+        if not self.path:
+            return
+        with self._lock:
+            columns = np.flatnonzero(self.document_frequency)
+            arrays = dict(
+                version=MODEL_VERSION,
+                columns=columns,
+                counts=self.document_frequency[columns],
+                n_documents=self.n_documents,
+                last_training_id=self.last_training_id,
+                last_document_id=self.last_document_id
+            )
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def __len__(self) -> int:
+        return self.n_documents
+
+    def add_document(self, text: str, document_id: Optional[int] = None):
+        """
+        Count one document's distinct terms.
+
+        Args:
+            text (str): The document's text
+            document_id (int): Id of the document's Document row, when it
+                has one; update_from_database then skips rows up to it
+        """
+        columns = term_columns(text)
+        with self._lock:
+            self.document_frequency[columns] += 1
+            self.n_documents += 1
+            self._weights = None
+            if document_id is not None:
+                self.last_document_id = max(self.last_document_id, document_id)
+
+    def update_from_database(self, session_factory: Callable, batch_size: int = 64) -> int:
+        """
+        Count TrainingData and Document rows added since the last update.
+
+        Args:
+            session_factory (Callable): SQLAlchemy session factory
+            batch_size (int): Rows read per query
+
+        Returns:
+            int: Number of documents added
+        """
+        from database.models import Document, TrainingData
+
+        added = 0
+        session = session_factory()
+        try:
+            for table, text_column, attribute in (
+                (TrainingData, TrainingData.document_text, 'last_training_id'),
+                (Document, Document.original_text, 'last_document_id'),
+            ):
+                while True:
+                    rows = (session.query(table.id, text_column)
+                            .filter(table.id > getattr(self, attribute))
+                            .order_by(table.id)
+                            .limit(batch_size)
+                            .all())
+                    if not rows:
+                        break
+                    for row_id, text in rows:
+                        self.add_document(text or '')
+                        with self._lock:
+                            setattr(self, attribute, row_id)
+                        added += 1
+        finally:
+            session.close()
+        return added
+
+    def weights(self):
+        """
+        IDF weight of every hashed column, smoothed as in TfidfVectorizer:
+        log((1 + n) / (1 + df)) + 1. Terms never seen get the highest weight.
+        """
+        import numpy as np
+
+        with self._lock:
+            if self._weights is None:
+                self._weights = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+            return self._weights
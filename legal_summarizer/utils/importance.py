@@ -0,0 +1,255 @@
+import re
+from itertools import chain, compress
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .segmentation import Document, as_document
+
+# Sentences with a word starting with one of these are high or medium importance
+HIGH_IMPORTANCE = ('urgent', 'critical', 'immediate', 'deadline', 'must', 'required', 'mandatory')
+MEDIUM_IMPORTANCE = ('important', 'significant', 'consider', 'should', 'recommended')
+
+# Terms are hashed into this many IDF columns, where sklearn's HashingVectorizer puts them
+N_FEATURES = 1 << 18
+# Characters tokenized at a time when collecting a long document's terms
+BLOCK_CHARS = 1 << 20
+
+# Sentences are joined with BREAK and tokenized in one pass; BREAK is a token
+# of its own. \w\w+ finds the same tokens as TfidfVectorizer's default
+# pattern, as greedy matching already ends them at word boundaries.
+BREAK = '\x00'
+_TOKENS = re.compile(rf'\w\w+|{BREAK}')
+# Maps every byte but word characters and BREAK to a space: splitting ASCII
+# text translated with it gives the pattern's tokens (and one-character
+# words) several times faster than the regex
+_ASCII_WORDS = bytes(byte if re.match(rb'\w', bytes([byte])) or chr(byte) == BREAK else ord(' ')
+                     for byte in range(256))
+_SPACE = re.compile(r'\s')
+
+
+class SentenceScores(NamedTuple):
+    high: 'numpy.ndarray'    # High-importance keyword occurrences per sentence
+    medium: 'numpy.ndarray'  # Medium-importance keyword occurrences per sentence
+    tfidf: 'numpy.ndarray'   # Sum of each sentence's L2-normalized TF-IDF weights
+
+
+class TermCounts(NamedTuple):
+    terms: List[str]                   # Distinct terms in order of first occurrence
+    counts: 'scipy.sparse.csr_matrix'  # Occurrences of each term (column) in each sentence (row)
+
+
+def _tokens(text: str) -> Tuple[list, Union[str, bytes]]:
+    """
+    Tokens of lowercased text and its BREAK token: bytes for ASCII text,
+    str otherwise. ASCII text also yields one-character words, which
+    TfidfVectorizer drops; callers drop them with _is_term.
+    """
+    if text.isascii():
+        return text.encode('ascii').translate(_ASCII_WORDS).split(), BREAK.encode('ascii')
+    return _TOKENS.findall(text), BREAK
+
+
+def _is_term(token: Union[str, bytes]) -> bool:
+    return len(token) > 1
+
+
+def _as_str(term: Union[str, bytes]) -> str:
+    return term.decode('ascii') if isinstance(term, bytes) else term
+
+
+_HASHER = None
+
+
+def hashed_columns(terms: Sequence[str]):
+    """IDF column of each term: the column HashingVectorizer(n_features=N_FEATURES) gives it."""
+    import numpy as np
+
+    global _HASHER
+    if not len(terms):
+        return np.zeros(0, dtype=np.int64)
+    if _HASHER is None:
+        from sklearn.feature_extraction import FeatureHasher
+        _HASHER = FeatureHasher(n_features=N_FEATURES, input_type='string', alternate_sign=False)
+    return _HASHER.transform([term] for term in terms).indices.astype(np.int64)
+
+
+def term_columns(text: str):
+    """Distinct hashed IDF columns of the terms in text, tokenized about BLOCK_CHARS characters at a time."""
+    import numpy as np
+
+    terms = set()
+    start = 0
+    while start < len(text):
+        end = start + BLOCK_CHARS
+        if end < len(text):
+            space = _SPACE.search(text, end)
+            end = space.start() if space else len(text)
+        terms.update(_tokens(text[start:end].lower())[0])
+        start = end
+    return np.unique(hashed_columns([_as_str(term) for term in terms if _is_term(term)]))
+
+
+def term_counts(text: Union[str, Document]) -> TermCounts:
+    """
+    Count the terms of every sentence, tokenized as TfidfVectorizer does.
+
+    All sentences are lowercased and tokenized in one pass over the joined
+    text, and each token costs one dict lookup to number its term.
+    Counts are built as a sparse matrix, so nothing loops per sentence.
+    """
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    document = as_document(text)
+    sentences = document.sentences()
+    if BREAK in document.text:
+        sentences = [sentence.replace(BREAK, ' ') for sentence in sentences]
+    tokens, separator = _tokens(f' {BREAK} '.join(sentences).lower())
+    # The separator is token 0; tokens too short to be terms are dropped after numbering
+    numbers = {token: number for number, token in enumerate(dict.fromkeys(chain((separator,), tokens)))}
+    ids = np.fromiter(map(numbers.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    is_term = np.fromiter(map(_is_term, numbers), dtype=bool, count=len(numbers))
+    keep = is_term[ids]
+    rows = np.cumsum(ids == 0)[keep]
+    # Renumber the terms from 0, in order of first occurrence
+    ids = (np.cumsum(is_term) - 1)[ids[keep]]
+    terms = [_as_str(token) for token in compress(numbers, is_term)]
+    counts = csr_matrix((np.ones(len(ids), dtype=np.int64), (rows, ids)), shape=(len(sentences), len(terms)))
+    return TermCounts(terms, counts)
+
+
+def keyword_hits(counts: TermCounts, keywords: Sequence[str]):
+    """
+    Keyword occurrences per sentence, from the term count columns of the keywords.
+
+    Keywords match word prefixes ("consider" matches "considered"), so the
+    keyword columns are every term starting with one of them.
+    """
+    import numpy as np
+
+    keywords = tuple(keyword.lower() for keyword in keywords)
+    is_keyword = np.fromiter((term.startswith(keywords) for term in counts.terms), dtype=np.int64,
+                             count=len(counts.terms))
+    return counts.counts @ is_keyword
+
+
+def keyword_counts(
+    text: Union[str, Document],
+    high_keywords: Sequence[str] = HIGH_IMPORTANCE,
+    medium_keywords: Sequence[str] = MEDIUM_IMPORTANCE
+):
+    """
+    Count high- and medium-importance keywords in every sentence.
+
+    Returns:
+        (high, medium) arrays with one count per sentence
+    """
+    counts = term_counts(text)
+    return keyword_hits(counts, high_keywords), keyword_hits(counts, medium_keywords)
+
+
+def importance_scores(
+    text: Union[str, Document],
+    high_keywords: Sequence[str] = HIGH_IMPORTANCE,
+    medium_keywords: Sequence[str] = MEDIUM_IMPORTANCE,
+    idf=None
+) -> SentenceScores:
+    """
+    Score every sentence of a document by keywords and TF-IDF.
+
+    Keyword counts and TF-IDF weights come from the same term counts (see
+    term_counts). Weights are computed by TfidfTransformer, so sentences
+    score as TfidfVectorizer().fit_transform would score them.
+
+    Args:
+        text: The document, or its Document
+        high_keywords (Sequence[str]): High-importance keywords
+        medium_keywords (Sequence[str]): Medium-importance keywords
+        idf (numpy.ndarray): IDF weight of every hashed column, e.g. from
+            IdfModel.weights(). Defaults to smoothed IDF over the document's
+            own sentences.
+
+    Returns:
+        SentenceScores with one entry per sentence
+    """
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    counts = term_counts(text)
+    high = keyword_hits(counts, high_keywords)
+    medium = keyword_hits(counts, medium_keywords)
+    if not counts.terms:
+        return SentenceScores(high, medium, np.zeros(len(high)))
+
+    transformer = TfidfTransformer()
+    if idf is None:
+        transformer.fit(counts.counts)
+    else:
+        transformer.idf_ = idf[hashed_columns(counts.terms)]
+    tfidf = np.asarray(transformer.transform(counts.counts).sum(axis=1)).ravel()
+    return SentenceScores(high, medium, tfidf)
+
+
+def top_k(scores, indices, k: int) -> List[int]:
+    """The k best of the given sentence indices, best first, without sorting them all."""
+    import numpy as np
+
+    indices = np.asarray(indices)
+    if k <= 0:
+        return []
+    if len(indices) > k:
+        indices = indices[np.argpartition(-scores[indices], k - 1)[:k]]
+    # Ties keep document order
+    return indices[np.lexsort((indices, -scores[indices]))].tolist()
+
+
+def scale_scores(scores):
+    """Min-max scale scores to 0-1; all zeros when every score is the same."""
+    import numpy as np
+
+    if not len(scores):
+        return np.zeros(0)
+    spread = scores.max() - scores.min()
+    if spread <= 0:
+        return np.zeros(len(scores))
+    return (scores - scores.min()) / spread
+
+
+def classify_importance(text: Union[str, Document], top: int = 5, idf=None,
+                        scores: Optional[SentenceScores] = None) -> Dict[str, List[str]]:
+    """
+    Bucket a document's sentences by importance and keep the best of each bucket.
+
+    Sentences with a high-importance keyword are 'high', else those with a
+    medium-importance keyword are 'medium', and the rest are 'low'. Within a
+    bucket, sentences rank by keyword count plus their TF-IDF score scaled
+    to 0-1.
+
+    Args:
+        text: The document, or its Document
+        top (int): Sentences kept per bucket
+        idf (numpy.ndarray): Optional IDF weights (see importance_scores)
+        scores (SentenceScores): The document's scores, when already
+            computed; idf is then not used
+
+    Returns:
+        Dict of 'high', 'medium' and 'low' lists of up to top sentences, best first
+    """
+    import numpy as np
+
+    document = as_document(text)
+    if scores is None:
+        scores = importance_scores(document, idf=idf)
+    scaled = scale_scores(scores.tfidf)
+
+    is_high = scores.high > 0
+    is_medium = ~is_high & (scores.medium > 0)
+    buckets = {
+        'high': (np.flatnonzero(is_high), scores.high + scaled),
+        'medium': (np.flatnonzero(is_medium), scores.medium + scaled),
+        'low': (np.flatnonzero(~is_high & ~is_medium), scaled)
+    }
+    sentences = document.sentences()
+    return {
+        name: [sentences[i] for i in top_k(ranking, indices, top)]
+        for name, (indices, ranking) in buckets.items()
+    }
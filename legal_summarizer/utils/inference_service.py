@@ -0,0 +1,226 @@
+import gc
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set
+
+# Seconds between checks that every worker is still alive
+WORKER_POLL_INTERVAL = 0.5
+
+
+class WorkerDiedError(RuntimeError):
+    """A worker process exited while it held the request."""
+
+
+class InferenceService:
+    def __init__(self, pipeline, num_workers: int = 4, threads_per_worker: int = 1, timeout: Optional[float] = 600):
+        """
+        Pool of inference worker processes sharing one copy of the model.
+
+        The pipeline is loaded in the parent and the workers are forked from
+        it, so the model weights are shared copy-on-write instead of being
+        loaded once per worker. Each request goes to the worker with the
+        fewest requests in flight over its own local queue; no external
+        broker is needed.
+
+        A worker that dies (killed for memory, or crashed) fails the
+        requests it held with a WorkerDiedError, and a new worker is forked in
+        its place, so callers neither wait out the timeout nor lose a worker
+        for good.
+
+        The service is a drop-in replacement for the summarization pipeline:
+        calling it blocks until a worker returns the pipeline's output, and
+        submit() returns a Future so callers can keep several workers busy;
+        cancelling it frees the worker's slot and drops the result.
+
+        Args:
+            pipeline: Loaded transformers pipeline (or compatible callable)
+            num_workers (int): Number of worker processes
+            threads_per_worker (int): torch intra-op threads per worker. Keep
+                num_workers * threads_per_worker at or below the core count.
+            timeout (float): Seconds a blocking call waits for its result
+        """
+        self.pipeline = pipeline
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.timeout = timeout
+        self._workers = []
+        # Per worker: its task queue and the ids of the tasks it holds
+        self._task_queues = []
+        self._inflight: List[Set[int]] = []
+        self._pending: Dict[int, Future] = {}
+        self._owners: Dict[int, int] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._context = None
+        self._results = None
+        self._collector = None
+        self._stopping = False
+
+    @property
+    def model(self):
+        return self.pipeline.model
+
+    @property
+    def tokenizer(self):
+        return self.pipeline.tokenizer
+
+    def start(self):
+        """
+        Fork the worker processes.
+
+        Call this before the parent runs any inference itself: forking after
+        torch has started its OpenMP thread pool can hang the children.
+        """
+        self._context = multiprocessing.get_context('fork')
+        self._results = self._context.Queue()
+        self._stopping = False
+        self._workers = [None] * self.num_workers
+        self._task_queues = [None] * self.num_workers
+        self._inflight = [set() for _ in range(self.num_workers)]
+        for index in range(self.num_workers):
+            self._start_worker(index)
+
+        self._collector = threading.Thread(target=self._collect, name='inference-results', daemon=True)
+        self._collector.start()
+        return self
+
+    def _start_worker(self, index: int):
+        """Fork the worker in slot index, with a fresh task queue."""
+        tasks = self._context.Queue()
+        # Keep the garbage collector from touching (and so copying) the
+        # model's pages in the children
+        gc.collect()
+        gc.freeze()
+        try:
+            worker = self._context.Process(
+                target=_worker_main,
+                args=(self.pipeline, tasks, self._results, self.threads_per_worker),
+                daemon=True
+            )
+            worker.start()
+        finally:
+            gc.unfreeze()
+        self._task_queues[index] = tasks
+        self._workers[index] = worker
+
+    def submit(self, inputs, **kwargs) -> Future:
+        """Queue inputs for the least busy worker and return a Future for the pipeline output."""
+        if not self._workers:
+            raise RuntimeError("InferenceService has not been started")
+        future = Future()
+        task_id = next(self._ids)
+        with self._lock:
+            index = min(range(len(self._workers)), key=lambda i: len(self._inflight[i]))
+            self._pending[task_id] = future
+            self._owners[task_id] = index
+            self._inflight[index].add(task_id)
+            self._task_queues[index].put((task_id, inputs, kwargs))
+        # A cancelled request stops counting against its worker, and its result is dropped
+        future.add_done_callback(lambda done: done.cancelled() and self._finish(task_id))
+        return future
+
+    def __call__(self, inputs, **kwargs) -> Any:
+        return self.submit(inputs, **kwargs).result(timeout=self.timeout)
+
+    def stop(self):
+        """Shut the workers down and fail any requests still waiting."""
+        with self._lock:
+            self._stopping = True
+        for tasks in self._task_queues:
+            tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+        if self._collector is not None:
+            self._results.put(None)
+            self._collector.join()
+            self._collector = None
+        self._task_queues = []
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._owners = {}
+            self._inflight = []
+        for future in pending.values():
+            _settle(future, error=RuntimeError("InferenceService stopped"))
+
+    def _collect(self):
+        """Route results from the workers back to the waiting callers, and replace workers that die."""
+        checked = time.monotonic()
+        while True:
+            try:
+                item = self._results.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                task_id, ok, payload = item
+                future = self._finish(task_id)
+                if ok:
+                    _settle(future, result=payload)
+                else:
+                    _settle(future, error=RuntimeError(payload))
+            if time.monotonic() - checked >= WORKER_POLL_INTERVAL:
+                self._check_workers()
+                checked = time.monotonic()
+
+    def _finish(self, task_id: int) -> Optional[Future]:
+        """Stop tracking a task, returning its Future unless it was already failed."""
+        with self._lock:
+            future = self._pending.pop(task_id, None)
+            index = self._owners.pop(task_id, None)
+            if index is not None:
+                self._inflight[index].discard(task_id)
+        return future
+
+    def _check_workers(self):
+        """Fail the tasks of workers that have died and fork replacements."""
+        for index, worker in enumerate(list(self._workers)):
+            if worker.is_alive():
+                continue
+            with self._lock:
+                if self._stopping:
+                    return
+                lost = self._inflight[index]
+                self._inflight[index] = set()
+                futures = [self._pending.pop(task_id, None) for task_id in lost]
+                for task_id in lost:
+                    self._owners.pop(task_id, None)
+                # Tasks sent from now on go to the replacement
+                self._start_worker(index)
+            for future in futures:
+                _settle(future, error=WorkerDiedError(f"Inference worker exited with code {worker.exitcode}"))
+
+
+def _settle(future: Optional[Future], result=None, error: Optional[Exception] = None):
+    """Complete a request's Future, unless it is gone or its caller cancelled it."""
+    if future is None or not future.set_running_or_notify_cancel():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _worker_main(pipeline, tasks, results, num_threads: int):
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, inputs, kwargs = task
+        try:
+            results.put((task_id, True, pipeline(inputs, **kwargs)))
+        except Exception as e:
+            results.put((task_id, False, f"{type(e).__name__}: {str(e)}"))
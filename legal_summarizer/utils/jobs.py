@@ -0,0 +1,109 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobQueue:
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, max_finished: int = 256):
+        """
+        Bounded in-process job queue backed by a thread pool.
+
+        Args:
+            max_workers (int): Number of jobs processed concurrently
+            max_pending (int): Maximum number of queued plus running jobs.
+                Submissions beyond this are rejected with QueueFullError.
+            max_finished (int): Number of finished jobs kept for status polling
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._jobs = OrderedDict()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, **kwargs) -> str:
+        """
+        Queue a job for background processing.
+
+        The job function is called as func(progress, *args, **kwargs), where
+        progress(fraction, stage=None) reports how far along the job is.
+
+        Returns:
+            The id of the new job
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        with self._lock:
+            if self._active >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} jobs pending)")
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': QUEUED,
+                'progress': 0.0,
+                'stage': None,
+                'result': None,
+                'error': None,
+                'created_at': time.time()
+            }
+            self._active += 1
+            self._evict_finished()
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of a job's state, or None if it is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            statuses = [job['status'] for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (QUEUED, RUNNING, DONE, FAILED)}
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id: str, func: Callable, args: tuple, kwargs: dict):
+        self._update(job_id, status=RUNNING, started_at=time.time())
+
+        def progress(fraction: float, stage: Optional[str] = None):
+            self._update(job_id, progress=round(min(max(fraction, 0.0), 1.0), 3), stage=stage)
+
+        try:
+            result = func(progress, *args, **kwargs)
+        except Exception as e:
+            print(f"Error processing job {job_id}: {str(e)}")
+            self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        else:
+            self._update(job_id, status=DONE, progress=1.0, result=result, finished_at=time.time())
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _evict_finished(self):
+        """Drop the oldest finished jobs beyond max_finished. Caller holds the lock."""
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in (DONE, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
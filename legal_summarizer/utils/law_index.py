@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; matching on whole tokens enforces word boundaries."""
+    return _WORD.findall(text.lower())
+
+
+class KeywordAutomaton:
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Aho-Corasick automaton over word tokens.
+
+        Finds every keyword (single words or phrases) in one pass over a
+        document's tokens, however many keywords there are. Because it works
+        on whole tokens, "life" never matches inside "lifetime".
+
+        Args:
+            keywords (Iterable[str]): Keywords; their position is the id reported by find()
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(keywords):
+            tokens = tokenize(keyword)
+            if tokens:
+                self._add(tokens, keyword_id)
+        self._link()
+
+    def _add(self, tokens: List[str], keyword_id: int):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _link(self):
+        """Breadth-first pass setting failure links and merging outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of every keyword that occurs in text."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class LawArticleIndex:
+    def __init__(self, path: str = 'data/indian_law_articles.json'):
+        """
+        Keyword index over the law article catalogue.
+
+        The catalogue is parsed once and compiled into a KeywordAutomaton.
+        Before each lookup the file's modification time is checked and the
+        index is rebuilt if the JSON has changed, so edits take effect
+        without a restart.
+
+        Args:
+            path (str): Catalogue JSON with an 'articles' list of
+                {article, title, description, keywords}
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._version = None
+        # (articles, article positions per keyword id, automaton), swapped as one on reload
+        self._state = None
+
+    def _refresh(self) -> tuple:
+        stat = os.stat(self.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return self._state
+        with self._lock:
+            if version == self._version:
+                return self._state
+            with open(self.path, 'r') as f:
+                articles = json.load(f)['articles']
+
+            # One automaton entry per distinct keyword, mapped to every article using it
+            keyword_ids: Dict[str, int] = {}
+            keyword_articles: List[List[int]] = []
+            for article_id, article in enumerate(articles):
+                for keyword in set(' '.join(tokenize(k)) for k in article['keywords']):
+                    if keyword not in keyword_ids:
+                        keyword_ids[keyword] = len(keyword_articles)
+                        keyword_articles.append([])
+                    keyword_articles[keyword_ids[keyword]].append(article_id)
+
+            self._state = (articles, keyword_articles, KeywordAutomaton(keyword_ids))
+            self._version = version
+            return self._state
+
+    @property
+    def articles(self) -> List[dict]:
+        return self._refresh()[0]
+
+    def keyword_scores(self, text: str) -> Dict[int, int]:
+        """Number of distinct keywords of each article found in text, by article position."""
+        return self._scores(self._refresh(), text)
+
+    @staticmethod
+    def _scores(state: tuple, text: str) -> Dict[int, int]:
+        _, keyword_articles, automaton = state
+        scores: Dict[int, int] = {}
+        for keyword_id in automaton.find(text):
+            for article_id in keyword_articles[keyword_id]:
+                scores[article_id] = scores.get(article_id, 0) + 1
+        return scores
+
+    def suggest(self, text: str, top_k: int = 3) -> List[dict]:
+        """
+        Articles whose keywords occur in text, best first.
+
+        Each article scores one point per distinct keyword found; ties keep
+        catalogue order.
+        """
+        state = self._refresh()
+        articles = state[0]
+        scores = self._scores(state, text)
+        ranked = sorted(scores, key=lambda article_id: (-scores[article_id], article_id))[:top_k]
+        return [
+            {
+                'article': articles[article_id]['article'],
+                'title': articles[article_id]['title'],
+                'description': articles[article_id]['description'],
+                'score': scores[article_id]
+            }
+            for article_id in ranked
+        ]
@@ -0,0 +1,355 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+from typing import List, Sequence, Union
+
+from .law_index import LawArticleIndex
+from .segmentation import Document, as_document
+
+DEFAULT_LAW_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'law_index')
+# Catalogues larger than this are searched through an inverted-file index instead of exhaustively
+ANN_THRESHOLD = 100_000
+# Largest TF-IDF vocabulary kept for the encoder
+MAX_FEATURES = 50_000
+# Bumped whenever the index layout or the encoder changes
+INDEX_VERSION = '2'
+
+
+def article_text(article: dict) -> str:
+    """The text an article is encoded from: title, description and keywords."""
+    return ' '.join([article['title'], article['description']] + list(article['keywords']))
+
+
+def _vectorizer_params() -> dict:
+    return {'stop_words': 'english', 'ngram_range': (1, 2)}
+
+
+def _normalize(matrix):
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class ArticleVectors:
+    def __init__(self, directory: str):
+        """
+        Precomputed article vectors and the encoder that produced them.
+
+        Vectors are latent semantic analysis (TF-IDF projected by a
+        truncated SVD) of each article's text, unit length. Catalogues with
+        no more articles than the requested dimensions are not projected:
+        an SVD of so few articles spans little more than the articles
+        themselves, and the plain TF-IDF vectors are used instead. Every array
+        is memory-mapped from the index directory, so worker processes share
+        one copy and loading takes no time however large the catalogue is.
+
+        Args:
+            directory (str): Index directory written by ArticleVectors.build
+        """
+        import numpy as np
+
+        self.directory = directory
+        with open(os.path.join(directory, 'vocabulary.json'), 'r') as f:
+            self.vocabulary = {term: i for i, term in enumerate(json.load(f))}
+        self.idf = np.load(os.path.join(directory, 'idf.npy'), mmap_mode='r')
+        projection = os.path.join(directory, 'projection.npy')
+        self.projection = np.load(projection, mmap_mode='r') if os.path.exists(projection) else None
+        self.vectors = np.load(os.path.join(directory, 'vectors.npy'), mmap_mode='r')
+        centroids = os.path.join(directory, 'centroids.npy')
+        if os.path.exists(centroids):
+            self.centroids = np.load(centroids, mmap_mode='r')
+            self.members = np.load(os.path.join(directory, 'members.npy'), mmap_mode='r')
+            self.offsets = np.load(os.path.join(directory, 'offsets.npy'), mmap_mode='r')
+        else:
+            self.centroids = None
+        self._counter = None
+        self._analyzer = None
+
+    @classmethod
+    def build(cls, articles: List[dict], directory: str, dimensions: int = 256,
+              ann_threshold: int = ANN_THRESHOLD) -> 'ArticleVectors':
+        """Encode the articles and write the index to directory, which must not exist yet."""
+        import numpy as np
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(sublinear_tf=True, max_features=MAX_FEATURES, **_vectorizer_params())
+        tfidf = vectorizer.fit_transform([article_text(article) for article in articles])
+        rank = min(dimensions, tfidf.shape[0] - 1, tfidf.shape[1] - 1)
+        if len(articles) > dimensions and rank >= 2:
+            svd = TruncatedSVD(n_components=rank, random_state=0).fit(tfidf)
+            projection = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+            vectors = _normalize(np.asarray(tfidf @ projection, dtype=np.float32))
+        else:
+            # Too few articles for a useful projection; use the TF-IDF space itself
+            projection = None
+            vectors = tfidf.toarray().astype(np.float32)
+
+        # Write everything next to the target, then move it into place in one step
+        os.makedirs(os.path.dirname(directory) or '.', exist_ok=True)
+        staging = tempfile.mkdtemp(dir=os.path.dirname(directory) or '.', prefix='.building-')
+        try:
+            terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+            with open(os.path.join(staging, 'vocabulary.json'), 'w') as f:
+                json.dump(terms, f)
+            np.save(os.path.join(staging, 'idf.npy'), vectorizer.idf_.astype(np.float32))
+            if projection is not None:
+                np.save(os.path.join(staging, 'projection.npy'), projection)
+            np.save(os.path.join(staging, 'vectors.npy'), vectors)
+            if len(articles) > ann_threshold:
+                cls._build_lists(vectors, staging)
+            os.rename(staging, directory)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(directory):
+                raise
+            # Another process built the same index first
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return cls(directory)
+
+    @staticmethod
+    def _build_lists(vectors, directory: str):
+        """Inverted-file index: k-means clusters of the vectors, members stored contiguously per cluster."""
+        import numpy as np
+        from sklearn.cluster import MiniBatchKMeans
+
+        lists = max(1, int(math.sqrt(len(vectors))))
+        kmeans = MiniBatchKMeans(n_clusters=lists, n_init=3, batch_size=4096, random_state=0).fit(vectors)
+        members = np.argsort(kmeans.labels_, kind='stable')
+        offsets = np.searchsorted(kmeans.labels_[members], np.arange(lists + 1))
+        np.save(os.path.join(directory, 'centroids.npy'), _normalize(kmeans.cluster_centers_.astype(np.float32)))
+        np.save(os.path.join(directory, 'members.npy'), members.astype(np.int64))
+        np.save(os.path.join(directory, 'offsets.npy'), offsets.astype(np.int64))
+
+    def encode(self, texts: Sequence[str]):
+        """
+        Vectors for texts in the articles' vector space.
+
+        Texts are weighted as the articles were and divided by their full
+        TF-IDF norm, which includes terms no article uses (weighted as
+        terms of no article), and they are not normalized again after
+        projection. So the part of a text the catalogue does not cover
+        still counts: a text sharing one word with an article among many
+        words of its own is not scored as if it were only that word.
+        """
+        import numpy as np
+        from collections import Counter
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        if self._counter is None:
+            self._counter = CountVectorizer(vocabulary=self.vocabulary, **_vectorizer_params())
+            self._analyzer = self._counter.build_analyzer()
+        counts = self._counter.transform(texts).astype(np.float32)
+        # Same weighting as the TfidfVectorizer the index was built with
+        counts.data = 1 + np.log(counts.data)
+        tfidf = counts.multiply(np.asarray(self.idf)).tocsr()
+
+        # Smoothed IDF of a term that occurs in no article
+        unseen_idf = math.log(1 + len(self.vectors)) + 1
+        squares = np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel()
+        for row, text in enumerate(texts):
+            for term, count in Counter(self._analyzer(text)).items():
+                if term not in self.vocabulary:
+                    squares[row] += ((1 + math.log(count)) * unseen_idf) ** 2
+        norms = np.sqrt(squares)
+        scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0).astype(np.float32)
+        tfidf = tfidf.multiply(scale[:, None]).tocsr()
+        if self.projection is None:
+            return tfidf.toarray().astype(np.float32)
+        return np.asarray(tfidf @ self.projection, dtype=np.float32)
+
+    def candidates(self, queries, nprobe: int):
+        """Articles in the nprobe clusters nearest to any query, or None when there is no inverted-file index."""
+        import numpy as np
+
+        if self.centroids is None:
+            return None
+        nprobe = min(nprobe, len(self.centroids))
+        nearest = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        lists = np.unique(nearest)
+        return np.concatenate([self.members[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+
+    def search(self, queries, top_k: int, candidates=None) -> List[tuple]:
+        """
+        Best articles for a set of query vectors, as (article position, score) pairs.
+
+        All queries are scored against the (candidate) article vectors in
+        one matrix product; an article's score is its best cosine similarity
+        to any query.
+        """
+        import numpy as np
+
+        if candidates is None:
+            scores = (queries @ self.vectors.T).max(axis=0)
+            ids = np.arange(len(scores))
+        else:
+            ids = np.asarray(candidates, dtype=np.int64)
+            if not len(ids):
+                return []
+            scores = (queries @ self.vectors[ids].T).max(axis=0)
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+class ArticleRetriever:
+    def __init__(
+        self,
+        keyword_index: LawArticleIndex,
+        index_dir: str = DEFAULT_LAW_INDEX_DIR,
+        dimensions: int = 256,
+        ann_threshold: int = ANN_THRESHOLD,
+        nprobe: int = 16,
+        segment_words: int = 200,
+        max_segments: int = 32,
+        min_score: float = 0.1
+    ):
+        """
+        Semantic search over the law article catalogue.
+
+        Article vectors are built once per catalogue version and stored
+        under index_dir, keyed by the catalogue's content hash; later
+        processes and restarts memory-map the stored index instead of
+        encoding again. Like LawArticleIndex, the catalogue file is checked
+        before each lookup and a changed catalogue is re-indexed.
+
+        A document's sentences are grouped into segments of about
+        segment_words words (longer when that would exceed max_segments), so that an article
+        relevant to one passage of a long judgment is still found.
+
+        Args:
+            keyword_index (LawArticleIndex): Keyword index over the same
+                catalogue, used as an optional prefilter
+            index_dir (str): Directory for the precomputed index
+            dimensions (int): Size of the article vectors
+            ann_threshold (int): Catalogues with more articles than this also
+                get an inverted-file index, and lookups score only the
+                articles in the clusters nearest to the document
+            nprobe (int): Clusters searched per segment with the inverted-file index
+            segment_words (int): Words per document segment
+            max_segments (int): Most segments encoded per document
+            min_score (float): Articles less similar than this are not suggested
+        """
+        self.keyword_index = keyword_index
+        self.index_dir = index_dir
+        self.dimensions = dimensions
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self.segment_words = segment_words
+        self.max_segments = max_segments
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        self._version = None
+        # (articles, ArticleVectors), swapped as one on reload
+        self._state = None
+
+    def _refresh(self) -> tuple:
+        stat = os.stat(self.keyword_index.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return self._state
+        with self._lock:
+            if version == self._version:
+                return self._state
+            with open(self.keyword_index.path, 'rb') as f:
+                content = f.read()
+            articles = json.loads(content)['articles']
+
+            digest = hashlib.sha256(content)
+            digest.update(json.dumps([INDEX_VERSION, self.dimensions, len(articles) > self.ann_threshold]).encode('utf-8'))
+            directory = os.path.join(self.index_dir, digest.hexdigest()[:32])
+            if os.path.isdir(directory):
+                vectors = ArticleVectors(directory)
+            else:
+                vectors = ArticleVectors.build(articles, directory, self.dimensions, self.ann_threshold)
+                self._remove_stale(directory)
+
+            self._state = (articles, vectors)
+            self._version = version
+            return self._state
+
+    def index(self) -> ArticleVectors:
+        """The current catalogue's vectors, built first if need be."""
+        return self._refresh()[1]
+
+    def _remove_stale(self, current: str):
+        """Delete indexes of earlier catalogue versions. Processes still mapping them keep their copy."""
+        for name in os.listdir(self.index_dir):
+            path = os.path.join(self.index_dir, name)
+            if path != current and not name.startswith('.') and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def segments(self, text: Union[str, Document]) -> List[str]:
+        """Group a document's consecutive sentences into segments of about segment_words words."""
+        sentences = as_document(text).sentences()
+        lengths = [len(sentence.split()) for sentence in sentences]
+        size = max(self.segment_words, math.ceil(sum(lengths) / self.max_segments))
+        segments, current, words = [], [], 0
+        for sentence, length in zip(sentences, lengths):
+            current.append(sentence)
+            words += length
+            if words >= size:
+                segments.append(' '.join(current))
+                current, words = [], 0
+        if current:
+            segments.append(' '.join(current))
+        return segments
+
+    def suggest(self, text: Union[str, Document, Sequence[str]], top_k: int = 3, prefilter: bool = False) -> List[dict]:
+        """
+        Articles most similar to a document, best first.
+
+        Args:
+            text: The document (text or Document), or its chunks, each
+                encoded as one segment
+            top_k (int): Most articles returned
+            prefilter (bool): Score only articles with a keyword match when
+                there are any, falling back to the whole catalogue otherwise
+
+        Returns:
+            List of {article, title, description, score}; score is the
+            cosine similarity of the article to the closest segment
+        """
+        articles, vectors = self._refresh()
+        if isinstance(text, (str, Document)):
+            segments = self.segments(text)
+        else:
+            segments = [chunk for chunk in text if chunk.strip()]
+        if not segments:
+            return []
+        queries = vectors.encode(segments)
+
+        candidates = None
+        if prefilter:
+            matched = [i for i in self.keyword_index.keyword_scores(' '.join(segments)) if i < len(articles)]
+            candidates = sorted(matched) or None
+        if candidates is None:
+            candidates = vectors.candidates(queries, self.nprobe)
+
+        return [
+            {
+                'article': articles[article_id]['article'],
+                'title': articles[article_id]['title'],
+                'description': articles[article_id]['description'],
+                'score': round(score, 3)
+            }
+            for article_id, score in vectors.search(queries, top_k, candidates)
+            if score >= self.min_score
+        ]
+
+
+def build_index(catalogue_path: str, index_dir: str = DEFAULT_LAW_INDEX_DIR, dimensions: int = 256,
+                ann_threshold: int = ANN_THRESHOLD) -> str:
+    """Precompute the article index for a catalogue ahead of serving. Returns the index directory."""
+    retriever = ArticleRetriever(LawArticleIndex(catalogue_path), index_dir, dimensions, ann_threshold)
+    return retriever.index().directory
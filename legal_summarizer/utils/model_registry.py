@@ -0,0 +1,76 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class ModelRegistry:
+    def __init__(self):
+        """
+        Process-wide store of loaded models, tokenizers and pipelines.
+
+        Each entry is loaded on first use and shared by every caller after
+        that, so request handlers never pay for a model load.
+        """
+        self._entries: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the entry for key, calling loader to create it the first time.
+
+        Args:
+            key: Identifies the entry, e.g. ('model', model_name)
+            loader (Callable): Builds the entry when it is not loaded yet
+
+        Returns:
+            The shared entry
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = loader()
+            return self._entries[key]
+
+    def tokenizer(self, model_name: str):
+        from transformers import AutoTokenizer
+        return self.get(('tokenizer', model_name), lambda: AutoTokenizer.from_pretrained(model_name))
+
+    def model(self, model_name: str, precision: str = 'fp32', backend: str = 'pytorch'):
+        """
+        Seq2seq model ready for inference.
+
+        Args:
+            model_name (str): Model directory or hub name
+            precision (str): 'fp32', 'int8' or 'bf16' (see utils.quantization)
+            backend (str): 'pytorch', or 'onnx' for ONNX Runtime (see utils.onnx_backend)
+        """
+        if backend == 'onnx':
+            if precision != 'fp32':
+                raise ValueError("The onnx backend only supports fp32 precision")
+            from .onnx_backend import load_onnx_model
+            return self.get(('model', model_name, precision, backend), lambda: load_onnx_model(model_name))
+        if backend != 'pytorch':
+            raise ValueError(f"Unsupported backend: {backend}")
+
+        from .quantization import load_model
+        return self.get(('model', model_name, precision, backend), lambda: load_model(model_name, precision))
+
+    def summarization_pipeline(self, model_name: str, precision: str = 'fp32', backend: str = 'pytorch'):
+        """Summarization pipeline that shares weights with model(model_name, precision, backend)."""
+        from transformers import pipeline
+        return self.get(
+            ('pipeline', 'summarization', model_name, precision, backend),
+            lambda: pipeline("summarization", model=self.model(model_name, precision, backend),
+                             tokenizer=self.tokenizer(model_name))
+        )
+
+    def spacy(self, name: str = "en_core_web_sm", **kwargs):
+        import spacy
+        key = ('spacy', name, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        return self.get(key, lambda: spacy.load(name, **kwargs))
+
+    def loaded(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+
+# Shared by everything running in this process
+registry = ModelRegistry()
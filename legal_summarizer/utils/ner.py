@@ -0,0 +1,131 @@
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Pipeline components that do not contribute to entity recognition and are not loaded
+UNUSED_COMPONENTS = ('tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'textcat')
+# Shared embedding components, kept only while a loaded component listens to them
+EMBEDDING_COMPONENTS = ('tok2vec', 'transformer')
+# Longest segment passed to spaCy; far below its default max_length of 1M
+MAX_SEGMENT_CHARS = 20_000
+# Segments before nlp.pipe uses more than one process
+PARALLEL_MIN_SEGMENTS = 64
+
+# Preferred places to cut an overlong segment: a blank line, a sentence end, any whitespace
+_CUTS = (re.compile(r'\n[ \t]*\n'), re.compile(r'[.!?]["\'’”)\]]*\s'), re.compile(r'\s'))
+_NOT_SPACE = re.compile(r'\S')
+
+
+def _load_ner(name: str):
+    import spacy
+
+    nlp = spacy.load(name, exclude=list(UNUSED_COMPONENTS))
+    # In en_core_web_sm the ner component embeds tokens itself; the shared
+    # tok2vec only fed the tagger and parser and would run for nothing
+    for embedding in EMBEDDING_COMPONENTS:
+        if embedding in nlp.pipe_names and not nlp.get_pipe(embedding).listening_components:
+            nlp.remove_pipe(embedding)
+    return nlp
+
+
+def load_ner(name: str = "en_core_web_sm"):
+    """spaCy pipeline with only the components named entity recognition needs, shared through the registry."""
+    from .model_registry import registry
+    return registry.get(('spacy-ner', name), lambda: _load_ner(name))
+
+
+def _cut(text: str, start: int, end: int) -> int:
+    """Where to end a segment starting at start that must end by end, preferring the latest natural break."""
+    window = start + (end - start) // 2
+    for pattern in _CUTS:
+        last = None
+        for last in pattern.finditer(text, window, end):
+            pass
+        if last:
+            return last.end()
+    return end
+
+
+def ner_segments(text: str, spans: Optional[Sequence[dict]] = None,
+                 max_chars: int = MAX_SEGMENT_CHARS) -> Iterator[Tuple[int, int]]:
+    """
+    Split text into segments of at most max_chars characters for NER.
+
+    Segments follow the page spans when given (see utils.extraction.page_spans),
+    so each page is one segment. Text not split into pages, and pages longer
+    than max_chars, are cut at the last blank line, else sentence end, else
+    whitespace in the second half of the allowed length. Whitespace-only
+    segments are skipped.
+
+    Args:
+        text (str): The document's full text
+        spans (Sequence[dict]): Optional {start, end} spans covering text
+        max_chars (int): Longest segment
+
+    Yields:
+        (start, end) character offsets of each segment in text
+    """
+    if spans is None:
+        spans = [{'start': 0, 'end': len(text)}]
+    for span in spans:
+        start, end = span['start'], span['end']
+        while start < end:
+            stop = end if end - start <= max_chars else _cut(text, start, start + max_chars)
+            if _NOT_SPACE.search(text, start, stop):
+                yield start, stop
+            start = stop
+
+
+class EntityExtractor:
+    def __init__(self, nlp, batch_size: int = 32, n_process: int = 1,
+                 max_chars: int = MAX_SEGMENT_CHARS):
+        """
+        Named entities of whole documents, found segment by segment.
+
+        Segments are streamed through nlp.pipe, so no single call sees more
+        than max_chars characters: documents of any length are handled and
+        memory stays bounded by the batch. Entity offsets are shifted back
+        to offsets in the full text.
+
+        Args:
+            nlp: spaCy pipeline, e.g. from load_ner()
+            batch_size (int): Segments per nlp.pipe batch
+            n_process (int): Processes for nlp.pipe; only used for documents
+                of at least PARALLEL_MIN_SEGMENTS segments, as starting
+                workers costs more than small documents take
+            max_chars (int): Longest segment (see ner_segments)
+        """
+        self.nlp = nlp
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.max_chars = max_chars
+
+    def extract(self, text: str, spans: Optional[Sequence[dict]] = None) -> List[dict]:
+        """
+        Find the entities in text.
+
+        Args:
+            text (str): The document's full text
+            spans (Sequence[dict]): Optional page spans to segment by
+
+        Returns:
+            List of {text, label, start, end} in document order; start and
+            end are character offsets in text
+        """
+        segments = list(ner_segments(text, spans, self.max_chars))
+        n_process = self.n_process if len(segments) >= PARALLEL_MIN_SEGMENTS else 1
+        docs = self.nlp.pipe(
+            ((text[start:end], start) for start, end in segments),
+            as_tuples=True,
+            batch_size=self.batch_size,
+            n_process=n_process
+        )
+        entities = []
+        for doc, offset in docs:
+            for ent in doc.ents:
+                entities.append({
+                    'text': ent.text,
+                    'label': ent.label_,
+                    'start': ent.start_char + offset,
+                    'end': ent.end_char + offset
+                })
+        return entities
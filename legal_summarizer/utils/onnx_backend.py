@@ -0,0 +1,65 @@
+import os
+
+BACKENDS = ('pytorch', 'onnx')
+
+
+def onnx_dir(model_dir: str) -> str:
+    """Directory for the ONNX export of a model, next to the original (e.g. trained_model-onnx)."""
+    return f"{model_dir.rstrip('/')}-onnx"
+
+
+def session_options(num_threads: int = 0):
+    """ONNX Runtime session options with every graph optimization enabled."""
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+    return options
+
+
+def export_onnx(model_dir: str, output_dir: str = None) -> str:
+    """
+    Export a seq2seq model to ONNX encoder and decoder graphs.
+
+    The decoder is exported both without and with past key/values, so
+    generation reuses the KV-cache instead of re-running the whole prefix at
+    every step.
+
+    Args:
+        model_dir (str): Fine-tuned model directory (e.g. trained_model) or hub name
+        output_dir (str): Where to write the graphs. Defaults to onnx_dir(model_dir).
+
+    Returns:
+        str: The output directory
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    output_dir = output_dir or onnx_dir(model_dir)
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_dir, export=True, use_cache=True)
+    model.save_pretrained(output_dir)
+    return output_dir
+
+
+def load_onnx_model(model_name: str, num_threads: int = 0):
+    """
+    Load an ONNX Runtime seq2seq model for CPU inference.
+
+    Uses the export in onnx_dir(model_name) when it exists; otherwise the
+    model is exported in memory, which is slow and meant for development only.
+
+    Args:
+        model_name (str): Model directory (e.g. trained_model) or hub name
+        num_threads (int): ORT intra-op threads; 0 lets ORT decide
+
+    Returns:
+        ORTModelForSeq2SeqLM usable with the transformers summarization pipeline
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    exported = onnx_dir(model_name)
+    options = session_options(num_threads)
+    if os.path.isdir(exported):
+        return ORTModelForSeq2SeqLM.from_pretrained(exported, use_cache=True, session_options=options)
+    return ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True, session_options=options)
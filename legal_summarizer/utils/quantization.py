@@ -0,0 +1,92 @@
+import json
+import os
+
+PRECISIONS = ('fp32', 'int8', 'bf16')
+
+INT8_WEIGHTS = 'quantized_int8.pt'
+QUANTIZATION_CONFIG = 'quantization.json'
+
+
+def quantized_dir(model_dir: str, precision: str) -> str:
+    """Directory for a quantized copy of a model, next to the original (e.g. trained_model-int8)."""
+    return f"{model_dir.rstrip('/')}-{precision}"
+
+
+def quantize_model(model, precision: str):
+    """
+    Convert a loaded fp32 model for CPU inference at the given precision.
+
+    Args:
+        model: fp32 PyTorch model in eval mode
+        precision (str): 'fp32' (unchanged), 'int8' (dynamic INT8 quantization
+            of every Linear layer) or 'bf16'
+
+    Returns:
+        The converted model
+    """
+    import torch
+
+    if precision == 'fp32':
+        return model
+    if precision == 'int8':
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if precision == 'bf16':
+        return model.to(torch.bfloat16)
+    raise ValueError(f"Unsupported precision: {precision}. Choose from {', '.join(PRECISIONS)}")
+
+
+def save_quantized(model, tokenizer, output_dir: str, precision: str, base_model: str):
+    """
+    Save a quantized model so it can be loaded without re-quantizing.
+
+    INT8 models are stored as a state dict next to the model config, since
+    dynamically quantized layers can't go through save_pretrained.
+    """
+    import torch
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer.save_pretrained(output_dir)
+    if precision == 'int8':
+        model.config.save_pretrained(output_dir)
+        torch.save(model.state_dict(), os.path.join(output_dir, INT8_WEIGHTS))
+    else:
+        model.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, QUANTIZATION_CONFIG), 'w') as f:
+        json.dump({'precision': precision, 'base_model': base_model}, f, indent=2)
+
+
+def load_model(model_name: str, precision: str = 'fp32'):
+    """
+    Load a seq2seq model for inference at the given precision.
+
+    A saved checkpoint in quantized_dir(model_name, precision) is used when it
+    exists; otherwise the fp32 model is loaded and converted in memory.
+
+    Args:
+        model_name (str): Model directory (e.g. trained_model) or hub name
+        precision (str): One of PRECISIONS
+
+    Returns:
+        The model in eval mode
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision}. Choose from {', '.join(PRECISIONS)}")
+
+    saved_dir = quantized_dir(model_name, precision)
+    if precision != 'fp32' and os.path.exists(os.path.join(saved_dir, QUANTIZATION_CONFIG)):
+        if precision == 'bf16':
+            model = AutoModelForSeq2SeqLM.from_pretrained(saved_dir, torch_dtype=torch.bfloat16)
+        else:
+            model = AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(saved_dir))
+            model.eval()
+            model = quantize_model(model, precision)
+            model.load_state_dict(torch.load(os.path.join(saved_dir, INT8_WEIGHTS)))
+        model.eval()
+        return model
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    return quantize_model(model, precision)
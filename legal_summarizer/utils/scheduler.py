@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from .inference_service import WorkerDiedError
+
+
+class _Request:
+    """One caller's inputs, collected back in order as their batches finish."""
+
+    def __init__(self, size: int):
+        self.results = [None] * size
+        self.remaining = size
+        self.future = Future()
+        self.lock = threading.Lock()
+
+    def set_result(self, index: int, output):
+        with self.lock:
+            if self.future.done():
+                return
+            self.results[index] = output
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.future.set_result(self.results)
+
+    def set_exception(self, error: Exception):
+        with self.lock:
+            if not self.future.done():
+                self.future.set_exception(error)
+
+
+class MicroBatchScheduler:
+    def __init__(self, backend, max_batch_size: int = 16, max_wait_ms: float = 5.0, max_inflight: Optional[int] = None,
+                 timeout: Optional[float] = 600):
+        """
+        Merge inputs from concurrent requests into shared model batches.
+
+        Inputs are queued as they arrive and a batch is dispatched once
+        max_batch_size inputs with the same generation parameters are waiting,
+        or when the oldest input has waited max_wait_ms. Each caller gets its
+        own outputs back in input order. A failed batch is retried input by
+        input, so an input that fails on its own only fails its own request
+        and the caller falls back exactly as it would against the pipeline.
+        A batch whose worker died is not retried, as its inputs would only
+        take down more workers: every request in it fails.
+
+        Args:
+            backend: Summarization pipeline or InferenceService
+            max_batch_size (int): Maximum number of inputs per model call
+            max_wait_ms (float): Longest time an input waits for others to join its batch
+            max_inflight (int): Batches dispatched concurrently to a backend
+                with submit(). Defaults to the backend's worker count.
+            timeout (float): Seconds a blocking call waits for its outputs
+        """
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._async = hasattr(backend, 'submit')
+        self._inflight = threading.Semaphore(max_inflight or getattr(backend, 'num_workers', 1))
+        self._queue = deque()  # (request, index, text, params_key, params, enqueued_at)
+        self._condition = threading.Condition()
+        self._running = True
+        self._stats = {'batches': 0, 'inputs': 0, 'max_batch_size': 0, 'batch_sizes': {}}
+        self._thread = threading.Thread(target=self._loop, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    @property
+    def model(self):
+        return self.backend.model
+
+    @property
+    def tokenizer(self):
+        return self.backend.tokenizer
+
+    @property
+    def num_workers(self) -> int:
+        return getattr(self.backend, 'num_workers', 1)
+
+    def submit(self, inputs, **generate_kwargs) -> Future:
+        """Queue inputs for batching and return a Future for the pipeline-style output."""
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        generate_kwargs.pop('batch_size', None)
+        params_key = json.dumps(generate_kwargs, sort_keys=True, default=str)
+        request = _Request(len(texts))
+        if not texts:
+            request.future.set_result([])
+            return request.future
+
+        now = time.monotonic()
+        with self._condition:
+            if not self._running:
+                raise RuntimeError("MicroBatchScheduler has been stopped")
+            for index, text in enumerate(texts):
+                self._queue.append((request, index, text, params_key, generate_kwargs, now))
+            self._condition.notify()
+        return request.future
+
+    def __call__(self, inputs, **generate_kwargs) -> List[Any]:
+        return self.submit(inputs, **generate_kwargs).result(timeout=self.timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats = dict(self._stats, queue_depth=len(self._queue))
+            stats['batch_sizes'] = dict(self._stats['batch_sizes'])
+        stats['mean_batch_size'] = stats['inputs'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+        pending = list(self._queue)
+        self._queue.clear()
+        for request, *_ in pending:
+            request.set_exception(RuntimeError("MicroBatchScheduler stopped"))
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if batch:
+                self._dispatch(batch)
+
+    def _next_batch(self) -> Optional[list]:
+        """Wait for a full batch or for the oldest input's deadline, then take a batch."""
+        with self._condition:
+            while self._running and not self._queue:
+                self._condition.wait()
+            if not self._running:
+                return None
+
+            deadline = self._queue[0][5] + self.max_wait
+            while self._running and len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            # Inputs of requests that were cancelled while waiting are dropped
+            self._queue = deque(item for item in self._queue if not item[0].future.cancelled())
+            if not self._queue:
+                return []
+
+            # Take the oldest inputs that share the first input's generation parameters
+            params_key = self._queue[0][3]
+            batch = []
+            kept = deque()
+            while self._queue and len(batch) < self.max_batch_size:
+                item = self._queue.popleft()
+                (batch if item[3] == params_key else kept).append(item)
+            kept.extend(self._queue)
+            self._queue = kept
+
+            size = len(batch)
+            self._stats['batches'] += 1
+            self._stats['inputs'] += size
+            self._stats['max_batch_size'] = max(self._stats['max_batch_size'], size)
+            self._stats['batch_sizes'][size] = self._stats['batch_sizes'].get(size, 0) + 1
+            return batch
+
+    def _dispatch(self, batch: list, throttle: bool = True):
+        texts = [item[2] for item in batch]
+        params = batch[0][4]
+        if not self._async:
+            try:
+                outputs = self.backend(texts, batch_size=len(texts), **params)
+            except Exception as e:
+                self._failed(batch, e)
+            else:
+                self._route(batch, outputs)
+            return
+
+        # Retries run from a backend callback and must not wait on the
+        # in-flight limit, which only that backend can release
+        if throttle and not self._acquire_slot():
+            self._fail(batch, TimeoutError("No backend capacity freed up") if self._running
+                       else RuntimeError("MicroBatchScheduler stopped"))
+            return
+        try:
+            future = self.backend.submit(texts, batch_size=len(texts), **params)
+        except Exception as e:
+            if throttle:
+                self._inflight.release()
+            self._failed(batch, e)
+            return
+
+        def done(future):
+            if throttle:
+                self._inflight.release()
+            try:
+                outputs = future.result()
+            except Exception as e:
+                self._failed(batch, e)
+            else:
+                self._route(batch, outputs)
+        future.add_done_callback(done)
+
+    def _acquire_slot(self) -> bool:
+        """Wait for an in-flight slot, giving up after timeout seconds or when the scheduler stops."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._inflight.acquire(timeout=0.1):
+            if not self._running or (deadline is not None and time.monotonic() >= deadline):
+                return False
+        return True
+
+    def _failed(self, batch: list, error: Exception):
+        """Retry a failed shared batch input by input, so one bad input only fails its own request."""
+        if len(batch) == 1 or isinstance(error, WorkerDiedError):
+            self._fail(batch, error)
+            return
+        for item in batch:
+            self._dispatch([item], throttle=False)
+
+    def _route(self, batch: list, outputs: list):
+        if len(outputs) != len(batch):
+            self._fail(batch, RuntimeError(f"Expected {len(batch)} outputs, got {len(outputs)}"))
+            return
+        for (request, index, *_), output in zip(batch, outputs):
+            if isinstance(output, list):
+                output = output[0]
+            request.set_result(index, output)
+
+    def _fail(self, batch: list, error: Exception):
+        for request, *_ in batch:
+            request.set_exception(error)
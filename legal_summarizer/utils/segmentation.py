@@ -0,0 +1,112 @@
+import re
+from array import array
+from bisect import bisect_right
+from typing import List, Tuple, Union
+
+# Words that end with a full stop without ending the sentence, lowercased and
+# without the stop: case citations (v.), references (No., S., Art., Sec.,
+# Cl., O., R.), titles, company suffixes and month abbreviations
+ABBREVIATIONS = frozenset({
+    'v', 'vs', 'no', 'nos', 's', 'ss', 'sec', 'secs', 'art', 'arts', 'cl', 'cls', 'o', 'ord', 'r', 'rr',
+    'sch', 'para', 'paras', 'p', 'pp', 'vol', 'ch', 'sub', 'supp', 'fig', 'ref', 'ibid', 'cf', 'viz',
+    'i.e', 'e.g', 'w.e.f', 'u/s', 'approx', 'ors', 'anr', 'govt', 'dept', 'addl', 'asst', 'spl', 'misc',
+    'crl', 'cri', 'civ', 'cr', 'mr', 'mrs', 'ms', 'dr', 'smt', 'shri', 'sh', 'hon', 'j', 'jj', 'cj',
+    'sr', 'jr', 'st', 'ltd', 'pvt', 'co', 'corp', 'inc', 'bros', 'rs',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+})
+
+# Terminal punctuation (with closing quotes or brackets) before whitespace, or a blank line
+_BOUNDARY = re.compile(r'[.!?]+["\'’”)\]]*(?=\s)|\n[ \t]*\n')
+_LAST_WORD = re.compile(r'[(\["\']*(\S+)$')
+_NEXT_CHAR = re.compile(r'\s*(\S)')
+_NOT_SPACE = re.compile(r'\S')
+
+
+def _ends_sentence(text: str, stop: int, after: int) -> bool:
+    """Whether the full stop at text[stop] ends a sentence; after is the end of the punctuation."""
+    word = _LAST_WORD.search(text, max(0, stop - 16), stop)
+    if word:
+        token = word.group(1).lower()
+        if token in ABBREVIATIONS:
+            return False
+        # Initials and dotted acronyms: "A. K. Sharma", "U.S."
+        last = token.rsplit('.', 1)[-1]
+        if len(last) == 1 and last.isalpha():
+            return False
+    following = _NEXT_CHAR.match(text, after)
+    # A sentence does not continue in lower case
+    return not (following and following.group(1).islower())
+
+
+def segment(text: str) -> Tuple[array, array]:
+    """
+    Split text into sentences, returning their start and end offsets.
+
+    A sentence ends at '.', '!' or '?' followed by whitespace, or at a blank
+    line. Full stops after legal and common abbreviations ("v.", "No.",
+    "S.", "Art.", "Mr."), after initials, or followed by a lower-case word
+    do not end a sentence. Offsets exclude surrounding whitespace.
+
+    Returns:
+        Two arrays of int64 offsets: sentence starts and sentence ends
+    """
+    starts, ends = array('q'), array('q')
+
+    def add(start: int, end: int):
+        first = _NOT_SPACE.search(text, start, end)
+        if first:
+            end = len(text[start:end].rstrip()) + start
+            starts.append(first.start())
+            ends.append(end)
+
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        if text[match.start()] == '\n':
+            add(start, match.start())
+        elif text[match.start()] == '.' and not _ends_sentence(text, match.start(), match.end()):
+            continue
+        else:
+            add(start, match.end())
+        start = match.end()
+    add(start, len(text))
+    return starts, ends
+
+
+class Document:
+    def __init__(self, text: str):
+        """
+        A document's text with its sentence boundaries, computed once.
+
+        Every stage of the analysis (extractive selection, chunking, dates,
+        importance and article matching) reads sentences from the same
+        Document, so the text is segmented once and all stages agree on
+        where sentences begin and end.
+
+        Args:
+            text (str): The document's full text
+        """
+        self.text = text
+        self.starts, self.ends = segment(text)
+        self._sentences = None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def sentence(self, index: int) -> str:
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def sentences(self) -> List[str]:
+        """All sentences in order, sliced from the text once and reused."""
+        if self._sentences is None:
+            text = self.text
+            self._sentences = [text[start:end] for start, end in zip(self.starts, self.ends)]
+        return self._sentences
+
+    def sentence_index(self, offset: int) -> int:
+        """Index of the sentence containing (or, between sentences, preceding) a character offset; -1 if none."""
+        return bisect_right(self.starts, offset) - 1
+
+
+def as_document(text: Union[str, Document]) -> Document:
+    """Segment text, or pass an already segmented Document through."""
+    return text if isinstance(text, Document) else Document(text)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The application imports its own packages (utils, database) relative to
+# legal_summarizer/, the directory it is run from
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'legal_summarizer'))
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'legal_summarizer')
+
+def test_importing_app_does_not_load_heavy_dependencies(tmp_path):
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    probe = (
+        "import sys; sys.path.insert(0, {!r}); import app; "
+        "print(sorted(m for m in ('transformers', 'torch', 'reportlab', 'PyPDF2', 'docx', 'sqlalchemy') if m in sys.modules)); "
+        "print(app.summarizer is None and not app._model_loaded)"
+    ).format(APP_DIR)
+    output = subprocess.run([sys.executable, '-c', probe], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert output.stdout.split('\n')[:2] == ['[]', 'True']
+
+def test_cache_keys_do_not_load_the_model(tmp_path):
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    probe = (
+        "import io, sys, types; sys.path.insert(0, {!r}); import app; "
+        "key = app.get_cache_key(types.SimpleNamespace(stream=io.BytesIO(b'The lease is void.'))); "
+        "print(len(key) > 0 and not app._model_loaded)"
+    ).format(APP_DIR)
+    output = subprocess.run([sys.executable, '-c', probe], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert output.stdout.split('\n')[0] == 'True'
@@ -0,0 +1,150 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from legal_summarizer.utils.batching import summarize_batched, iter_summaries_batched, fallback_summary, sentence_fallback
+from legal_summarizer.utils.cache import ChunkSummaryCache
+
+class FakeSummarizer:
+    """Stands in for a transformers summarization pipeline."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        self.calls.append(batch)
+        if self.fail_on and any(self.fail_on in text for text in batch):
+            raise RuntimeError("model failure")
+        outputs = [{'summary_text': text.upper()} for text in batch]
+        return outputs
+
+@pytest.fixture
+def chunks():
+    return ["ccc. more", "a", "bbbbbb. x", "dd"]
+
+def test_summaries_keep_input_order(chunks):
+    summarizer = FakeSummarizer()
+    summaries = summarize_batched(summarizer, chunks, batch_size=2)
+    assert summaries == [chunk.upper() for chunk in chunks]
+
+def test_batches_are_sorted_by_length(chunks):
+    summarizer = FakeSummarizer()
+    summarize_batched(summarizer, chunks, batch_size=2)
+    assert len(summarizer.calls) == 2
+    assert summarizer.calls[0] == ["a", "dd"]
+    assert summarizer.calls[1] == ["ccc. more", "bbbbbb. x"]
+
+def test_failed_chunk_falls_back_without_failing_batch(chunks):
+    summarizer = FakeSummarizer(fail_on="ccc")
+    summaries = summarize_batched(summarizer, chunks, batch_size=4)
+    assert summaries[0] == fallback_summary(chunks[0])
+    assert summaries[1:] == [chunk.upper() for chunk in chunks[1:]]
+
+def test_fallback_summary_uses_first_sentences():
+    assert fallback_summary("One. Two. Three. Four.") == "One. Two. Three."
+
+def test_sentence_fallback_uses_the_chunks_own_sentences():
+    sentences = ["One.", "Two.", "Three.", "Four."]
+    fallback = sentence_fallback(sentences, [("One. Two. Three. Four.", [0, 1, 2, 3]), ("Four.", [3])])
+    assert fallback("One. Two. Three. Four.") == "One. Two. Three."
+    assert fallback("Four.") == "Four."
+    assert fallback("Other. Text.") == "Other. Text."
+
+def test_chunk_cache_skips_model_for_repeated_chunks():
+    cache = ChunkSummaryCache('fake-model', max_entries=16)
+    summarizer = FakeSummarizer()
+    first = summarize_batched(summarizer, ["WHEREAS the parties agree.", "Clause one."], cache=cache, max_length=60)
+    calls = len(summarizer.calls)
+
+    second = summarize_batched(summarizer, ["WHEREAS  the parties\nagree.", "Clause one."], cache=cache, max_length=60)
+    assert len(summarizer.calls) == calls
+    assert second == first
+    assert cache.stats()['hits'] == 2
+
+def test_chunk_cache_is_keyed_by_generation_params():
+    cache = ChunkSummaryCache('fake-model')
+    summarizer = FakeSummarizer()
+    summarize_batched(summarizer, ["Clause one."], cache=cache, max_length=60)
+    summarize_batched(summarizer, ["Clause one."], cache=cache, max_length=130)
+    assert len(summarizer.calls) == 2
+
+def test_repeated_chunks_in_one_document_run_once():
+    summarizer = FakeSummarizer()
+    summaries = summarize_batched(summarizer, ["Same clause.", "Other.", "Same clause."])
+    assert summarizer.calls == [["Other.", "Same clause."]]
+    assert summaries[0] == summaries[2] == "SAME CLAUSE."
+
+def test_fallback_summaries_are_not_cached():
+    cache = ChunkSummaryCache('fake-model')
+    summarize_batched(FakeSummarizer(fail_on="bad"), ["bad chunk. more"], cache=cache)
+    assert len(cache.memory) == 0
+
+def test_iter_yields_cached_chunks_before_model_batches():
+    cache = ChunkSummaryCache('fake-model')
+    cache.put("Known clause.", {}, "cached summary")
+    results = list(iter_summaries_batched(FakeSummarizer(), ["New clause here.", "Known clause."], cache=cache))
+    assert results == [(1, "cached summary"), (0, "NEW CLAUSE HERE.")]
+
+def test_policy_parameters_split_batches():
+    calls = []
+
+    class RecordingSummarizer(FakeSummarizer):
+        def __call__(self, inputs, **kwargs):
+            calls.append((list(inputs), kwargs['num_beams']))
+            return super().__call__(inputs, **kwargs)
+
+    chunks = ["must pay", "note", "must sign", "memo"]
+    policy = lambda chunk: {'num_beams': 4 if 'must' in chunk else 1}
+    summaries = summarize_batched(RecordingSummarizer(), chunks, batch_size=8, policy=policy)
+    assert summaries == [chunk.upper() for chunk in chunks]
+    assert sorted(calls, key=lambda call: call[1]) == [(["note", "memo"], 1), (["must pay", "must sign"], 4)]
+
+class SlowBackend:
+    """Accepts batches asynchronously and summarizes them one at a time, each taking delay seconds."""
+
+    def __init__(self, delay, timeout, stuck=False):
+        self.num_workers = 1
+        self.timeout = timeout
+        self.delay = delay
+        self.stuck = stuck
+        self.futures = []
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, inputs, **kwargs):
+        if self.stuck:
+            future = Future()
+        else:
+            future = self.executor.submit(self.run, list(inputs))
+        self.futures.append(future)
+        return future
+
+    def run(self, batch):
+        time.sleep(self.delay)
+        return [{'summary_text': text.upper()} for text in batch]
+
+def test_each_batch_gets_its_own_deadline():
+    backend = SlowBackend(delay=0.15, timeout=0.4)
+    chunks = [f"Clause {i}." for i in range(5)]
+    assert summarize_batched(backend, chunks, batch_size=1) == [chunk.upper() for chunk in chunks]
+
+def test_timed_out_batches_are_cancelled_and_later_ones_not_sent():
+    backend = SlowBackend(delay=0, timeout=0.2, stuck=True)
+    chunks = ["First clause. More.", "Second clause. More.", "Third clause. More."]
+    assert summarize_batched(backend, chunks, batch_size=1) == chunks
+    assert len(backend.futures) == 1
+    assert backend.futures[0].cancelled()
+
+def test_batch_whose_worker_died_is_not_retried():
+    from legal_summarizer.utils.inference_service import WorkerDiedError
+
+    class DyingSummarizer(FakeSummarizer):
+        def __call__(self, inputs, **kwargs):
+            self.calls.append(inputs)
+            raise WorkerDiedError("Inference worker exited with code -9")
+
+    summarizer = DyingSummarizer()
+    chunks = ["First clause. More.", "Second clause. More."]
+    assert summarize_batched(summarizer, chunks, batch_size=2) == chunks
+    assert len(summarizer.calls) == 1
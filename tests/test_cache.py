@@ -0,0 +1,98 @@
+import pytest
+import os
+from legal_summarizer.utils.cache import LRUCache, SummaryCache, ExtractedTextCache, make_cache_key
+
+GENERATION = {'max_length': 130, 'min_length': 30}
+
+@pytest.fixture
+def result():
+    return {
+        'summary': 'A short summary.',
+        'dates': [{'date': '2024-01-15', 'context': 'Signed on 2024-01-15'}],
+        'importance': {'high': ['Payment is mandatory'], 'medium': [], 'low': []},
+        'suggested_articles': []
+    }
+
+def test_cache_key_depends_on_content_and_config():
+    key = make_cache_key(b'document', 'bart', GENERATION, '1')
+    assert key == make_cache_key(b'document', 'bart', dict(GENERATION), '1')
+    assert key != make_cache_key(b'document2', 'bart', GENERATION, '1')
+    assert key != make_cache_key(b'document', 'distilbart', GENERATION, '1')
+    assert key != make_cache_key(b'document', 'bart', {'max_length': 60}, '1')
+    assert key != make_cache_key(b'document', 'bart', GENERATION, '2')
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 1
+
+def test_persistent_tier_survives_restart(result):
+    pytest.importorskip('sqlalchemy')
+    from database.models import init_session_factory
+
+    session_factory = init_session_factory('sqlite://')
+    SummaryCache(session_factory=session_factory).put('key', result, 'contract.pdf', 'text', 1.5)
+
+    cache = SummaryCache(session_factory=session_factory)
+    assert cache.get('key') == result
+    assert cache.get('key') == result
+    assert cache.get('missing') is None
+    stats = cache.stats()
+    assert stats['persistent_hits'] == 1
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+def test_persistent_tier_works_on_a_database_from_before_cache_keys(result, tmp_path):
+    sqlalchemy = pytest.importorskip('sqlalchemy')
+    from database.models import init_session_factory
+
+    db_url = f"sqlite:///{tmp_path / 'old.db'}"
+    engine = sqlalchemy.create_engine(db_url)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE documents (id INTEGER PRIMARY KEY, filename VARCHAR(255) NOT NULL, "
+            "original_text TEXT NOT NULL, summary TEXT, dates TEXT, importance_high TEXT, "
+            "importance_medium TEXT, importance_low TEXT, processing_time FLOAT, "
+            "created_at DATETIME, updated_at DATETIME)")
+        connection.exec_driver_sql(
+            "INSERT INTO documents (filename, original_text, summary) VALUES ('old.pdf', 'text', 'Old summary.')")
+    engine.dispose()
+
+    session_factory = init_session_factory(db_url)
+    assert SummaryCache(session_factory=session_factory).put('key', result, 'contract.pdf', 'text', 1.5) is not None
+    assert SummaryCache(session_factory=session_factory).get('key') == result
+    indexes = sqlalchemy.inspect(session_factory.kw['bind']).get_indexes('documents')
+    assert [index['column_names'] for index in indexes] == [['cache_key']]
+
+def test_extracted_text_round_trips_across_instances(tmp_path):
+    ExtractedTextCache(str(tmp_path)).put_pages("abc", [(1, "First page."), (2, "Second page.")])
+    cache = ExtractedTextCache(str(tmp_path))
+    assert cache.get_pages("abc") == [[1, "First page."], [2, "Second page."]]
+    assert cache.get_pages("missing") is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_extracted_text_evicts_least_recently_used(tmp_path):
+    cache = ExtractedTextCache(str(tmp_path), max_bytes=25)
+    cache.put_page("a", "x" * 10)
+    cache.put_page("b", "y" * 10)
+    os.utime(tmp_path / "page-a", (1, 1))
+    os.utime(tmp_path / "page-b", (2, 2))
+    cache.get_page("a")  # Now the most recently used
+    cache.put_page("c", "z" * 10)
+    assert cache.get_page("b") is None
+    assert cache.get_page("a") == "x" * 10
+    assert cache.stats()['bytes'] <= 25
+
+def test_file_key_depends_on_content(tmp_path):
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_bytes(b"same")
+    second.write_bytes(b"same")
+    assert ExtractedTextCache.file_key(str(first)) == ExtractedTextCache.file_key(str(second))
+    second.write_bytes(b"different")
+    assert ExtractedTextCache.file_key(str(first)) != ExtractedTextCache.file_key(str(second))
@@ -0,0 +1,65 @@
+import pytest
+from legal_summarizer.utils.chunking import TextChunker, split_sentences
+
+class WordTokenizer:
+    """Minimal tokenizer that treats every word as one token."""
+    model_max_length = 12
+
+    def __call__(self, texts, add_special_tokens=True):
+        return {'input_ids': [text.split() for text in texts]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+@pytest.fixture
+def text():
+    return ("The appellant filed a petition. The court heard both sides. "
+            "Judgment was reserved. The appeal is dismissed with costs.")
+
+def test_split_sentences(text):
+    sentences = split_sentences(text)
+    assert len(sentences) == 4
+    assert sentences[0] == "The appellant filed a petition."
+
+def test_budget_defaults_to_model_length_minus_special_tokens():
+    chunker = TextChunker(WordTokenizer())
+    assert chunker.max_tokens == 10
+
+def test_chunks_keep_whole_sentences(text):
+    chunker = TextChunker(WordTokenizer(), max_tokens=10)
+    chunks = chunker.chunk(text)
+    assert chunks == [
+        "The appellant filed a petition. The court heard both sides.",
+        "Judgment was reserved. The appeal is dismissed with costs.",
+    ]
+    assert all(chunker.count_tokens(chunk) <= 10 for chunk in chunks)
+
+def test_overlap_repeats_trailing_sentences(text):
+    chunker = TextChunker(WordTokenizer(), max_tokens=10, overlap_tokens=5)
+    chunks = chunker.chunk(text)
+    assert chunks[1].startswith("The court heard both sides.")
+    assert chunks[-1].endswith("The appeal is dismissed with costs.")
+    assert all(chunker.count_tokens(chunk) <= 10 for chunk in chunks)
+
+def test_chunk_groups_name_their_sentences(text):
+    chunker = TextChunker(WordTokenizer(), max_tokens=10, overlap_tokens=5)
+    groups = chunker.chunk_sentence_groups(split_sentences(text))
+    assert [chunk for chunk, _ in groups] == chunker.chunk(text)
+    assert [indices for _, indices in groups] == [[0, 1], [1, 2], [2, 3]]
+
+def test_long_sentence_is_split_to_fit():
+    chunker = TextChunker(WordTokenizer(), max_tokens=4)
+    chunks = chunker.chunk("one two three four five six seven eight nine.")
+    assert all(chunker.count_tokens(chunk) <= 4 for chunk in chunks)
+    assert " ".join(chunks) == "one two three four five six seven eight nine."
+
+def test_without_tokenizer_counts_words(text):
+    chunker = TextChunker(max_tokens=6)
+    assert all(chunker.count_tokens(chunk) <= 6 for chunk in chunker.chunk(text))
+
+def test_invalid_overlap_rejected():
+    with pytest.raises(ValueError):
+        TextChunker(WordTokenizer(), max_tokens=10, overlap_tokens=10)
@@ -0,0 +1,29 @@
+import pytest
+from legal_summarizer.utils.dates import extract_dates, iter_dates, normalize_date
+
+@pytest.mark.parametrize("written", [
+    "January 1, 2023", "01/01/2023", "2023-01-01", "1st January 2023",
+    "1st day of January, 2023", "Jan. 1, 2023", "01-01-23",
+])
+def test_formats_normalize_to_iso(written):
+    assert normalize_date(written) == "2023-01-01"
+
+def test_invalid_or_partial_dates_are_rejected():
+    assert normalize_date("31/02/2024") is None
+    assert normalize_date("the 15th") is None
+    assert [d.text for d in iter_dates("Case No. 123/45/67890 and 10/11/2024x")] == []
+
+def test_day_first_unless_impossible():
+    assert normalize_date("05/04/2024") == "2024-04-05"
+    assert normalize_date("03/15/2024") == "2024-03-15"
+
+def test_dates_are_deduplicated_with_offsets_and_context():
+    text = ("The deed was executed on the 15th day of March, 2024 at Mumbai. "
+            "Possession was handed over on 15/03/2024. Rent is due by April 5, 2024.")
+    dates = extract_dates(text)
+    assert [d["normalized"] for d in dates] == ["2024-03-15", "2024-04-05"]
+    first = dates[0]
+    assert first["date"] == "15th day of March, 2024"
+    assert text[first["start"]:first["end"]] == first["date"]
+    assert first["context"] == "The deed was executed on the 15th day of March, 2024 at Mumbai."
+    assert dates[1]["context"] == "Rent is due by April 5, 2024."
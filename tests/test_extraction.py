@@ -0,0 +1,136 @@
+import tempfile
+import pytest
+from legal_summarizer.utils import extraction
+from legal_summarizer.utils.extraction import Page, iter_pages, iter_pdf_pages, join_pages, page_spans
+
+pytest.importorskip("PyPDF2")
+
+def make_pdf(page_texts, xobjects=False):
+    """
+    Build a minimal PDF with one line of Helvetica text per page. With
+    xobjects, each page's text is in a form XObject its content only draws.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        resources = b"/Font << /F1 3 0 R >>"
+        if xobjects:
+            objects.append(b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << %s >> "
+                           b"/Length %d >>\nstream\n%s\nendstream" % (resources, len(stream), stream))
+            resources = b"/XObject << /X1 %d 0 R >>" % len(objects)
+            stream = b"q /X1 Do Q"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << %s >> /Contents %d 0 R >>" % (resources, len(objects)))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "record.pdf"
+    path.write_bytes(make_pdf([f"Page {i} of the record." for i in range(1, 41)]))
+    return str(path)
+
+def test_pages_keep_their_numbers(pdf_path):
+    pages = list(iter_pdf_pages(pdf_path, workers=1))
+    assert [page.number for page in pages] == list(range(1, 41))
+    assert pages[6].text.strip() == "Page 7 of the record."
+
+def test_parallel_extraction_matches_sequential(pdf_path, monkeypatch):
+    monkeypatch.setattr(extraction, "PARALLEL_MIN_PAGES", 8)
+    monkeypatch.setattr(extraction, "PAGES_PER_TASK", 6)
+    assert list(iter_pdf_pages(pdf_path, workers=3)) == list(iter_pdf_pages(pdf_path, workers=1))
+
+def test_txt_is_a_single_page(tmp_path):
+    path = tmp_path / "note.txt"
+    path.write_text("Short note.", encoding="utf-8")
+    assert list(iter_pages(str(path))) == [Page(1, "Short note.")]
+
+def test_unsupported_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        iter_pages(str(tmp_path / "scan.tiff"))
+
+def test_page_spans_index_the_joined_text():
+    pages = [Page(1, "First page."), Page(2, ""), Page(3, "Third page.")]
+    text = join_pages(pages)
+    spans = page_spans(pages)
+    assert [text[span['start']:span['end']] for span in spans] == [page.text for page in pages]
+
+def test_amended_pdf_only_parses_changed_pages(tmp_path):
+    from legal_summarizer.utils.cache import ExtractedTextCache
+
+    cache = ExtractedTextCache(str(tmp_path / "cache"))
+    original = tmp_path / "filing.pdf"
+    original.write_bytes(make_pdf([f"Page {i}." for i in range(1, 6)]))
+    first = list(iter_pages(str(original), cache=cache))
+
+    amended = tmp_path / "filing-amended.pdf"
+    amended.write_bytes(make_pdf([f"Page {i}." for i in range(1, 6)] + ["Annexure A."]))
+    hits_before = cache.stats()['hits']
+    second = list(iter_pages(str(amended), cache=cache))
+    assert second[:5] == first
+    assert second[5].text.strip() == "Annexure A."
+    # The five unchanged pages come from the cache
+    assert cache.stats()['hits'] - hits_before == 5
+
+    # A file seen before is served whole
+    assert list(iter_pages(str(amended), cache=cache)) == second
+    assert cache.stats()['hits'] - hits_before == 6
+
+def test_pages_drawing_xobjects_are_keyed_by_the_xobject(tmp_path):
+    from legal_summarizer.utils.cache import ExtractedTextCache
+
+    cache = ExtractedTextCache(str(tmp_path / "cache"))
+    first = tmp_path / "first.pdf"
+    first.write_bytes(make_pdf(["Alpha page one", "Beta page two", "Gamma page three"], xobjects=True))
+    second = tmp_path / "second.pdf"
+    second.write_bytes(make_pdf(["Completely different", "Other judgment text", "Third"], xobjects=True))
+
+    assert [page.text.strip() for page in iter_pdf_pages(str(first), workers=1, cache=cache)] == \
+        ["Alpha page one", "Beta page two", "Gamma page three"]
+    assert [page.text.strip() for page in iter_pdf_pages(str(second), workers=1, cache=cache)] == \
+        ["Completely different", "Other judgment text", "Third"]
+
+def test_shared_fonts_are_hashed_once_per_file(pdf_path, tmp_path, monkeypatch):
+    from legal_summarizer.utils.cache import ExtractedTextCache
+
+    fonts = []
+    hash_object = extraction._hash_object
+    def counting_hash_object(digest, obj, hashed):
+        if hasattr(obj, 'get') and obj.get('/Type') == '/Font':
+            fonts.append(obj)
+        hash_object(digest, obj, hashed)
+    monkeypatch.setattr(extraction, "_hash_object", counting_hash_object)
+
+    list(iter_pdf_pages(pdf_path, workers=1, cache=ExtractedTextCache(str(tmp_path / "cache"))))
+    assert len(fonts) == 1
+
+def test_in_memory_sources_match_files(pdf_path, tmp_path, monkeypatch):
+    import io
+    with open(pdf_path, 'rb') as file:
+        stream = io.BytesIO(file.read())
+    stream.seek(100)  # Position is ignored
+    expected = list(iter_pdf_pages(pdf_path, workers=1))
+    assert list(iter_pages(stream, workers=1, filename="upload.pdf")) == expected
+
+    # Parallel extraction copies in-memory PDFs to a temp file that is removed afterwards
+    monkeypatch.setattr(extraction, "PARALLEL_MIN_PAGES", 8)
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_dir))
+    assert list(iter_pdf_pages(stream, workers=2)) == expected
+    assert not list(temp_dir.iterdir())
+
+    assert list(iter_pages(io.BytesIO(b"Plain text."), filename="note.txt")) == [Page(1, "Plain text.")]
@@ -0,0 +1,48 @@
+import time
+import pytest
+from legal_summarizer.utils.extractive import ExtractiveFilter, score_sentences
+
+pytest.importorskip("sklearn")
+
+SENTENCES = [
+    "The lessee shall pay rent of fifty thousand rupees to the lessor every month.",
+    "It was a sunny day.",
+    "Rent not paid to the lessor within the month attracts interest on the unpaid rent.",
+    "Thank you.",
+    "The lessor may terminate the lease if rent remains unpaid for three months.",
+]
+
+@pytest.mark.parametrize("method", ["tfidf", "textrank"])
+def test_informative_sentences_rank_highest(method):
+    scores = score_sentences(SENTENCES, method)
+    assert len(scores) == len(SENTENCES)
+    assert min(scores[0], scores[2], scores[4]) > max(scores[1], scores[3])
+
+def test_short_documents_are_kept_whole():
+    text = " ".join(SENTENCES)
+    assert ExtractiveFilter(max_tokens=1000).condense(text) == text
+
+@pytest.mark.parametrize("method", ["tfidf", "textrank"])
+def test_kept_sentences_fit_budget_in_document_order(method):
+    extractive = ExtractiveFilter(max_tokens=30, method=method)
+    kept = extractive.select(SENTENCES)
+    assert kept == sorted(kept)
+    assert sum(len(SENTENCES[i].split()) for i in kept) <= 30
+    assert len({0, 2, 4} & set(kept)) == 2
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        ExtractiveFilter(max_tokens=0)
+    with pytest.raises(ValueError):
+        ExtractiveFilter(method="lexrank")
+
+def test_textrank_scales_to_long_documents():
+    sentences = [f"Clause {i} obliges party {i % 97} to deliver goods numbered {i % 13} by day {i % 31}."
+                 for i in range(20000)]
+    start = time.perf_counter()
+    ExtractiveFilter(max_tokens=500, method="textrank").select(sentences)
+    assert time.perf_counter() - start < 10
+
+def test_repeated_sentences_are_kept_once():
+    kept = ExtractiveFilter(max_tokens=40).select(SENTENCES[:1] * 5 + SENTENCES[1:])
+    assert kept.count(0) == 1 and not {1, 2, 3, 4} & set(kept)
@@ -0,0 +1,52 @@
+import numpy as np
+from legal_summarizer.utils import generation
+from legal_summarizer.utils.generation import GenerationPolicy, chunk_importance, chunk_policy, sentence_importance
+
+ROUTINE = "The parties met in Delhi. The office is on the third floor. Copies were exchanged."
+OBLIGATIONS = "The tenant must pay rent by the fifth. Payment is mandatory. Notice is required before any entry."
+
+def test_chunk_importance():
+    assert chunk_importance(ROUTINE) == 0.0
+    assert chunk_importance(OBLIGATIONS) == 1.0
+    assert chunk_importance("You should consider this. Nothing else.") == 0.25
+    assert chunk_importance("") == 0.0
+
+def test_sentence_importance_from_keyword_counts():
+    assert sentence_importance(np.array([0, 2, 0, 0]), np.array([1, 1, 0, 0])) == 0.375
+    assert sentence_importance(np.array([], dtype=int), np.array([], dtype=int)) == 0.0
+
+def test_chunk_policy_reuses_document_scores(monkeypatch):
+    sentences = [ROUTINE, OBLIGATIONS]
+    groups = [(ROUTINE, [0]), (OBLIGATIONS, [1])]
+    policy = GenerationPolicy(max_beams=4)
+    expected = [policy(ROUTINE), policy(OBLIGATIONS)]
+
+    def no_rescoring(text, *args):
+        raise AssertionError("chunk scored again")
+    monkeypatch.setattr(generation, "keyword_counts", no_rescoring)
+    per_chunk = chunk_policy(policy, groups, np.array([0, 3]), np.array([0, 0]))
+    assert [per_chunk(chunk) for chunk in sentences] == expected
+
+def test_low_value_chunks_are_greedy():
+    params = GenerationPolicy()(ROUTINE)
+    assert params['num_beams'] == 1
+    assert 'early_stopping' not in params
+
+def test_high_value_chunks_get_beams():
+    params = GenerationPolicy(max_beams=4)(OBLIGATIONS)
+    assert params['num_beams'] == 4
+    assert params['early_stopping'] is True
+
+def test_output_length_scales_with_input():
+    policy = GenerationPolicy(count_tokens=lambda text: len(text.split()) * 10, max_length=130, min_length=30)
+    short = policy(ROUTINE)
+    long = policy(ROUTINE * 20)
+    assert short['max_length'] < long['max_length'] == 130
+    assert short['max_length'] % 16 == 0
+    assert short['min_length'] < short['max_length']
+    assert long['min_length'] == 30
+
+def test_short_chunks_keep_a_minimum_budget():
+    params = GenerationPolicy(min_output=16)("Done.")
+    assert params['max_length'] == 16
+    assert params['min_length'] == 8
@@ -0,0 +1,43 @@
+from legal_summarizer.utils.chunking import TextChunker
+from legal_summarizer.utils.hierarchical import reduce_summaries
+
+class TruncatingSummarizer:
+    """Summarizes by keeping the first max_length words, and records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, max_length=20, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        self.calls.append((len(batch), max_length))
+        return [{'summary_text': ' '.join(text.split()[:max_length]).rstrip('.') + '.'} for text in batch]
+
+def summaries(count, words=12):
+    return [' '.join(f"w{i}_{j}" for j in range(words)) + '.' for i in range(count)]
+
+def test_short_summaries_are_joined_without_model_calls():
+    summarizer = TruncatingSummarizer()
+    result = reduce_summaries(summarizer, summaries(2), TextChunker(max_tokens=100), target_length=50)
+    assert result == ' '.join(summaries(2))
+    assert summarizer.calls == []
+
+def test_result_fits_one_context_then_target_length():
+    summarizer = TruncatingSummarizer()
+    chunker = TextChunker(max_tokens=60)
+    result = reduce_summaries(summarizer, summaries(200), chunker, target_length=30, max_length=25)
+    assert chunker.count_tokens(result) <= 30
+    # Several reduce levels, then one final call at the target length
+    assert len(summarizer.calls) > 2
+    assert summarizer.calls[-1] == (1, 30)
+
+def test_output_is_bounded_regardless_of_input_size():
+    chunker = TextChunker(max_tokens=60)
+    for count in (50, 500, 2000):
+        result = reduce_summaries(TruncatingSummarizer(), summaries(count), chunker, target_length=40, max_length=10)
+        assert chunker.count_tokens(result) <= 40
+
+def test_summaries_that_do_not_shrink_stay_bounded():
+    echo = lambda inputs, **kwargs: [{'summary_text': text} for text in inputs]
+    chunker = TextChunker(max_tokens=60)
+    result = reduce_summaries(echo, summaries(100), chunker, target_length=500)
+    assert chunker.count_tokens(result) <= 60
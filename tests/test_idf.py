@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from legal_summarizer.utils.idf import IdfModel
+from legal_summarizer.utils.importance import classify_importance, importance_scores, scale_scores, term_columns
+from legal_summarizer.utils.segmentation import Document
+
+def test_weights_follow_document_frequency():
+    model = IdfModel(None)
+    model.add_document("The court held the appeal.")
+    model.add_document("The tenant paid rent.")
+    common, rare = term_columns("the")[0], term_columns("tenant")[0]
+    weights = model.weights()
+    assert len(model) == 2
+    assert weights[common] == pytest.approx(1.0)
+    assert weights[rare] == pytest.approx(np.log(3 / 2) + 1)
+    assert weights[rare] < weights[term_columns("unseen")[0]]
+
+def test_term_columns_do_not_depend_on_block_size(monkeypatch):
+    text = " ".join(f"word{i % 700}" for i in range(2000))
+    expected = term_columns(text)
+    monkeypatch.setattr("legal_summarizer.utils.importance.BLOCK_CHARS", 100)
+    assert np.array_equal(term_columns(text), expected)
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "idf.npz")
+    model = IdfModel(path)
+    model.add_document("Payment is due on demand.")
+    model.last_document_id = 7
+    model.save()
+    loaded = IdfModel.load(path)
+    assert len(loaded) == 1
+    assert loaded.last_document_id == 7
+    assert np.array_equal(loaded.document_frequency, model.document_frequency)
+    assert len(IdfModel.load(str(tmp_path / "missing.npz"))) == 0
+
+    # Models with another term hashing are discarded
+    np.savez(path, columns=[1], counts=[1], n_documents=1, last_training_id=0, last_document_id=7)
+    assert len(IdfModel.load(path)) == 0
+
+def test_updates_only_count_new_rows():
+    pytest.importorskip("sqlalchemy")
+    from database.models import Document as DocumentRow, TrainingData, init_session_factory
+    factory = init_session_factory("sqlite://")
+    session = factory()
+    session.add(TrainingData(document_text="The lease is void.", summary="Void."))
+    session.add(DocumentRow(filename="a.txt", original_text="The lease is renewed."))
+    session.commit()
+
+    model = IdfModel(None)
+    assert model.update_from_database(factory, batch_size=1) == 2
+    assert model.update_from_database(factory) == 0
+
+    session.add(DocumentRow(filename="b.txt", original_text="A new lease."))
+    session.commit()
+    session.close()
+    assert model.update_from_database(factory) == 1
+    assert len(model) == 3
+    assert model.document_frequency[term_columns("lease")[0]] == 3
+
+    # Documents added as they are stored are not counted again
+    session = factory()
+    row = DocumentRow(filename="c.txt", original_text="The lease ends.")
+    session.add(row)
+    session.commit()
+    model.add_document(row.original_text, row.id)
+    session.close()
+    assert model.update_from_database(factory) == 0
+    assert len(model) == 4
+
+def test_scores_use_corpus_weights():
+    text = "The court must decide. The court adjourned."
+    model = IdfModel(None)
+    for _ in range(3):
+        model.add_document("The court sat.")
+    default = importance_scores(text).tfidf
+    weighted = importance_scores(text, idf=model.weights()).tfidf
+    assert not np.allclose(default, weighted)
+    assert classify_importance(Document(text), idf=model.weights())["high"] == ["The court must decide."]
+
+def test_equal_scores_scale_to_zero():
+    with np.errstate(all="raise"):
+        assert scale_scores(np.array([0.5, 0.5])).tolist() == [0.0, 0.0]
+        assert scale_scores(np.zeros(0)).tolist() == []
+    assert scale_scores(np.array([1.0, 3.0, 2.0])).tolist() == [0.0, 1.0, 0.5]
@@ -0,0 +1,47 @@
+import time
+
+import numpy as np
+import pytest
+from legal_summarizer.utils.importance import classify_importance, importance_scores, top_k
+from legal_summarizer.utils.segmentation import Document
+
+TEXT = ("Payment is mandatory within 30 days. The tenant should consider repairs. It was sunny. "
+        "You MUST comply immediately and the deadline is urgent! Nothing here. The unimportant note.")
+
+def test_sentences_are_bucketed_by_keywords():
+    importance = classify_importance(TEXT)
+    assert importance["high"] == ["You MUST comply immediately and the deadline is urgent!",
+                                  "Payment is mandatory within 30 days."]
+    assert importance["medium"] == ["The tenant should consider repairs."]
+    assert set(importance["low"]) == {"It was sunny.", "Nothing here.", "The unimportant note."}
+
+def test_keywords_match_word_prefixes():
+    scores = importance_scores("It was considered. Mustard seeds. The Requirement.")
+    assert scores.medium.tolist() == [1, 0, 0]
+    assert scores.high.tolist() == [0, 1, 0]
+
+@pytest.mark.parametrize("extra", ["A b_c 7 42 x-ray _id.", "Die Zahlung ist ÜBERFÄLLIG, café."])
+def test_tfidf_matches_sklearn(extra):
+    sklearn_text = pytest.importorskip("sklearn.feature_extraction.text")
+    document = Document(TEXT + " " + extra)
+    expected = np.asarray(sklearn_text.TfidfVectorizer().fit_transform(document.sentences()).sum(axis=1)).ravel()
+    assert np.allclose(importance_scores(document).tfidf, expected)
+
+def test_buckets_keep_the_best_sentences_not_the_first():
+    filler = " ".join(f"Clause {i} is routine." for i in range(10))
+    text = filler + " The deadline is urgent, critical and mandatory."
+    assert classify_importance(text, top=1)["high"] == ["The deadline is urgent, critical and mandatory."]
+    assert top_k(np.array([0.5, 0.9, 0.1, 0.9]), [0, 1, 2, 3], 2) == [1, 3]
+    assert top_k(np.array([1.0]), [0], 0) == []
+
+def test_scoring_stays_fast():
+    # 100k sentences score in about 0.6 s; 20k get a margin of over twice their time
+    sentences = [f"Clause {i} says term{i % 997} must be read with term{i % 89}." for i in range(20000)]
+    document = Document(" ".join(sentences))
+    document.sentences()
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        classify_importance(document)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 0.3
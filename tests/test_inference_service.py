@@ -0,0 +1,61 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from legal_summarizer.utils.batching import summarize_batched
+from legal_summarizer.utils.inference_service import InferenceService
+
+class FakePipeline:
+    """Summarizes by upper-casing and tags each result with the worker's pid."""
+
+    def __call__(self, inputs, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        if any("crash" in text for text in batch):
+            os._exit(1)
+        if any("slow" in text for text in batch):
+            time.sleep(0.5)
+        if any("fail" in text for text in batch):
+            raise ValueError("cannot summarize")
+        return [{'summary_text': text.upper(), 'pid': os.getpid()} for text in batch]
+
+@pytest.fixture
+def service():
+    service = InferenceService(FakePipeline(), num_workers=2).start()
+    yield service
+    service.stop()
+
+def test_results_come_from_worker_processes(service):
+    outputs = service(["first clause", "second clause"])
+    assert [output['summary_text'] for output in outputs] == ["FIRST CLAUSE", "SECOND CLAUSE"]
+    assert all(output['pid'] != os.getpid() for output in outputs)
+
+def test_concurrent_callers_get_their_own_results(service):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda i: service([f"document {i}"])[0]['summary_text'], range(32)))
+    assert results == [f"DOCUMENT {i}" for i in range(32)]
+
+def test_worker_errors_are_raised_to_the_caller(service):
+    with pytest.raises(RuntimeError, match="cannot summarize"):
+        service(["please fail"])
+
+def test_batched_summaries_fall_back_per_chunk(service):
+    summaries = summarize_batched(service, ["good chunk", "fail. this one", "another chunk"], batch_size=1)
+    assert summaries == ["GOOD CHUNK", "fail. this one", "ANOTHER CHUNK"]
+
+def test_dead_worker_fails_its_requests_and_is_replaced(service):
+    service.timeout = 10
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        service(["crash the worker"])
+    assert all(worker.is_alive() for worker in service._workers)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda i: service([f"document {i}"])[0]['summary_text'], range(8)))
+    assert results == [f"DOCUMENT {i}" for i in range(8)]
+
+def test_cancelled_requests_are_dropped(service):
+    future = service.submit(["slow clause"])
+    assert future.cancel()
+    assert not any(service._inflight)
+    assert service(["next clause"])[0]['summary_text'] == "NEXT CLAUSE"
+    time.sleep(0.6)
+    assert future.cancelled()
+    assert service(["last clause"])[0]['summary_text'] == "LAST CLAUSE"
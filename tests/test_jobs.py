@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+from legal_summarizer.utils.jobs import JobQueue, QueueFullError
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1, max_pending=2)
+    yield queue
+    queue.shutdown()
+
+def test_job_reports_result_and_progress(queue):
+    def work(progress, value):
+        progress(0.5, 'halfway')
+        return value * 2
+
+    job_id = queue.submit(work, 21)
+    job = wait_for(queue, job_id)
+    assert job['status'] == 'done'
+    assert job['result'] == 42
+    assert job['progress'] == 1.0
+    assert job['stage'] == 'halfway'
+
+def test_failed_job_reports_error(queue):
+    def work(progress):
+        raise ValueError("unreadable document")
+
+    job = wait_for(queue, queue.submit(work))
+    assert job['status'] == 'failed'
+    assert job['error'] == "unreadable document"
+
+def test_full_queue_rejects_new_jobs(queue):
+    release = threading.Event()
+    running = queue.submit(lambda progress: release.wait(5))
+    queued = queue.submit(lambda progress: None)
+    assert queue.get(queued)['status'] == 'queued'
+
+    with pytest.raises(QueueFullError):
+        queue.submit(lambda progress: None)
+
+    release.set()
+    wait_for(queue, running)
+    wait_for(queue, queued)
+    wait_for(queue, queue.submit(lambda progress: None))
+
+def test_unknown_job_is_none(queue):
+    assert queue.get('missing') is None
@@ -0,0 +1,66 @@
+import json
+import os
+import time
+from legal_summarizer.utils.law_index import KeywordAutomaton, LawArticleIndex
+
+ARTICLES = [
+    {"article": "Article 14", "title": "Equality before law", "description": "Equality.",
+     "keywords": ["equality", "discrimination", "equal protection"]},
+    {"article": "Article 21", "title": "Protection of life", "description": "Life.",
+     "keywords": ["life", "personal liberty", "liberty"]},
+    {"article": "Article 32", "title": "Remedies", "description": "Writs.",
+     "keywords": ["writ", "fundamental rights"]},
+    {"article": "Article 19", "title": "Freedoms", "description": "Speech.",
+     "keywords": ["speech", "expression", "liberty"]},
+]
+
+def write_catalogue(path, articles):
+    with open(path, "w") as f:
+        json.dump({"articles": articles}, f)
+
+def test_keywords_match_whole_words_only():
+    automaton = KeywordAutomaton(["life", "rent"])
+    assert automaton.find("A lifetime of current events.") == set()
+    assert automaton.find("Right to LIFE, and rent.") == {0, 1}
+
+def test_overlapping_phrases_are_all_found():
+    automaton = KeywordAutomaton(["high court", "court of appeal", "appeal", "of"])
+    assert automaton.find("the high court of appeal") == {0, 1, 2, 3}
+    assert automaton.find("high high court") == {0}
+
+def test_suggestions_rank_by_keyword_count(tmp_path):
+    path = tmp_path / "articles.json"
+    write_catalogue(path, ARTICLES)
+    index = LawArticleIndex(str(path))
+    text = "Personal liberty and life were curtailed; liberty of speech. Equality is at stake."
+    suggestions = index.suggest(text)
+    assert [s["article"] for s in suggestions] == ["Article 21", "Article 19", "Article 14"]
+    assert [s["score"] for s in suggestions] == [3, 2, 1]
+    assert index.suggest("Nothing relevant here.") == []
+
+def test_catalogue_changes_are_picked_up(tmp_path):
+    path = tmp_path / "articles.json"
+    write_catalogue(path, ARTICLES)
+    index = LawArticleIndex(str(path))
+    assert index.suggest("a writ petition")[0]["article"] == "Article 32"
+
+    updated = ARTICLES + [{"article": "Article 226", "title": "High Courts", "description": "Writs.",
+                           "keywords": ["writ", "high court"]}]
+    write_catalogue(path, updated)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert [s["article"] for s in index.suggest("a writ petition in the high court")] == ["Article 226", "Article 32"]
+
+def test_lookup_cost_does_not_grow_with_catalogue(tmp_path):
+    path = tmp_path / "articles.json"
+    articles = [{"article": f"Section {i}", "title": f"Section {i}", "description": "",
+                 "keywords": [f"term{i}", f"clause {i} proviso"]} for i in range(5000)]
+    write_catalogue(path, articles)
+    index = LawArticleIndex(str(path))
+    text = "The term42 and clause 4999 proviso apply. " * 2000
+    index.suggest(text)
+    start = time.perf_counter()
+    suggestions = index.suggest(text)
+    elapsed = time.perf_counter() - start
+    assert {s["article"] for s in suggestions} == {"Section 42", "Section 4999"}
+    assert elapsed < 1.0
@@ -0,0 +1,92 @@
+import json
+import os
+import time
+import pytest
+from legal_summarizer.utils.law_index import LawArticleIndex
+from legal_summarizer.utils.law_retrieval import ArticleRetriever
+
+pytest.importorskip("sklearn")
+
+ARTICLES = [
+    {"article": "Article 14", "title": "Equality before law",
+     "description": "The State shall not deny to any person equality before the law.",
+     "keywords": ["equality", "discrimination"]},
+    {"article": "Article 19", "title": "Freedom of speech",
+     "description": "All citizens shall have the right to freedom of speech and expression and to assemble peaceably.",
+     "keywords": ["speech", "expression", "press"]},
+    {"article": "Article 21", "title": "Protection of life and personal liberty",
+     "description": "No person shall be deprived of his life or personal liberty except according to procedure established by law.",
+     "keywords": ["life", "personal liberty", "detention"]},
+    {"article": "Section 420 IPC", "title": "Cheating",
+     "description": "Whoever cheats and dishonestly induces the person deceived to deliver any property.",
+     "keywords": ["cheating", "fraud", "dishonestly"]},
+]
+
+def write_catalogue(path, articles):
+    with open(path, "w") as f:
+        json.dump({"articles": articles}, f)
+
+@pytest.fixture
+def retriever(tmp_path):
+    path = tmp_path / "articles.json"
+    write_catalogue(path, ARTICLES)
+    return ArticleRetriever(LawArticleIndex(str(path)), str(tmp_path / "index"))
+
+def test_articles_are_found_without_keyword_matches(retriever):
+    text = "The accused deceived the complainant and induced him to deliver his property."
+    assert retriever.keyword_index.suggest(text) == []
+    assert retriever.suggest(text)[0]["article"] == "Section 420 IPC"
+
+def test_best_segment_decides_the_score(retriever):
+    chunks = ["The tenant paid the rent on time.",
+              "Citizens have the right to assemble peaceably and to freedom of expression."]
+    suggestions = retriever.suggest(chunks)
+    assert suggestions[0]["article"] == "Article 19"
+    assert all(s["score"] >= retriever.min_score for s in suggestions)
+    assert retriever.suggest("") == []
+
+def test_index_is_reused_and_rebuilt_on_change(retriever, tmp_path):
+    first = retriever.index()
+    assert os.path.exists(os.path.join(first.directory, "vectors.npy"))
+    reopened = ArticleRetriever(LawArticleIndex(retriever.keyword_index.path), retriever.index_dir)
+    assert reopened.index().directory == first.directory
+
+    write_catalogue(retriever.keyword_index.path, ARTICLES[:3])
+    stat = os.stat(retriever.keyword_index.path)
+    os.utime(retriever.keyword_index.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert retriever.index().directory != first.directory
+    assert os.listdir(retriever.index_dir) == [os.path.basename(retriever.index().directory)]
+    assert all(s["article"] != "Section 420 IPC" for s in retriever.suggest("cheating and fraud"))
+
+def test_keyword_prefilter_limits_candidates(retriever):
+    text = "Freedom of the press and equality before the law."
+    prefiltered = retriever.suggest(text, top_k=4, prefilter=True)
+    assert {s["article"] for s in prefiltered} <= {"Article 14", "Article 19"}
+
+def test_large_catalogues_use_inverted_lists(tmp_path):
+    topics = ["tax assessment income return", "marriage divorce maintenance wife",
+              "murder homicide weapon death", "land acquisition compensation owner",
+              "contract breach damages agreement", "election ballot voter candidate"]
+    articles = [{"article": f"Section {i}", "title": f"Provision {i}",
+                 "description": f"{topics[i % len(topics)]} clause {i}",
+                 "keywords": [topics[i % len(topics)].split()[0]]} for i in range(3000)]
+    path = tmp_path / "articles.json"
+    write_catalogue(path, articles)
+    retriever = ArticleRetriever(LawArticleIndex(str(path)), str(tmp_path / "index"),
+                                 dimensions=32, ann_threshold=1000)
+    assert retriever.index().centroids is not None
+
+    text = "The husband refused to pay maintenance to his wife after the divorce."
+    retriever.suggest(text)
+    start = time.perf_counter()
+    suggestions = retriever.suggest(text, top_k=5)
+    elapsed = time.perf_counter() - start
+    assert len(suggestions) == 5
+    assert all(int(s["article"].split()[1]) % len(topics) == 1 for s in suggestions)
+    assert elapsed < 0.5
+
+def test_one_shared_word_is_not_a_confident_match(retriever):
+    assert retriever.index().projection is None
+    text = "The newspaper editor was arrested for publishing criticism of the minister in the press."
+    assert retriever.suggest(text) == []
+    assert retriever.suggest("Freedom of the press and of speech.")[0]["article"] == "Article 19"
@@ -0,0 +1,33 @@
+import threading
+from legal_summarizer.utils.model_registry import ModelRegistry
+
+def test_entry_is_loaded_once():
+    registry = ModelRegistry()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return object()
+
+    first = registry.get(('model', 'bart'), loader)
+    assert registry.get(('model', 'bart'), loader) is first
+    assert len(loads) == 1
+    assert registry.loaded() == [('model', 'bart')]
+
+def test_concurrent_callers_share_one_load():
+    registry = ModelRegistry()
+    loads = []
+    results = []
+
+    def loader():
+        loads.append(1)
+        return object()
+
+    threads = [threading.Thread(target=lambda: results.append(registry.get('model', loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,43 @@
+import pytest
+from legal_summarizer.utils.extraction import Page, join_pages, page_spans
+from legal_summarizer.utils.ner import EntityExtractor, ner_segments
+
+def test_segments_follow_pages():
+    pages = [Page(1, "First page."), Page(2, "   "), Page(3, "Third page.")]
+    text = join_pages(pages)
+    segments = list(ner_segments(text, page_spans(pages)))
+    assert [text[start:end] for start, end in segments] == ["First page.", "Third page."]
+
+def test_long_text_is_cut_at_paragraphs_then_sentences():
+    paragraphs = "\n\n".join("Clause %d applies. It binds the parties." % i for i in range(200))
+    segments = list(ner_segments(paragraphs, max_chars=500))
+    assert all(end - start <= 500 for start, end in segments)
+    assert "".join(paragraphs[start:end] for start, end in segments) == paragraphs
+    assert all(paragraphs[start:end].endswith("\n\n") for start, end in segments[:-1])
+
+    one_paragraph = " ".join("Clause %d applies." % i for i in range(200))
+    segments = list(ner_segments(one_paragraph, max_chars=300))
+    assert all(one_paragraph[start:end].rstrip().endswith(".") for start, end in segments)
+
+    unbroken = "x" * 1000
+    assert list(ner_segments(unbroken, max_chars=400)) == [(0, 400), (400, 800), (800, 1000)]
+
+def test_texts_beyond_spacy_max_length_map_entities_to_global_offsets():
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": "Supreme Court"}])
+    text = "\n\n".join("Appeal %d was heard by the Supreme Court." % i for i in range(30000))
+    assert len(text) > nlp.max_length
+    entities = EntityExtractor(nlp, batch_size=64).extract(text)
+    assert len(entities) == 30000
+    assert all(text[entity["start"]:entity["end"]] == "Supreme Court" for entity in entities)
+
+def test_embedding_layers_nothing_listens_to_are_removed(tmp_path):
+    spacy = pytest.importorskip("spacy")
+    from legal_summarizer.utils.ner import _load_ner
+    nlp = spacy.blank("en")
+    nlp.add_pipe("tok2vec")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": "Supreme Court"}])
+    nlp.initialize()
+    nlp.to_disk(tmp_path / "pipeline")
+    assert _load_ner(str(tmp_path / "pipeline")).pipe_names == ["entity_ruler"]
@@ -0,0 +1,59 @@
+import pytest
+from legal_summarizer.utils.model_registry import ModelRegistry
+from legal_summarizer.utils.onnx_backend import onnx_dir
+
+def test_onnx_dir_is_next_to_the_model():
+    assert onnx_dir("trained_model") == "trained_model-onnx"
+    assert onnx_dir("models/trained_model/") == "models/trained_model-onnx"
+
+def test_onnx_backend_rejects_quantized_precision():
+    with pytest.raises(ValueError):
+        ModelRegistry().model("trained_model", precision="int8", backend="onnx")
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        ModelRegistry().model("trained_model", backend="tensorrt")
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    pytest.importorskip("optimum.onnxruntime")
+    torch.manual_seed(0)
+    config = transformers.BartConfig(
+        vocab_size=128, d_model=32, encoder_layers=2, decoder_layers=2,
+        encoder_attention_heads=2, decoder_attention_heads=2,
+        encoder_ffn_dim=64, decoder_ffn_dim=64, max_position_embeddings=64
+    )
+    model_dir = str(tmp_path_factory.mktemp("models") / "trained_model")
+    transformers.BartForConditionalGeneration(config).eval().save_pretrained(model_dir)
+    return model_dir
+
+def test_onnx_generation_matches_pytorch(tiny_model):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM
+    from legal_summarizer.utils.onnx_backend import export_onnx, load_onnx_model
+
+    assert export_onnx(tiny_model) == onnx_dir(tiny_model)
+    ort_model = load_onnx_model(tiny_model)
+    torch_model = AutoModelForSeq2SeqLM.from_pretrained(tiny_model).eval()
+
+    input_ids = torch.tensor([[0, 5, 17, 42, 9, 63, 2], [0, 8, 8, 31, 2, 1, 1]])
+    attention_mask = (input_ids != 1).long()
+    kwargs = dict(attention_mask=attention_mask, max_length=12, num_beams=1, do_sample=False)
+    expected = torch_model.generate(input_ids, **kwargs)
+    assert torch.equal(ort_model.generate(input_ids, **kwargs), expected)
+
+def test_onnx_logits_match_pytorch(tiny_model):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM
+    from legal_summarizer.utils.onnx_backend import load_onnx_model
+
+    ort_model = load_onnx_model(tiny_model)
+    torch_model = AutoModelForSeq2SeqLM.from_pretrained(tiny_model).eval()
+    input_ids = torch.tensor([[0, 5, 17, 42, 9, 63, 2]])
+    decoder_input_ids = torch.tensor([[2, 0, 11]])
+    with torch.no_grad():
+        expected = torch_model(input_ids=input_ids, decoder_input_ids=decoder_input_ids).logits
+    actual = ort_model(input_ids=input_ids, decoder_input_ids=decoder_input_ids).logits
+    assert torch.allclose(actual, expected, atol=1e-4)
@@ -0,0 +1,19 @@
+import pytest
+from legal_summarizer.utils.quantization import quantized_dir, quantize_model
+
+def test_quantized_dir_is_next_to_the_model():
+    assert quantized_dir("trained_model", "int8") == "trained_model-int8"
+    assert quantized_dir("models/trained_model/", "bf16") == "models/trained_model-bf16"
+
+def test_unknown_precision_is_rejected():
+    pytest.importorskip("torch")
+    with pytest.raises(ValueError):
+        quantize_model(object(), "int4")
+
+def test_int8_replaces_linear_layers():
+    torch = pytest.importorskip("torch")
+    model = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.ReLU(), torch.nn.Linear(8, 2)).eval()
+    quantized = quantize_model(model, "int8")
+    assert not any(type(module) is torch.nn.Linear for module in quantized.modules())
+    inputs = torch.randn(4, 8)
+    assert torch.allclose(quantized(inputs), model(inputs), atol=0.1)
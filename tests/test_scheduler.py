@@ -0,0 +1,110 @@
+import threading
+import pytest
+from legal_summarizer.utils.batching import summarize_batched
+from legal_summarizer.utils.scheduler import MicroBatchScheduler
+
+class RecordingPipeline:
+    """Upper-cases its inputs and records the batches it was called with."""
+
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, inputs, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        with self.lock:
+            self.batches.append(list(batch))
+        if any("poison" in text for text in batch):
+            raise RuntimeError("bad input")
+        return [{'summary_text': text.upper()} for text in batch]
+
+@pytest.fixture
+def pipeline():
+    return RecordingPipeline()
+
+@pytest.fixture
+def scheduler(pipeline):
+    scheduler = MicroBatchScheduler(pipeline, max_batch_size=8, max_wait_ms=50)
+    yield scheduler
+    scheduler.stop()
+
+def test_concurrent_requests_share_batches_and_keep_order(pipeline, scheduler):
+    futures = [scheduler.submit([f"doc {i} chunk {j}" for j in range(3)], max_length=60) for i in range(4)]
+    results = [future.result(timeout=5) for future in futures]
+
+    for i, outputs in enumerate(results):
+        assert [output['summary_text'] for output in outputs] == [f"DOC {i} CHUNK {j}" for j in range(3)]
+    assert len(pipeline.batches) < 4
+    assert max(len(batch) for batch in pipeline.batches) == 8
+    assert scheduler.stats()['inputs'] == 12
+
+def test_different_generation_params_are_not_mixed(pipeline, scheduler):
+    short = scheduler.submit(["a"], max_length=30)
+    long = scheduler.submit(["b"], max_length=130)
+    short.result(timeout=5)
+    long.result(timeout=5)
+    assert sorted(pipeline.batches) == [["a"], ["b"]]
+
+def test_bad_input_only_fails_its_own_request(pipeline, scheduler):
+    good = scheduler.submit(["fine clause"])
+    bad = scheduler.submit(["poison clause"])
+    assert good.result(timeout=5)[0]['summary_text'] == "FINE CLAUSE"
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=5)
+
+def test_request_fallback_matches_direct_pipeline(pipeline, scheduler):
+    chunks = ["first clause.", "poison. clause", "last clause."]
+    assert summarize_batched(scheduler, chunks, batch_size=2) == summarize_batched(pipeline, chunks, batch_size=2)
+
+def test_cancelled_requests_are_not_run(pipeline, scheduler):
+    dropped = scheduler.submit(["dropped clause"])
+    assert dropped.cancel()
+    assert scheduler(["kept clause"])[0]['summary_text'] == "KEPT CLAUSE"
+    assert pipeline.batches == [["kept clause"]]
+
+def test_stats_report_queue_depth_and_batch_sizes(scheduler):
+    scheduler.submit(["x", "y"]).result(timeout=5)
+    stats = scheduler.stats()
+    assert stats['queue_depth'] == 0
+    assert stats['batches'] == 1
+    assert stats['batch_sizes'] == {2: 1}
+    assert stats['mean_batch_size'] == 2
+
+class StuckBackend:
+    """Accepts batches asynchronously; the futures resolve only when told to."""
+    num_workers = 1
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+
+    def submit(self, inputs, **kwargs):
+        from concurrent.futures import Future
+        future = Future()
+        self.batches.append(list(inputs))
+        if self.error is not None:
+            future.set_exception(self.error)
+        return future
+
+def test_stuck_backend_times_out_callers():
+    from concurrent.futures import TimeoutError
+    scheduler = MicroBatchScheduler(StuckBackend(), max_wait_ms=1, timeout=0.2)
+    try:
+        with pytest.raises(TimeoutError):
+            scheduler(["never summarized"])
+        assert summarize_batched(scheduler, ["Stuck clause. More text."], batch_size=1) == ["Stuck clause. More text."]
+    finally:
+        scheduler.stop()
+
+def test_dead_worker_fails_the_whole_batch_without_retries():
+    from legal_summarizer.utils.inference_service import WorkerDiedError
+    backend = StuckBackend(WorkerDiedError("Inference worker exited with code -9"))
+    scheduler = MicroBatchScheduler(backend, max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [scheduler.submit([f"doc {i}"]) for i in range(4)]
+        for future in futures:
+            with pytest.raises(WorkerDiedError):
+                future.result(timeout=5)
+        assert backend.batches == [["doc 0", "doc 1", "doc 2", "doc 3"]]
+    finally:
+        scheduler.stop()
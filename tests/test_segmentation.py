@@ -0,0 +1,40 @@
+import time
+from legal_summarizer.utils.segmentation import Document, as_document, segment
+
+def test_legal_abbreviations_do_not_end_sentences():
+    text = ("In State of Punjab v. Ajaib Singh the Court read S. 302 with Art. 21 of the Constitution. "
+            "Appeal No. 45 was argued by Mr. A. K. Sharma on Jan. 5, 2021! Was it maintainable? "
+            "The fee is Rs. 5,000 approx. per month.")
+    assert Document(text).sentences() == [
+        "In State of Punjab v. Ajaib Singh the Court read S. 302 with Art. 21 of the Constitution.",
+        "Appeal No. 45 was argued by Mr. A. K. Sharma on Jan. 5, 2021!",
+        "Was it maintainable?",
+        "The fee is Rs. 5,000 approx. per month.",
+    ]
+
+def test_blank_lines_end_headings():
+    document = Document("JUDGMENT\n\nThe appeal is allowed.  \n")
+    assert document.sentences() == ["JUDGMENT", "The appeal is allowed."]
+
+def test_offsets_locate_sentences():
+    text = "First clause. Second clause, dated 1.1.2020. Third."
+    document = Document(text)
+    assert len(document) == 3
+    assert [text[s:e] for s, e in zip(document.starts, document.ends)] == document.sentences()
+    assert document.sentence(document.sentence_index(text.index("dated"))) == "Second clause, dated 1.1.2020."
+    assert document.starts.itemsize == 8
+    assert as_document(document) is document
+
+def test_segmentation_scales_linearly():
+    small = "The lessee v. the lessor, under S. 12 of the Act. Rent is payable monthly. " * 10000
+    large = small * 4
+
+    def best_time(text):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            segment(text)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    assert best_time(large) < best_time(small) * 8